@@ -0,0 +1,68 @@
+"""
+Measures cold-start time of the importer entry points in fresh interpreters and checks them
+against a budget: importing woocommerce_manager alone, and starting `python main.py` up to
+its first prompt (stdin is closed, so it stops there). Also fails if a start-up path loads a
+module that should only be imported on use (selenium, webdriver_manager, deep_translator, faker).
+
+Exits with status 1 when a budget is exceeded, so it can run as a CI check.
+
+Usage (from the repository root):
+    python benchmarks/bench_cold_start.py --runs 5 --main-budget-ms 400 --manager-budget-ms 300
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ("selenium", "webdriver_manager", "deep_translator", "faker")
+
+# Reports which lazy modules were imported once the entry point has started
+LOADED_CHECK = "import sys; print(','.join(m for m in {modules!r} if m in sys.modules))"
+
+
+def time_command(command, runs):
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run(command, cwd=REPO_DIR, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return timings
+
+
+def loaded_lazy_modules(import_statement):
+    check = f"{import_statement}; {LOADED_CHECK.format(modules=LAZY_MODULES)}"
+    output = subprocess.run([sys.executable, "-c", check], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    loaded = output.stdout.strip().splitlines()[-1] if output.stdout.strip() else ""
+    return [module for module in loaded.split(",") if module]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start budget check for the importer entry points.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--main-budget-ms", type=float, default=400, help="Median budget for `python main.py`")
+    parser.add_argument("--manager-budget-ms", type=float, default=300,
+                        help="Median budget for `python -c 'import woocommerce_manager'`")
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_command([sys.executable, "-c", "pass"], args.runs))
+    checks = (
+        ("python main.py", [sys.executable, "main.py"], "import main", args.main_budget_ms),
+        ("import woocommerce_manager", [sys.executable, "-c", "import woocommerce_manager"],
+         "import woocommerce_manager", args.manager_budget_ms),
+    )
+
+    print(f"Bare interpreter start: {baseline:.0f} ms (median of {args.runs})")
+    failed = False
+    for label, command, import_statement, budget_ms in checks:
+        median_ms = statistics.median(time_command(command, args.runs))
+        loaded = loaded_lazy_modules(import_statement)
+        over_budget = median_ms > budget_ms
+        failed = failed or over_budget or bool(loaded)
+        print(f"{label:<28} median {median_ms:7.0f} ms (budget {budget_ms:.0f} ms) "
+              f"{'OVER BUDGET' if over_budget else 'ok'}"
+              + (f" | eagerly imported: {', '.join(loaded)}" if loaded else ""))
+    sys.exit(1 if failed else 0)
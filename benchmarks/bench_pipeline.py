@@ -0,0 +1,162 @@
+"""
+End-to-end import benchmark that needs no network: runs crear_producto (or the bulk
+pipeline) against the fake Shein server and the mock WooCommerce store, both started in a
+child process so their CPU and memory don't count against the importer.
+
+Reports products/minute, per-stage latency percentiles (from the run metrics) and the peak
+RSS of the importer process, so performance changes can be compared on any Linux box.
+
+Usage (from the repository root):
+    python benchmarks/bench_pipeline.py --products 50 --mode bulk --wc-latency-ms 40 --throttle-rate 0.02
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from fake_shein_server import start_fake_shein_server  # noqa: E402
+from mock_wc_server import start_mock_wc_server  # noqa: E402
+
+FIRST_GOODS_ID = 20000000
+STAGE_PREFIXES = ("stage.", "scraper.", "http_scraper.", "woocommerce.", "wc.")
+
+
+def serve_offline_sites(ports_pipe, stop_event, shein_latency_seconds, wc_latency_seconds, throttle_rate, retry_after):
+    shein_server = start_fake_shein_server(latency_seconds=shein_latency_seconds)
+    wc_server = start_mock_wc_server(latency_seconds=wc_latency_seconds, throttle_rate=throttle_rate,
+                                     retry_after=retry_after)
+    ports_pipe.send((shein_server.server_address[1], wc_server.server_address[1]))
+    stop_event.wait()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def stage_percentiles(metrics):
+    """Aggregates the recorded spans by name (across labels) into count/p50/p95/p99/max in milliseconds."""
+    samples_by_name = {}
+    for (name, _labels), samples in metrics.timings.items():
+        if name.startswith(STAGE_PREFIXES):
+            samples_by_name.setdefault(name, []).extend(samples)
+    stages = {}
+    for name, samples in sorted(samples_by_name.items()):
+        ordered = sorted(samples)
+        stages[name] = {"count": len(ordered), **{label: round(percentile(ordered, fraction) * 1000, 2)
+                                                  for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))},
+                        "max": round(ordered[-1] * 1000, 2)}
+    return stages
+
+
+def run_benchmark(args, shein_url, wc_url):
+    # Imported after the environment points the importer at the offline servers (config reads it at import)
+    import bulk_import
+    import main
+    from metrics import metrics
+    from woocommerce_manager import WooCommerceManager
+
+    rows = [{"url": f"{shein_url}/vestido-benchmark-p-{FIRST_GOODS_ID + i}-cat-1738.html",
+             "sizes": args.sizes, "markup": "20", "gender_code": "1"} for i in range(args.products)]
+
+    importer_output = io.StringIO()
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else importer_output):
+        if args.mode == "bulk":
+            results = bulk_import.run_bulk_import(rows, scrape_workers=args.scrape_workers,
+                                                  upload_workers=args.upload_workers)
+            succeeded = sum(1 for result in results if result["status"] == "ok")
+        else:
+            woo_commerce_manager = WooCommerceManager()
+            succeeded = 0
+            for row in rows:
+                if main.crear_producto(row["sizes"].split(","), row["url"], row["markup"], row["gender_code"],
+                                       woo_commerce_manager=woo_commerce_manager):
+                    succeeded += 1
+    elapsed_seconds = time.perf_counter() - start_time
+
+    import requests
+    return {
+        "mode": args.mode,
+        "products": args.products,
+        "succeeded": succeeded,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "products_per_minute": round(succeeded / elapsed_seconds * 60, 1) if elapsed_seconds else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1), # ru_maxrss is KiB on Linux
+        "stages_ms": stage_percentiles(metrics),
+        "store_requests": requests.get(f"{wc_url}/__stats", timeout=10).json(),
+    }
+
+
+def print_report(report):
+    print(f"\n{report['succeeded']}/{report['products']} products imported ({report['mode']}) in "
+          f"{report['elapsed_seconds']:.1f}s -> {report['products_per_minute']} products/min, "
+          f"peak RSS {report['peak_rss_mb']} MB")
+    print(f"\n{'stage':<42} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stage in report["stages_ms"].items():
+        print(f"{name:<42} {stage['count']:>6} {stage['p50']:>9.2f} {stage['p95']:>9.2f} "
+              f"{stage['p99']:>9.2f} {stage['max']:>9.2f}")
+    print("\nMock store requests: " + ", ".join(f"{route}={count}"
+                                                for route, count in sorted(report["store_requests"].items())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline import throughput benchmark.")
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--mode", choices=("single", "bulk"), default="single",
+                        help="crear_producto per product, or the bulk_import pipeline")
+    parser.add_argument("--sizes", default="S,M,L", help="Comma-separated sizes imported for every product")
+    parser.add_argument("--backend", choices=("http", "selenium"), default="http",
+                        help="Scraper backend (selenium needs Chrome, but still no network)")
+    parser.add_argument("--scrape-workers", type=int, default=2)
+    parser.add_argument("--upload-workers", type=int, default=2)
+    parser.add_argument("--shein-latency-ms", type=float, default=150, help="Simulated Shein page TTFB")
+    parser.add_argument("--wc-latency-ms", type=float, default=40, help="Simulated WooCommerce response time")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of store requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with each 429")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Override WC_RATE_LIMIT_MAX (requests/s)")
+    parser.add_argument("--json-out", help="Also write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show the importer's own output")
+    args = parser.parse_args()
+
+    ports_pipe, child_pipe = multiprocessing.Pipe()
+    stop_event = multiprocessing.Event()
+    server_process = multiprocessing.Process(
+        target=serve_offline_sites, daemon=True,
+        args=(child_pipe, stop_event, args.shein_latency_ms / 1000, args.wc_latency_ms / 1000,
+              args.throttle_rate, args.retry_after))
+    server_process.start()
+    shein_port, wc_port = ports_pipe.recv()
+    shein_url, wc_url = f"http://127.0.0.1:{shein_port}", f"http://127.0.0.1:{wc_port}"
+
+    with tempfile.TemporaryDirectory(prefix="importer-bench-") as state_dir:
+        os.environ.update({
+            "IMPORTER_CACHE_DIR": state_dir, # Fresh indexes, journals and caches for every run
+            "WC_STORE_URL": wc_url,
+            "CONSUMER_KEY": "ck_benchmark",
+            "CONSUMER_SECRET": "cs_benchmark",
+            "SCRAPER_BACKEND": args.backend,
+            "SCRAPE_CACHE_ENABLED": "false",
+            "WC_UPLOAD_MEDIA": "false",
+        })
+        if args.rate_limit:
+            os.environ["WC_RATE_LIMIT_MAX"] = str(args.rate_limit)
+        try:
+            benchmark_report = run_benchmark(args, shein_url, wc_url)
+        finally:
+            stop_event.set()
+            server_process.join(timeout=5)
+
+    print_report(benchmark_report)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as report_file:
+            json.dump(benchmark_report, report_file, indent=2)
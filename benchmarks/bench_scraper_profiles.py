@@ -0,0 +1,66 @@
+"""
+Compares the "default" and "fast" SheinScraper profiles on the same product pages:
+page-load time, extraction time, Chrome process-tree RSS and whether the extracted fields match.
+
+Usage (from the repository root):
+    python benchmarks/bench_scraper_profiles.py URL [URL ...]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import SheinScraper  # noqa: E402
+
+
+def run_profile(profile, urls):
+    launch_start = time.perf_counter()
+    scraper = SheinScraper(profile=profile)
+    launch_seconds = time.perf_counter() - launch_start
+    load_times, extract_times, rss_samples, results = [], [], [], []
+    try:
+        for url in urls:
+            scraper.load_page(url)
+            scraper.close_popup_if_present()
+            results.append(scraper.extract_product_details())
+            load_times.append(scraper.page_timings.get("load", 0.0))
+            extract_times.append(scraper.page_timings.get("extract", 0.0))
+            rss = scraper.chrome_rss_bytes()
+            if rss is not None:
+                rss_samples.append(rss)
+    finally:
+        scraper.quit_driver()
+    return {
+        "launch": launch_seconds,
+        "load": load_times,
+        "extract": extract_times,
+        "rss": rss_samples,
+        "results": results,
+    }
+
+
+def describe(samples, unit_scale=1.0, unit=""):
+    if not samples:
+        return "n/a"
+    scaled = [sample / unit_scale for sample in samples]
+    return f"median {statistics.median(scaled):.2f}{unit}, max {max(scaled):.2f}{unit}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="+", help="Shein product URLs to load with each profile")
+    args = parser.parse_args()
+
+    profile_runs = {profile: run_profile(profile, args.urls) for profile in ("default", "fast")}
+
+    print("\n--- Scraper profile benchmark ---")
+    for profile, run in profile_runs.items():
+        print(f"[{profile}] launch {run['launch']:.2f}s | load {describe(run['load'], unit='s')} | "
+              f"extract {describe(run['extract'], unit='s')} | Chrome RSS {describe(run['rss'], 1024 * 1024, ' MiB')}")
+
+    for url, default_details, fast_details in zip(args.urls, profile_runs["default"]["results"], profile_runs["fast"]["results"]):
+        mismatched = [key for key in default_details if default_details[key] != fast_details.get(key)]
+        print(f"{'OK  ' if not mismatched else 'DIFF'} {url}" + (f" (fields: {', '.join(mismatched)})" if mismatched else ""))
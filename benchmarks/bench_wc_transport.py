@@ -0,0 +1,114 @@
+"""
+Measures per-call latency of the WooCommerce transport against a local mock server:
+a fresh connection per call (how woocommerce.API issued requests) versus the pooled
+keep-alive WooCommerceClient, sequentially and through AsyncWooCommerceClient.
+
+Usage (from the repository root):
+    python benchmarks/bench_wc_transport.py --calls 500 --latency-ms 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wc_client import AsyncWooCommerceClient, WooCommerceClient  # noqa: E402
+
+
+def start_mock_server(latency_seconds):
+    body = json.dumps([{"id": 1, "name": "Ropa", "parent": 0}]).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # Keep-alive, like a real store behind nginx
+        disable_nagle_algorithm = True # Avoid 40ms delayed-ACK stalls on reused connections
+
+        def do_GET(self):
+            time.sleep(latency_seconds)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_calls(call, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call().raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label, latencies, wall_seconds=None):
+    ms = sorted(latency * 1000 for latency in latencies)
+    line = (f"{label:<28} mean {statistics.mean(ms):7.3f} ms | p50 {ms[len(ms) // 2]:7.3f} ms | "
+            f"p95 {ms[int(len(ms) * 0.95) - 1]:7.3f} ms")
+    if wall_seconds is not None:
+        line += f" | {len(ms) / wall_seconds:8.1f} calls/s"
+    print(line)
+
+
+async def run_async(client, count):
+    async_client = AsyncWooCommerceClient(client)
+
+    async def timed_call():
+        start = time.perf_counter()
+        response = await async_client.get("products/categories")
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    try:
+        return await asyncio.gather(*(timed_call() for _ in range(count)))
+    finally:
+        async_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Server-side latency added to every call")
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    server = start_mock_server(args.latency_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    client = WooCommerceClient(base_url, "ck_test", "cs_test", pool_size=args.pool_size)
+
+    def fresh_connection_call():
+        return requests.get(client.build_url("products/categories"), auth=("ck_test", "cs_test"), timeout=10)
+
+    def pooled_call():
+        return client.get("products/categories")
+
+    time_calls(pooled_call, 10) # Warm up
+
+    start = time.perf_counter()
+    fresh_latencies = time_calls(fresh_connection_call, args.calls)
+    report("fresh connection per call", fresh_latencies, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pooled_latencies = time_calls(pooled_call, args.calls)
+    report("pooled keep-alive", pooled_latencies, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async_latencies = asyncio.run(run_async(client, args.calls))
+    report(f"async, {args.pool_size} in flight", async_latencies, time.perf_counter() - start)
+
+    client.close()
+    server.shutdown()
@@ -0,0 +1,107 @@
+"""
+Local stand-in for Shein product pages, for offline benchmarks.
+
+Any path containing a goods ID ("/<slug>-p-<goods_id>-cat-1738.html") is answered with
+fixtures/shein_product.html, filled in with a name, SKU, price and subcategory derived
+from the goods ID, so every URL is a distinct but deterministic product. Listing paths
+("/<slug>-c-<cat_id>.html?page=N") return LISTING_PAGES pages of LISTING_PAGE_SIZE product
+links; past the last page the last page is repeated, as on Shein. Paths naming a file in
+fixtures/ directly are served as saved.
+
+Usage (from the repository root):
+    python benchmarks/fake_shein_server.py --port 8801 --latency-ms 150
+"""
+import argparse
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PRODUCT_TEMPLATE = "shein_product.html"
+SUBCATEGORIES = ("Vestidos Largos", "Vestidos Cortos", "Vestidos de Fiesta", "Vestidos Casuales")
+LISTING_PAGES = 3
+LISTING_PAGE_SIZE = 20
+
+
+def render_product_page(template, goods_id):
+    goods_number = int(goods_id)
+    replacements = {
+        "__GOODS_ID__": goods_id,
+        "__GOODS_SN__": f"sw{goods_number % 10 ** 10:010d}",
+        "__GOODS_NAME__": f"Vestido de benchmark {goods_id}",
+        "__PRICE__": f"{9 + goods_number % 40}.99",
+        "__SUBCATEGORY__": SUBCATEGORIES[goods_number % len(SUBCATEGORIES)],
+    }
+    page = template
+    for placeholder, value in replacements.items():
+        page = page.replace(placeholder, value)
+    return page
+
+
+def render_listing_page(category_id, page):
+    page = min(max(page, 1), LISTING_PAGES)
+    first_goods_id = int(category_id) * 10000 + (page - 1) * LISTING_PAGE_SIZE
+    cards = "\n".join(
+        f'<section class="product-card"><a href="/Vestido-benchmark-p-{goods_id}-cat-{category_id}.html'
+        f'?src_module=list&amp;src_tab_page_id=1">Vestido {goods_id}</a></section>'
+        for goods_id in range(first_goods_id, first_goods_id + LISTING_PAGE_SIZE))
+    return f"<!DOCTYPE html><html><body><div class=\"product-list\">\n{cards}\n</div></body></html>"
+
+
+def start_fake_shein_server(host="127.0.0.1", port=0, latency_seconds=0.0):
+    """Starts the server on a background thread and returns it (server.server_address has the port)."""
+    with open(os.path.join(FIXTURES_DIR, PRODUCT_TEMPLATE), "r", encoding="utf-8") as template_file:
+        template = template_file.read()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency_seconds) # Simulated page TTFB
+            path, _, query = self.path.partition("?")
+            goods_match = re.search(r"-p-(\d+)", path)
+            listing_match = re.search(r"-c-(\d+)\.html$", path)
+            fixture_path = os.path.join(FIXTURES_DIR, os.path.basename(path))
+            if goods_match:
+                body = render_product_page(template, goods_match.group(1)).encode("utf-8")
+            elif listing_match:
+                page_match = re.search(r"(?:^|&)page=(\d+)", query)
+                page = int(page_match.group(1)) if page_match else 1
+                body = render_listing_page(listing_match.group(1), page).encode("utf-8")
+            elif os.path.basename(path) and os.path.isfile(fixture_path):
+                with open(fixture_path, "rb") as fixture_file:
+                    body = fixture_file.read()
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Shein product-page fixtures locally.")
+    parser.add_argument("--port", type=int, default=8801)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before each page is sent")
+    args = parser.parse_args()
+
+    shein_server = start_fake_shein_server(port=args.port, latency_seconds=args.latency_ms / 1000)
+    print(f"Fake Shein pages at http://127.0.0.1:{args.port}/vestido-p-11365602-cat-1738.html (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        shein_server.shutdown()
@@ -0,0 +1,264 @@
+"""
+In-memory mock of the WooCommerce REST API, for offline benchmarks.
+
+Implements the endpoints the importer uses: products/categories (+ batch), products (+ batch),
+products/{id}, products/{id}/variations (+ batch), products/reviews and wp/v2/media, with
+X-WP-Total/X-WP-TotalPages pagination. Every request can be delayed (latency_seconds) and a
+fraction of them rejected with HTTP 429 + Retry-After (throttle_rate), like a store behind a WAF.
+GET /__stats returns request counts per route.
+
+Usage (from the repository root):
+    python benchmarks/mock_wc_server.py --port 8802 --latency-ms 40 --throttle-rate 0.02
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Categories referenced by resolve_gender_categories in main.py
+SEED_CATEGORIES = (
+    (15, "Uncategorized", 0), (183, "Ropa", 0), (184, "Ropa", 0), (145, "Ropa Mujer", 183),
+    (200, "Ropa Hombre", 184), (243, "Zapatos Mujer", 183), (298, "Joyeria y Bisuteria", 183),
+)
+
+
+class MockStore:
+    """Thread-safe in-memory catalog behind the mock server."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_id = 1000
+        self.categories = {cat_id: {"id": cat_id, "name": name, "parent": parent, "slug": name.lower()}
+                           for cat_id, name, parent in SEED_CATEGORIES}
+        self.products = {}
+        self.variations = {} # product ID -> {variation ID: variation}
+        self.reviews = []
+        self.media = {}
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def create_category(self, data):
+        with self._lock:
+            name = (data.get("name") or "").strip()
+            parent = int(data.get("parent") or 0)
+            if not name:
+                return 400, {"code": "rest_missing_callback_param", "message": "Missing parameter(s): name"}
+            for category in self.categories.values():
+                if category["parent"] == parent and category["name"].lower() == name.lower():
+                    return 400, {"code": "term_exists", "message": "A term with the name provided already exists.",
+                                 "data": {"status": 400, "resource_id": category["id"]}}
+            category = {"id": self._new_id(), "name": name, "parent": parent, "slug": name.lower().replace(" ", "-")}
+            self.categories[category["id"]] = category
+            return 201, category
+
+    def create_product(self, data):
+        with self._lock:
+            sku = data.get("sku")
+            if sku and any(product.get("sku") == sku for product in self.products.values()):
+                return 400, {"code": "product_invalid_sku", "message": "Invalid or duplicated SKU."}
+            product = dict(data, id=self._new_id())
+            product["permalink"] = f"https://mock-store.local/producto/{product['id']}/"
+            self.products[product["id"]] = product
+            self.variations[product["id"]] = {}
+            return 201, product
+
+    def update_product(self, product_id, data):
+        with self._lock:
+            if product_id not in self.products:
+                return 404, {"code": "woocommerce_rest_product_invalid_id", "message": "Invalid ID."}
+            self.products[product_id].update(data)
+            return 200, self.products[product_id]
+
+    def create_variation(self, product_id, data):
+        with self._lock:
+            if product_id not in self.products:
+                return 404, {"code": "woocommerce_rest_product_invalid_id", "message": "Invalid ID."}
+            sku = data.get("sku")
+            for variations in self.variations.values():
+                if sku and any(variation.get("sku") == sku for variation in variations.values()):
+                    return 400, {"code": "product_invalid_sku", "message": "Invalid or duplicated SKU."}
+            variation = dict(data, id=self._new_id(), parent_id=product_id)
+            variation.setdefault("stock_status", "instock")
+            self.variations[product_id][variation["id"]] = variation
+            return 201, variation
+
+    def update_variation(self, product_id, data):
+        with self._lock:
+            variation = self.variations.get(product_id, {}).get(int(data.get("id") or 0))
+            if variation is None:
+                return 404, {"code": "woocommerce_rest_product_variation_invalid_id", "message": "Invalid ID."}
+            variation.update(data)
+            return 200, variation
+
+    def add_review(self, data):
+        with self._lock:
+            review = dict(data, id=self._new_id())
+            self.reviews.append(review)
+            return 201, review
+
+    def add_media(self, filename):
+        with self._lock:
+            media_id = self._new_id()
+            self.media[media_id] = {"id": media_id, "source_url": f"https://mock-store.local/uploads/{filename}"}
+            return 201, self.media[media_id]
+
+
+def _batch(create, update, payload):
+    """Runs a WooCommerce-style {"create": [...], "update": [...]} batch; failed items carry an "error" object."""
+    response = {}
+    for action, handler in (("create", create), ("update", update)):
+        if action in payload:
+            results = []
+            for item in payload[action]:
+                status, result = handler(item)
+                results.append(result if status < 400 else {"id": 0, "error": dict(result, data={"status": status})})
+            response[action] = results
+    return 200, response
+
+
+def start_mock_wc_server(host="127.0.0.1", port=0, latency_seconds=0.0, throttle_rate=0.0, retry_after=0, seed=1):
+    """Starts the mock store on a background thread and returns the server (server.store is the catalog)."""
+    store = MockStore()
+    stats = Counter()
+    stats_lock = threading.Lock()
+    throttle_random = random.Random(seed)
+
+    def route(method, path, params, payload):
+        parts = path.strip("/").split("/")
+        if parts[:2] == ["wp", "v2"] and parts[2:] == ["media"] and method == "POST":
+            return "media", store.add_media(params.get("filename", "upload"))
+        if parts[:2] != ["wc", "v3"]:
+            return "unknown", (404, {"code": "rest_no_route", "message": "No route was found."})
+        resource = "/".join(parts[2:])
+
+        if resource == "products/categories":
+            if method == "GET":
+                return "categories.list", (200, list(store.categories.values()))
+            return "categories.create", store.create_category(payload)
+        if resource == "products/categories/batch":
+            return "categories.batch", _batch(store.create_category, lambda item: (501, {"code": "not_implemented"}), payload)
+        if resource == "products":
+            if method == "GET":
+                products = [p for p in store.products.values()
+                            if params.get("type") in (None, p.get("type"))
+                            and params.get("sku") in (None, p.get("sku"))]
+                return "products.list", (200, products)
+            return "products.create", store.create_product(payload)
+        if resource == "products/batch":
+            return "products.batch", _batch(store.create_product,
+                                            lambda item: store.update_product(int(item.get("id") or 0), item), payload)
+        if resource == "products/reviews" and method == "POST":
+            return "reviews.create", store.add_review(payload)
+
+        product_match = re.fullmatch(r"products/(\d+)(/variations(/batch)?)?", resource)
+        if product_match:
+            product_id = int(product_match.group(1))
+            if product_match.group(3):
+                return "variations.batch", _batch(lambda item: store.create_variation(product_id, item),
+                                                  lambda item: store.update_variation(product_id, item), payload)
+            if product_match.group(2):
+                if method == "GET":
+                    return "variations.list", (200, list(store.variations.get(product_id, {}).values()))
+                return "variations.create", store.create_variation(product_id, payload)
+            if method == "GET":
+                product = store.products.get(product_id)
+                return "products.get", (200, product) if product else (404, {"code": "woocommerce_rest_product_invalid_id"})
+            return "products.update", store.update_product(product_id, payload)
+        return "unknown", (404, {"code": "rest_no_route", "message": "No route was found."})
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _send_json(self, status, body, headers=None):
+            encoded = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            for header, value in (headers or {}).items():
+                self.send_header(header, str(value))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def _handle(self, method):
+            url = urlsplit(self.path)
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if url.path == "/__stats":
+                with stats_lock:
+                    self._send_json(200, dict(stats))
+                return
+            time.sleep(latency_seconds)
+            with stats_lock:
+                throttled = throttle_random.random() < throttle_rate
+            if throttled:
+                with stats_lock:
+                    stats["throttled"] += 1
+                self._send_json(429, {"code": "too_many_requests", "message": "Slow down."},
+                                {"Retry-After": retry_after})
+                return
+
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            disposition = self.headers.get("Content-Disposition", "")
+            filename_match = re.search(r'filename="?([^";]+)', disposition)
+            if filename_match:
+                params["filename"] = filename_match.group(1)
+            try:
+                payload = json.loads(body) if body and "json" in self.headers.get("Content-Type", "") else {}
+            except ValueError:
+                self._send_json(400, {"code": "rest_invalid_json", "message": "Invalid JSON body."})
+                return
+            route_name, (status, result) = route(method, url.path.split("/wp-json/", 1)[-1], params, payload)
+            with stats_lock:
+                stats[route_name] += 1
+
+            headers = {}
+            if method == "GET" and isinstance(result, list):
+                per_page = int(params.get("per_page", 10))
+                page = int(params.get("page", 1))
+                headers = {"X-WP-Total": len(result), "X-WP-TotalPages": max(1, math.ceil(len(result) / per_page))}
+                result = result[(page - 1) * per_page:page * per_page]
+            self._send_json(status, result, headers)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PUT(self):
+            self._handle("PUT")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.store = store
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve an in-memory mock WooCommerce REST API.")
+    parser.add_argument("--port", type=int, default=8802)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before each response")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with each 429")
+    args = parser.parse_args()
+
+    wc_server = start_mock_wc_server(port=args.port, latency_seconds=args.latency_ms / 1000,
+                                     throttle_rate=args.throttle_rate, retry_after=args.retry_after)
+    print(f"Mock WooCommerce store at http://127.0.0.1:{args.port}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        wc_server.shutdown()
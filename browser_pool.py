@@ -0,0 +1,119 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+import config
+
+
+class ScraperPool:
+    """
+    Pool of warm SheinScraper instances shared across products.
+    Chrome is launched at most `size` times; crashed drivers are detected with a
+    health check on acquire and transparently replaced.
+    """
+
+    def __init__(self, size=None, clear_cookies=None, scraper_factory=None):
+        self.size = size or config.SCRAPER_POOL_SIZE
+        self.clear_cookies = config.SCRAPER_POOL_CLEAR_COOKIES if clear_cookies is None else clear_cookies
+        self.scraper_factory = scraper_factory
+        self._idle = queue.LifoQueue() # LIFO so the most recently used (warmest) browser is reused first
+        self._lock = threading.Lock()
+        self._created_count = 0
+        self._all_scrapers = []
+        self._closed = False
+
+    def _create_scraper(self):
+        if self.scraper_factory is None:
+            from scraper import SheinScraper # Imported on the first launch, so an unused pool doesn't load selenium
+            self.scraper_factory = SheinScraper
+        scraper = self.scraper_factory()
+        with self._lock:
+            self._all_scrapers.append(scraper)
+        return scraper
+
+    def _discard(self, scraper):
+        with self._lock:
+            if scraper in self._all_scrapers:
+                self._all_scrapers.remove(scraper)
+                self._created_count -= 1
+        try:
+            scraper.quit_driver()
+        except Exception as e:
+            print(f"Error closing discarded WebDriver: {e}")
+
+    def acquire(self, timeout=None):
+        """
+        Returns a healthy SheinScraper, launching a new browser only while the pool is below its size.
+        """
+        if self._closed:
+            raise RuntimeError("ScraperPool is closed.")
+
+        try:
+            scraper = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created_count < self.size
+                if can_create:
+                    self._created_count += 1
+            if can_create:
+                try:
+                    return self._create_scraper()
+                except Exception:
+                    with self._lock:
+                        self._created_count -= 1
+                    raise
+            scraper = self._idle.get(timeout=timeout)
+
+        if not scraper.is_healthy():
+            print("Replacing crashed WebDriver in scraper pool.")
+            self._discard(scraper)
+            with self._lock:
+                self._created_count += 1
+            try:
+                return self._create_scraper()
+            except Exception:
+                with self._lock:
+                    self._created_count -= 1
+                raise
+        return scraper
+
+    def release(self, scraper):
+        """Resets the browser state and returns the scraper to the pool."""
+        if self._closed:
+            self._discard(scraper)
+            return
+        scraper.reset_session(clear_cookies=self.clear_cookies)
+        self._idle.put(scraper)
+
+    @contextmanager
+    def scraper(self, timeout=None):
+        scraper = self.acquire(timeout=timeout)
+        try:
+            yield scraper
+        finally:
+            self.release(scraper)
+
+    def memory_usage_bytes(self):
+        """Resident memory of every browser owned by the pool (scrapers that cannot report it count as 0)."""
+        with self._lock:
+            scrapers = list(self._all_scrapers)
+        return sum(scraper.chrome_rss_bytes() or 0 for scraper in scrapers)
+
+    def close(self):
+        """Quits every browser owned by the pool."""
+        self._closed = True
+        with self._lock:
+            scrapers = list(self._all_scrapers)
+            self._all_scrapers.clear()
+            self._created_count = 0
+        for scraper in scrapers:
+            try:
+                scraper.quit_driver()
+            except Exception as e:
+                print(f"Error closing pooled WebDriver: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
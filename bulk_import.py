@@ -0,0 +1,399 @@
+import argparse
+import csv
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+
+import config
+from browser_pool import ScraperPool
+from http_scraper import create_http_session
+from job_journal import JobJournal
+from metrics import metrics
+from multiprocess_scraper import scrape_in_processes
+from main import (
+    ProductImportError, create_scrape_cache, resolve_gender_categories, scrape_product_cached, store_journal,
+    upload_product_to_stores,
+)
+from woocommerce_manager import WooCommerceManager
+
+_STOP = object() # Queue sentinel telling a stage worker to exit
+
+
+def read_import_rows(path):
+    """
+    Yields raw rows from a .csv (header: url,sizes,markup,gender_code) or .jsonl file.
+    In CSV files the sizes column holds a comma-separated list, e.g. "S,M,XL". A JSONL line that
+    does not parse is yielded as its ValueError, so the row fails without ending the file.
+    """
+    if path.lower().endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as rows_file:
+            for line in rows_file:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield ValueError(f"Invalid JSON: {e}")
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as rows_file:
+            for row in csv.DictReader(rows_file):
+                yield row
+
+
+def normalize_import_row(raw_row):
+    """
+    Validates a raw row and returns a dict with url, sizes (list), markup (str) and gender_code (str).
+    Raises ValueError for rows that cannot be imported.
+    """
+    if isinstance(raw_row, Exception): # Unreadable row, see read_import_rows
+        raise ValueError(str(raw_row))
+    if not isinstance(raw_row, dict):
+        raise ValueError(f"Row is not an object with url, sizes, markup and gender_code: {raw_row!r}")
+    url = (raw_row.get("url") or "").strip()
+    if not url:
+        raise ValueError("Missing url.")
+
+    sizes = raw_row.get("sizes") or []
+    if isinstance(sizes, str):
+        sizes = sizes.split(",")
+    sizes = [str(size).strip().upper() for size in sizes if str(size).strip()]
+    if not sizes:
+        raise ValueError("Missing sizes.")
+
+    markup = str(raw_row.get("markup", "")).strip()
+    if not markup.isdigit():
+        raise ValueError(f"Invalid markup '{markup}'.")
+
+    gender_code = str(raw_row.get("gender_code", "")).strip()
+    return {"url": url, "sizes": sizes, "markup": markup, "gender_code": gender_code}
+
+
+def run_bulk_import(raw_rows, scrape_workers=None, upload_workers=None, queue_size=None, bypass_cache=False,
+                    scrape_processes=None, stores=None, export_csv=None):
+    """
+    Imports many products with scraping and WooCommerce upload running as separate
+    pipeline stages connected by bounded queues, so product N+1 is scraped while
+    product N is uploaded. Upload workers take scraped products in batches and create
+    the categories of a whole batch together (see WooCommerceManager.plan_categories).
+    With scrape_processes (or config.SCRAPE_PROCESSES), the scrape stage runs on that many
+    worker processes, each with its own browser, instead of threads sharing this process.
+    Each product is scraped once and uploaded to every store in stores (default
+    config.TARGET_STORES) concurrently. With export_csv (a file path), products are written to a
+    WooCommerce product CSV per store instead (see csv_exporter.py) and the API is never called.
+
+    Returns:
+        list: One result dict per row (row, url, status, stage, error, product_id, action, stores),
+        in row order. product_id/action are those of the first store; stores holds the
+        per-store status, product_id, action and error. A row is "ok" only if every store succeeded.
+    """
+    scrape_workers = scrape_workers or config.BULK_SCRAPE_WORKERS
+    upload_workers = upload_workers or config.BULK_UPLOAD_WORKERS
+    queue_size = queue_size or config.BULK_QUEUE_SIZE
+    scrape_processes = config.SCRAPE_PROCESSES if scrape_processes is None else scrape_processes
+    # Only one thread consumes the scrape queue in process mode; it hands the rows to the processes
+    scrape_consumers = 1 if scrape_processes else scrape_workers
+
+    scrape_queue = queue.Queue(maxsize=queue_size)
+    upload_queue = queue.Queue(maxsize=queue_size)
+    results = {}
+    results_lock = threading.Lock()
+
+    def record(row_number, url, status, stage, error=None, product_id=None, action=None, stores=None):
+        with results_lock:
+            results[row_number] = {
+                "row": row_number, "url": url, "status": status, "stage": stage, "error": error,
+                "product_id": product_id, "action": action, "stores": stores or {},
+            }
+        metrics.incr("products", status=status, stage=stage)
+
+    scraper_pool = ScraperPool(size=scrape_workers) # Browsers are only launched when first needed
+    http_session = create_http_session() if config.SCRAPER_BACKEND == "http" else None
+    scrape_cache = create_scrape_cache(bypass_cache)
+    store_names = stores or config.TARGET_STORES
+    csv_exporters = {}
+    if export_csv:
+        from csv_exporter import WooCommerceCsvExporter
+        export_root, export_extension = os.path.splitext(export_csv)
+        for name in store_names:
+            path = export_csv if len(store_names) == 1 else f"{export_root}-{name}{export_extension or '.csv'}"
+            csv_exporters[name] = WooCommerceCsvExporter(path, store=name)
+        woo_commerce_managers = []
+    else:
+        woo_commerce_managers = [WooCommerceManager(store=name) for name in store_names]
+
+    def feed_rows():
+        row_number = 0
+        try:
+            for row_number, raw_row in enumerate(raw_rows, start=1):
+                try:
+                    row = normalize_import_row(raw_row)
+                except ValueError as e:
+                    record(row_number, raw_row.get("url") if isinstance(raw_row, dict) else None, "failed", "input",
+                           str(e))
+                    continue
+                scrape_queue.put((row_number, row)) # Blocks while the scrape stage is saturated
+        except Exception as e:
+            # The row source itself failed (unreadable file, crawler error): later rows cannot be read
+            traceback.print_exc()
+            record(row_number + 1, None, "failed", "input", f"Reading rows failed: {e}")
+        finally:
+            for _ in range(scrape_consumers): # Always sent, so the stages shut down
+                scrape_queue.put(_STOP)
+
+    def row_job_id(row):
+        return JobJournal.job_id_for(row["url"], row["sizes"], row["markup"], row["gender_code"])
+
+    def scrape_stage():
+        while True:
+            item = scrape_queue.get()
+            if item is _STOP:
+                break
+            row_number, row = item
+            journal = JobJournal(row_job_id(row))
+            try:
+                with metrics.trace(journal.job_id):
+                    scraped_product_data, translated_product_reviews = scrape_product_cached(
+                        row["url"], scraper_pool, http_session, scrape_cache, journal)
+            except Exception as e:
+                if not isinstance(e, ProductImportError):
+                    traceback.print_exc()
+                record(row_number, row["url"], "failed", "scrape", str(e))
+                continue
+            upload_queue.put((row_number, row, journal, scraped_product_data, translated_product_reviews))
+
+    def process_scrape_stage():
+        rows_in_flight = {}
+        rows_lock = threading.Lock()
+        aborted = threading.Event() # The process pool failed; remaining rows are failed, not scraped
+        stop_received = threading.Event()
+
+        def scrape_tasks():
+            while not aborted.is_set():
+                item = scrape_queue.get()
+                if item is _STOP:
+                    stop_received.set()
+                    return
+                row_number, row = item
+                with rows_lock:
+                    if aborted.is_set():
+                        record(row_number, row["url"], "failed", "scrape", "Scrape processes failed.")
+                        return
+                    rows_in_flight[row_number] = row
+                yield row_number, row["url"], row_job_id(row)
+
+        try:
+            for row_number, status, payload in scrape_in_processes(
+                    scrape_tasks(), workers=scrape_processes, bypass_cache=bypass_cache, queue_size=queue_size):
+                with rows_lock:
+                    row = rows_in_flight.pop(row_number)
+                journal = JobJournal(row_job_id(row)) # Re-read: the worker process recorded the scrape stage
+                if payload["seconds"] is not None:
+                    with metrics.trace(journal.job_id):
+                        metrics.observe("stage.scrape", payload["seconds"], "ok" if status == "ok" else "error")
+                if status != "ok":
+                    record(row_number, row["url"], "failed", "scrape", payload["error"])
+                    continue
+                upload_queue.put((row_number, row, journal, payload["details"], payload["reviews"]))
+        except Exception as e:
+            # E.g. a worker process that died before it was ready: fail the rows instead of leaving them queued
+            traceback.print_exc()
+            error = f"Scrape processes failed: {e}"
+            with rows_lock:
+                aborted.set()
+                for row_number, row in rows_in_flight.items():
+                    record(row_number, row["url"], "failed", "scrape", error)
+                rows_in_flight.clear()
+            # Keep consuming until _STOP, so the feeder is never left blocked on a full scrape queue
+            while not stop_received.is_set():
+                try:
+                    item = scrape_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is _STOP:
+                    break
+                row_number, row = item
+                record(row_number, row["url"], "failed", "scrape", error)
+
+    def next_upload_batch():
+        """
+        Blocks for one scraped item, then keeps collecting for up to BULK_CATEGORY_BATCH_WAIT seconds.
+        Returns (items, stop) where stop means this worker's _STOP was received.
+        """
+        item = upload_queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + config.BULK_CATEGORY_BATCH_WAIT
+        while len(batch) < config.BULK_CATEGORY_BATCH_SIZE:
+            try:
+                item = upload_queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def plan_batch_categories(batch):
+        """
+        Resolves the categories of every item in the batch at once, per store.
+        Returns one {store name: category IDs} dict per item; stores missing from it resolve per product.
+        """
+        planned_category_ids = [{} for _ in batch]
+        for woo_commerce_manager in woo_commerce_managers:
+            category_requests = []
+            for _, row, _, scraped_product_data, _ in batch:
+                initial_category_ids, parent_category_id = resolve_gender_categories(
+                    row["gender_code"], woo_commerce_manager.store)
+                category_requests.append(
+                    (scraped_product_data.get("shein_categories", []), parent_category_id, initial_category_ids))
+            try:
+                resolved = woo_commerce_manager.plan_categories(category_requests)
+            except Exception as e:
+                print(f"Error planning categories for {len(batch)} products in store "
+                      f"'{woo_commerce_manager.store_name}', resolving them one by one: {e}")
+                continue
+            for category_ids_by_store, category_ids in zip(planned_category_ids, resolved):
+                category_ids_by_store[woo_commerce_manager.store_name] = category_ids
+        return planned_category_ids
+
+    def upload_stage():
+        stop = False
+        while not stop:
+            batch, stop = next_upload_batch()
+            if not batch:
+                continue # _STOP with nothing collected: no categories to plan (planning may reload the index)
+            for item, category_ids_by_store in zip(batch, plan_batch_categories(batch)):
+                row_number, row, journal, scraped_product_data, translated_product_reviews = item
+                store_outcomes = upload_product_to_stores(
+                    woo_commerce_managers, scraped_product_data, translated_product_reviews,
+                    row["sizes"], row["markup"], row["gender_code"], row["url"], journal.job_id,
+                    category_ids_by_store=category_ids_by_store
+                )
+                store_results = {
+                    store_name: {
+                        "status": outcome["status"],
+                        "product_id": outcome.get("result", {}).get("product_id"),
+                        "action": outcome.get("result", {}).get("action"),
+                        "error": outcome.get("error"),
+                    }
+                    for store_name, outcome in store_outcomes.items()
+                }
+                first_store = store_results[woo_commerce_managers[0].store_name]
+                failed_stores = {name: result for name, result in store_results.items() if result["status"] != "ok"}
+                if failed_stores:
+                    error = "; ".join(f"{name}: {result['error']}" for name, result in failed_stores.items())
+                    record(row_number, row["url"], "failed", "upload", error,
+                           product_id=first_store["product_id"], action=first_store["action"], stores=store_results)
+                    continue
+                for store_name in store_results:
+                    store_journal(journal.job_id, store_name).discard()
+                journal.discard() # Row complete in every store, nothing left to resume
+                record(row_number, row["url"], "ok", "done", product_id=first_store["product_id"],
+                       action=first_store["action"], stores=store_results)
+
+    def export_stage():
+        while True:
+            item = upload_queue.get()
+            if item is _STOP:
+                break
+            row_number, row, journal, scraped_product_data, _ = item
+            store_results = {}
+            for store_name, csv_exporter in csv_exporters.items():
+                try:
+                    csv_exporter.write_product(scraped_product_data, row["sizes"], row["markup"], row["gender_code"],
+                                               row["url"])
+                    store_results[store_name] = {"status": "ok", "product_id": None, "action": "exported",
+                                                 "error": None}
+                except Exception as e:
+                    traceback.print_exc()
+                    store_results[store_name] = {"status": "failed", "product_id": None, "action": None,
+                                                 "error": str(e)}
+            failed_stores = {name: result for name, result in store_results.items() if result["status"] != "ok"}
+            if failed_stores:
+                error = "; ".join(f"{name}: {result['error']}" for name, result in failed_stores.items())
+                record(row_number, row["url"], "failed", "export", error, stores=store_results)
+                continue
+            journal.discard()
+            record(row_number, row["url"], "ok", "done", action="exported", stores=store_results)
+
+    feeder_thread = threading.Thread(target=feed_rows, name="bulk-feeder", daemon=True)
+    scrape_threads = [threading.Thread(target=process_scrape_stage if scrape_processes else scrape_stage,
+                                       name=f"bulk-scrape-{i}", daemon=True)
+                      for i in range(scrape_consumers)]
+    upload_threads = [threading.Thread(target=export_stage if export_csv else upload_stage, name=f"bulk-upload-{i}",
+                                       daemon=True)
+                      for i in range(upload_workers)]
+
+    try:
+        for thread in [feeder_thread] + scrape_threads + upload_threads:
+            thread.start()
+        feeder_thread.join()
+        for thread in scrape_threads:
+            thread.join()
+        for _ in range(upload_workers):
+            upload_queue.put(_STOP)
+        for thread in upload_threads:
+            thread.join()
+    finally:
+        scraper_pool.close()
+        for csv_exporter in csv_exporters.values():
+            csv_exporter.close()
+
+    return [results[row_number] for row_number in sorted(results)]
+
+
+def print_summary(results, elapsed_seconds):
+    succeeded = [r for r in results if r["status"] == "ok"]
+    print("\n####################### \n  BULK IMPORT SUMMARY    \n#######################")
+    for r in results:
+        if r["status"] == "ok" and r["action"] == "exported":
+            print(f"Row {r['row']}: OK - exported to CSV ({r['url']})")
+        elif r["status"] == "ok" and len(r["stores"]) > 1:
+            print(f"Row {r['row']}: OK - " + ", ".join(
+                f"{store_name}: product ID {store['product_id']} {store['action']}"
+                for store_name, store in r["stores"].items()) + f" ({r['url']})")
+        elif r["status"] == "ok":
+            print(f"Row {r['row']}: OK - product ID {r['product_id']} {r['action']} ({r['url']})")
+        else:
+            print(f"Row {r['row']}: FAILED at {r['stage']} - {r['error']} ({r['url']})")
+    print(f"\n{len(succeeded)}/{len(results)} products imported in {elapsed_seconds:.1f}s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import Shein products into WooCommerce.")
+    parser.add_argument("rows_file", help="CSV (url,sizes,markup,gender_code) or JSONL file with one product per row")
+    parser.add_argument("--scrape-workers", type=int, default=config.BULK_SCRAPE_WORKERS,
+                        help="Concurrent browsers in the scrape stage")
+    parser.add_argument("--scrape-processes", type=int, default=config.SCRAPE_PROCESSES,
+                        help="Scrape on this many worker processes (one browser each) instead of threads; "
+                             "capped by CPU count and SCRAPE_PROCESS_RSS_BUDGET_MB")
+    parser.add_argument("--upload-workers", type=int, default=config.BULK_UPLOAD_WORKERS,
+                        help="Concurrent WooCommerce uploads in the upload stage")
+    parser.add_argument("--queue-size", type=int, default=config.BULK_QUEUE_SIZE,
+                        help="Max items waiting between pipeline stages")
+    parser.add_argument("--stores", default=",".join(config.TARGET_STORES),
+                        help="Comma-separated store names from the registry; each product is scraped once "
+                             "and uploaded to all of them concurrently")
+    parser.add_argument("--refresh-cache", action="store_true",
+                        help="Ignore cached scrape results for this run and re-scrape every product")
+    parser.add_argument("--export-csv", metavar="PATH",
+                        help="Write the products to a WooCommerce product CSV (one file per store) instead of "
+                             "uploading them through the API")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    bulk_results = run_bulk_import(
+        read_import_rows(args.rows_file),
+        scrape_workers=args.scrape_workers,
+        upload_workers=args.upload_workers,
+        queue_size=args.queue_size,
+        bypass_cache=args.refresh_cache,
+        scrape_processes=args.scrape_processes,
+        stores=[name.strip() for name in args.stores.split(",") if name.strip()],
+        export_csv=args.export_csv,
+    )
+    print_summary(bulk_results, time.time() - start_time)
+    metrics.write_reports(run_name="bulk_import")
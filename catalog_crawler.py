@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import config
+from metrics import metrics
+from product_index import ProductIndex
+from shein_parsing import goods_id_from_url, parse_listing_product_urls
+from stores import get_store
+
+
+class SeenSet:
+    """
+    Persistent set of Shein goods IDs the crawler has imported, so later crawls of overlapping
+    categories do not queue them again. IDs are only added once their import succeeded.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.CRAWLER_SEEN_PATH
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as seen_file:
+                self.goods_ids = set(json.load(seen_file))
+        except (OSError, ValueError):
+            self.goods_ids = set()
+
+    def __contains__(self, goods_id):
+        with self._lock:
+            return goods_id in self.goods_ids
+
+    def add(self, goods_id):
+        with self._lock:
+            self.goods_ids.add(goods_id)
+
+    def save(self):
+        with self._lock:
+            goods_ids = sorted(self.goods_ids)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as seen_file:
+            json.dump(goods_ids, seen_file)
+        os.replace(tmp_path, self.path)
+
+
+def listing_page_url(listing_url, page):
+    """Returns listing_url with its ?page= parameter set (Shein paginates listings with it)."""
+    parts = urlsplit(listing_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "page"]
+    if page > 1:
+        query.append(("page", str(page)))
+    return parts._replace(query=urlencode(query)).geturl()
+
+
+def imported_goods_ids(stores=None):
+    """Goods IDs already imported into every one of the stores (a product missing in any store is not skipped)."""
+    known_goods_ids = None
+    for store_name in stores or config.TARGET_STORES:
+        product_index = ProductIndex(path=get_store(store_name)["product_index_path"])
+        try:
+            store_goods_ids = product_index.known_goods_ids()
+        finally:
+            product_index.close()
+        known_goods_ids = store_goods_ids if known_goods_ids is None else known_goods_ids & store_goods_ids
+    return known_goods_ids or set()
+
+
+class CatalogCrawler:
+    """
+    Walks Shein category/listing pages page by page and yields the product URLs not seen before.
+    Pages are loaded with a SheinScraper (listing cards are rendered client-side), or over HTTP
+    when config.SCRAPER_BACKEND is "http".
+    """
+
+    def __init__(self, seen_set=None, known_goods_ids=None, max_pages=None, page_delay=None, scraper=None,
+                 http_session=None, skip_seen=True):
+        """
+        known_goods_ids are skipped (already imported). skip_seen=False also yields products in the
+        seen set. The crawler only reads the seen set; the caller adds products once imported.
+        """
+        self.seen_set = seen_set if seen_set is not None else SeenSet()
+        self.skip_seen = skip_seen
+        self.known_goods_ids = set(known_goods_ids or ())
+        self.max_pages = max_pages or config.CRAWLER_MAX_PAGES
+        self.page_delay = config.CRAWLER_PAGE_DELAY if page_delay is None else page_delay
+        self.scraper = scraper
+        self.http_session = http_session
+        self._owns_scraper = False
+
+    def fetch_listing_html(self, page_url):
+        if config.SCRAPER_BACKEND == "http":
+            if self.http_session is None:
+                from http_scraper import create_http_session
+                self.http_session = create_http_session()
+            try:
+                response = self.http_session.get(page_url, timeout=config.SHEIN_HTTP_TIMEOUT)
+                response.raise_for_status()
+                return response.text
+            except Exception as e:
+                print(f"Error fetching listing page {page_url}: {e}")
+                return None
+        if self.scraper is None:
+            from scraper import SheinScraper # Imported lazily: selenium is only needed for browser crawls
+            self.scraper = SheinScraper()
+            self._owns_scraper = True
+        return self.scraper.get_listing_html(page_url)
+
+    def crawl(self, listing_urls):
+        """
+        Yields (product URL, goods ID) for every new product found on the listing pages, as soon
+        as its page is parsed. A listing ends at max_pages, or at the first page without products
+        this crawl has not already found (Shein repeats the last page past the end). A product
+        listed under several of the URLs is yielded once. A page that cannot be loaded (including a
+        browser that fails to start) ends its listing with an error message instead of the crawl.
+        """
+        queued_goods_ids = set()
+        for listing_url in listing_urls:
+            found_in_listing = set()
+            for page in range(1, self.max_pages + 1):
+                page_url = listing_page_url(listing_url, page)
+                try:
+                    with metrics.span("crawler.listing_page"):
+                        products = parse_listing_product_urls(self.fetch_listing_html(page_url) or "", page_url)
+                except Exception as e:
+                    print(f"Error loading listing page {page_url}, skipping the rest of this listing: {e}")
+                    metrics.incr("crawler_listing_errors")
+                    break
+                new_on_page = [(url, goods_id) for url, goods_id in products if goods_id not in found_in_listing]
+                print(f"Listing page {page}: {len(products)} products, {len(new_on_page)} not seen on earlier pages "
+                      f"({page_url})")
+                if not new_on_page:
+                    break
+                for product_url, goods_id in new_on_page:
+                    found_in_listing.add(goods_id)
+                    if goods_id in queued_goods_ids or goods_id in self.known_goods_ids or (
+                            self.skip_seen and goods_id in self.seen_set):
+                        metrics.incr("crawler_products", outcome="skipped")
+                        continue
+                    queued_goods_ids.add(goods_id)
+                    metrics.incr("crawler_products", outcome="queued")
+                    yield product_url, goods_id
+                time.sleep(self.page_delay)
+
+    def close(self):
+        if self._owns_scraper and self.scraper is not None:
+            self.scraper.quit_driver()
+            self.scraper = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl Shein listing pages and import every new product.")
+    parser.add_argument("listing_urls", nargs="+", help="Shein category/listing page URLs")
+    parser.add_argument("--sizes", required=True, help="Comma-separated sizes imported for every product, e.g. S,M,L")
+    parser.add_argument("--markup", required=True, help="Markup percentage, e.g. 20")
+    parser.add_argument("--gender-code", required=True, help="Gender/category code (see main.py)")
+    parser.add_argument("--max-pages", type=int, default=config.CRAWLER_MAX_PAGES, help="Listing pages per URL")
+    parser.add_argument("--max-products", type=int, help="Stop after queueing this many new products")
+    parser.add_argument("--stores", default=",".join(config.TARGET_STORES),
+                        help="Comma-separated store names; products already in all of them are skipped")
+    parser.add_argument("--ignore-seen", action="store_true",
+                        help="Also queue products imported by earlier crawls (still skips ones in every store's index)")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the new product URLs")
+    parser.add_argument("--scrape-workers", type=int, default=config.BULK_SCRAPE_WORKERS)
+    parser.add_argument("--upload-workers", type=int, default=config.BULK_UPLOAD_WORKERS)
+    parser.add_argument("--scrape-processes", type=int, default=config.SCRAPE_PROCESSES)
+    args = parser.parse_args()
+
+    stores = [name.strip() for name in args.stores.split(",") if name.strip()]
+    seen_set = SeenSet()
+    crawler = CatalogCrawler(
+        seen_set=seen_set,
+        known_goods_ids=imported_goods_ids(stores),
+        max_pages=args.max_pages,
+        skip_seen=not args.ignore_seen,
+    )
+
+    def crawled_rows():
+        for queued_count, (product_url, _) in enumerate(crawler.crawl(args.listing_urls), start=1):
+            if args.dry_run:
+                print(product_url)
+            else:
+                yield {"url": product_url, "sizes": args.sizes, "markup": args.markup, "gender_code": args.gender_code}
+            if args.max_products and queued_count >= args.max_products:
+                break
+
+    start_time = time.time()
+    try:
+        if args.dry_run:
+            for _ in crawled_rows():
+                pass
+        else:
+            from bulk_import import print_summary, run_bulk_import
+            # Rows stream into the pipeline while the crawler is still walking listing pages
+            bulk_results = run_bulk_import(
+                crawled_rows(), scrape_workers=args.scrape_workers, upload_workers=args.upload_workers,
+                scrape_processes=args.scrape_processes, stores=stores)
+            # Only imported products are remembered: failed or unfinished ones are queued again next crawl
+            for result in bulk_results:
+                if result["status"] == "ok":
+                    seen_set.add(goods_id_from_url(result["url"]))
+            seen_set.save()
+            print_summary(bulk_results, time.time() - start_time)
+            metrics.write_reports(run_name="catalog_crawler")
+    finally:
+        crawler.close()
@@ -0,0 +1,124 @@
+import html
+import json
+import os
+import time
+
+import config
+
+
+class CategoryIndex:
+    """
+    On-disk index of WooCommerce product categories, keyed by (parent_id, normalized name).
+    The whole category tree is loaded once (all pages) and reused until the TTL expires;
+    categories created afterwards are added incrementally. Every category is kept by ID with its
+    parent and original name, so one lost in a name collision is still known.
+    """
+
+    def __init__(self, path=None, ttl_seconds=None):
+        self.path = path or config.CATEGORY_INDEX_PATH
+        self.ttl_seconds = config.CATEGORY_INDEX_TTL if ttl_seconds is None else ttl_seconds
+        self.categories = {}  # (parent_id, normalized name) -> category ID
+        self.records = {}  # category ID -> {"parent": parent_id, "name": name as shown in WooCommerce}
+        self.loaded_at = None
+
+    @staticmethod
+    def normalize_name(name):
+        """WooCommerce returns names HTML-escaped (e.g. '&amp;'), so unescape before comparing."""
+        return " ".join(html.unescape(name).split()).lower()
+
+    def is_fresh(self):
+        return self.loaded_at is not None and (time.time() - self.loaded_at) < self.ttl_seconds
+
+    def load(self, allow_expired=False):
+        """
+        Loads the index from disk. Returns True if a fresh (non-expired) index is available.
+        allow_expired also accepts an expired index, for offline use where it cannot be refreshed.
+        """
+        if self.is_fresh() or (allow_expired and self.categories):
+            return True
+        try:
+            with open(self.path, "r", encoding="utf-8") as index_file:
+                stored = json.load(index_file)
+        except (OSError, ValueError):
+            return False
+
+        if not allow_expired and (time.time() - stored.get("loaded_at", 0)) >= self.ttl_seconds:
+            print(f"Category index at {self.path} expired, it will be reloaded from WooCommerce.")
+            return False
+
+        self._set_records(stored.get("categories", []))
+        self.loaded_at = stored["loaded_at"]
+        print(f"Loaded {len(self.records)} categories from index {self.path}.")
+        return True
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        stored = {
+            "loaded_at": self.loaded_at,
+            "categories": [
+                {"parent": record["parent"], "name": record["name"], "id": cat_id}
+                for cat_id, record in self.records.items()
+            ],
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(stored, index_file, ensure_ascii=False)
+        os.replace(tmp_path, self.path) # Atomic swap so a crash never leaves a half-written index
+
+    def replace_all(self, wc_categories):
+        """Rebuilds the index from the full list of categories returned by WooCommerce."""
+        self._set_records(
+            {"id": cat["id"], "parent": cat.get("parent", 0), "name": cat["name"]} for cat in wc_categories)
+        self.loaded_at = time.time()
+        self.save()
+
+    def _set_records(self, entries):
+        """
+        Replaces the index with {"id", "parent", "name"} entries. When two categories of the same
+        parent share a normalized name, lookups resolve to the lowest ID (and the collision is logged).
+        """
+        self.records = {
+            entry["id"]: {"parent": entry["parent"], "name": " ".join(html.unescape(entry["name"]).split())}
+            for entry in entries
+        }
+        self.categories = {}
+        for cat_id in sorted(self.records):
+            record = self.records[cat_id]
+            key = (record["parent"], self.normalize_name(record["name"]))
+            if key in self.categories:
+                print(f"Warning: Categories {self.categories[key]} and {cat_id} are both named '{record['name']}' "
+                      f"under parent {record['parent']}; lookups use {self.categories[key]}.")
+                continue
+            self.categories[key] = cat_id
+
+    def category_path(self, category_id):
+        """
+        Returns the names from the root down to category_id (e.g. ["Ropa", "Ropa Mujer"]), as shown
+        in WooCommerce, or None when the category or one of its parents is unknown.
+        """
+        names = []
+        while category_id:
+            if category_id not in self.records or len(names) > 20: # Unknown, or a cycle in a corrupt index
+                return None
+            record = self.records[category_id]
+            names.insert(0, record["name"])
+            category_id = record["parent"]
+        return names
+
+    def get(self, parent_id, name):
+        return self.categories.get((parent_id, self.normalize_name(name)))
+
+    def add(self, category_id, parent_id, name):
+        """Records a newly created category and persists the index."""
+        self.add_many([(category_id, parent_id, name)])
+
+    def add_many(self, categories):
+        """Records (category_id, parent_id, name) entries created in one batch and persists the index once."""
+        for category_id, parent_id, name in categories:
+            self.records[category_id] = {"parent": parent_id, "name": " ".join(html.unescape(name).split())}
+            self.categories.setdefault((parent_id, self.normalize_name(name)), category_id)
+        if self.loaded_at is None:
+            self.loaded_at = time.time()
+        self.save()
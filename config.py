@@ -11,3 +11,136 @@ list_of_domains = (
 
 WC_CONSUMER_KEY = os.getenv("CONSUMER_KEY")
 WC_CONSUMER_SECRET = os.getenv("CONSUMER_SECRET")
+
+# Max number of items per WooCommerce */batch request (server default is 100)
+WC_BATCH_SIZE = int(os.getenv("WC_BATCH_SIZE", "100"))
+
+# Local cache directory for indexes and other persisted importer state
+CACHE_DIR = os.getenv("IMPORTER_CACHE_DIR", ".importer_cache")
+
+# WooCommerce category index (all pages, keyed by parent + name), refreshed after the TTL
+CATEGORY_INDEX_PATH = os.getenv("CATEGORY_INDEX_PATH", os.path.join(CACHE_DIR, "category_index.json"))
+CATEGORY_INDEX_TTL = int(os.getenv("CATEGORY_INDEX_TTL", str(24 * 3600)))
+
+# Browser pool used when importing several products in one run
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "1"))
+SCRAPER_POOL_CLEAR_COOKIES = os.getenv("SCRAPER_POOL_CLEAR_COOKIES", "false").lower() == "true"
+
+# Bulk import pipeline (bulk_import.py): workers per stage and bounded queue size between stages
+BULK_SCRAPE_WORKERS = int(os.getenv("BULK_SCRAPE_WORKERS", "1"))
+BULK_UPLOAD_WORKERS = int(os.getenv("BULK_UPLOAD_WORKERS", "1"))
+BULK_QUEUE_SIZE = int(os.getenv("BULK_QUEUE_SIZE", "4"))
+# Upload workers group up to BULK_CATEGORY_BATCH_SIZE scraped products, waiting at most
+# BULK_CATEGORY_BATCH_WAIT seconds for more, and create their missing categories together
+BULK_CATEGORY_BATCH_SIZE = int(os.getenv("BULK_CATEGORY_BATCH_SIZE", "20"))
+BULK_CATEGORY_BATCH_WAIT = float(os.getenv("BULK_CATEGORY_BATCH_WAIT", "1"))
+# Process-pool scraping (multiprocess_scraper.py): 0 keeps scraping on threads in this process.
+# Each process owns one browser; SCRAPE_PROCESS_RSS_BUDGET_MB caps the memory of one worker
+# (Python + Chrome) and also limits how many workers are started on the available RAM.
+SCRAPE_PROCESSES = int(os.getenv("SCRAPE_PROCESSES", "0"))
+SCRAPE_PROCESS_RSS_BUDGET_MB = int(os.getenv("SCRAPE_PROCESS_RSS_BUDGET_MB", "1024"))
+
+# Catalog crawler (catalog_crawler.py): listing pages walked per URL, scrolling to load lazy product
+# cards, delay between listing pages, and the persistent set of goods IDs already imported by crawls
+CRAWLER_MAX_PAGES = int(os.getenv("CRAWLER_MAX_PAGES", "50"))
+CRAWLER_SCROLLS = int(os.getenv("CRAWLER_SCROLLS", "4"))
+CRAWLER_SCROLL_PAUSE = float(os.getenv("CRAWLER_SCROLL_PAUSE", "0.75"))
+CRAWLER_PAGE_DELAY = float(os.getenv("CRAWLER_PAGE_DELAY", "1"))
+CRAWLER_SEEN_PATH = os.getenv("CRAWLER_SEEN_PATH", os.path.join(CACHE_DIR, "crawler_seen.json"))
+
+# SheinScraper session recycling: Chrome is relaunched between products once a limit is reached (0 disables it)
+SCRAPER_RECYCLE_MAX_PAGES = int(os.getenv("SCRAPER_RECYCLE_MAX_PAGES", "200"))
+SCRAPER_RECYCLE_MAX_AGE = float(os.getenv("SCRAPER_RECYCLE_MAX_AGE", "3600")) # Session age in seconds
+SCRAPER_RECYCLE_MAX_RSS_MB = int(os.getenv("SCRAPER_RECYCLE_MAX_RSS_MB", "1500")) # chromedriver + Chrome process tree
+SCRAPER_RECYCLE_MAX_FAILURES = int(os.getenv("SCRAPER_RECYCLE_MAX_FAILURES", "3")) # Consecutive extraction failures
+
+# SheinScraper wait ceilings in seconds (waits end as soon as the condition is met)
+SCRAPER_PAGE_READY_TIMEOUT = float(os.getenv("SCRAPER_PAGE_READY_TIMEOUT", "30"))
+SCRAPER_PRODUCT_INTRO_TIMEOUT = float(os.getenv("SCRAPER_PRODUCT_INTRO_TIMEOUT", "15"))
+SCRAPER_POPUP_TIMEOUT = float(os.getenv("SCRAPER_POPUP_TIMEOUT", "5"))
+SCRAPER_DESCRIPTION_TIMEOUT = float(os.getenv("SCRAPER_DESCRIPTION_TIMEOUT", "10"))
+
+# Collect all product fields with one execute_script call (falls back to per-element lookups)
+SCRAPER_SCRIPT_EXTRACTION = os.getenv("SCRAPER_SCRIPT_EXTRACTION", "true").lower() == "true"
+
+# Scraper backend: "selenium" (Chrome) or "http" (parse embedded JSON, Chrome only as fallback)
+SCRAPER_BACKEND = os.getenv("SCRAPER_BACKEND", "selenium").lower()
+SHEIN_HTTP_POOL_SIZE = int(os.getenv("SHEIN_HTTP_POOL_SIZE", "10"))
+SHEIN_HTTP_TIMEOUT = float(os.getenv("SHEIN_HTTP_TIMEOUT", "20"))
+
+# Chrome profile for SheinScraper: "default" (visible browser) or "fast" (headless, resource blocking)
+SCRAPER_PROFILE = os.getenv("SCRAPER_PROFILE", "default").lower()
+SCRAPER_FAST_WINDOW_SIZE = os.getenv("SCRAPER_FAST_WINDOW_SIZE", "1280,900")
+
+# chromedriver binary: a fixed CHROMEDRIVER_PATH works offline and skips any download/version check.
+# Otherwise the path found by webdriver-manager is cached and reused until the TTL expires.
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+CHROMEDRIVER_CACHE_PATH = os.getenv("CHROMEDRIVER_CACHE_PATH", os.path.join(CACHE_DIR, "chromedriver.json"))
+CHROMEDRIVER_CACHE_TTL = int(os.getenv("CHROMEDRIVER_CACHE_TTL", str(7 * 24 * 3600)))
+
+# WooCommerce REST transport: pooled keep-alive session with retries on connection errors and 5xx
+WC_STORE_URL = os.getenv("WC_STORE_URL", "https://pjwaterfilters.com/")
+WC_TIMEOUT = float(os.getenv("WC_TIMEOUT", "120"))
+WC_POOL_SIZE = int(os.getenv("WC_POOL_SIZE", "10"))
+WC_MAX_RETRIES = int(os.getenv("WC_MAX_RETRIES", "3"))
+WC_BACKOFF_FACTOR = float(os.getenv("WC_BACKOFF_FACTOR", "0.5"))
+# Send keys as query parameters instead of HTTP Basic auth (for servers that strip the Authorization header)
+WC_QUERY_STRING_AUTH = os.getenv("WC_QUERY_STRING_AUTH", "false").lower() == "true"
+
+# Adaptive rate limiter shared by every WooCommerce call to a store (token bucket + AIMD)
+WC_RATE_LIMIT_MAX = float(os.getenv("WC_RATE_LIMIT_MAX", "25"))   # requests/second on a healthy store
+WC_RATE_LIMIT_MIN = float(os.getenv("WC_RATE_LIMIT_MIN", "0.5"))  # floor when the store pushes back
+WC_RATE_LIMIT_INCREASE = float(os.getenv("WC_RATE_LIMIT_INCREASE", "1"))  # additive increase per success
+WC_MAX_CONCURRENCY = int(os.getenv("WC_MAX_CONCURRENCY", "8"))    # max in-flight calls per store
+WC_LATENCY_BACKOFF_THRESHOLD = float(os.getenv("WC_LATENCY_BACKOFF_THRESHOLD", "3"))  # x baseline latency
+WC_MAX_THROTTLE_RETRIES = int(os.getenv("WC_MAX_THROTTLE_RETRIES", "5"))  # retries after a 429
+
+# SQLite index of imported products (Shein SKU/URL -> WooCommerce product and variation IDs)
+PRODUCT_INDEX_PATH = os.getenv("PRODUCT_INDEX_PATH", os.path.join(CACHE_DIR, "product_index.sqlite3"))
+
+# On-disk cache of scrape results so retries/re-imports within the TTL skip the browser
+SCRAPE_CACHE_ENABLED = os.getenv("SCRAPE_CACHE_ENABLED", "true").lower() == "true"
+SCRAPE_CACHE_DIR = os.getenv("SCRAPE_CACHE_DIR", os.path.join(CACHE_DIR, "scrapes"))
+SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", str(6 * 3600)))
+SCRAPE_CACHE_MAX_BYTES = int(os.getenv("SCRAPE_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
+
+# Per-job journals of crear_producto stage outputs, used to resume interrupted imports, and the
+# age (seconds) after which a journaled scrape is redone instead of resumed (prices go stale)
+JOB_JOURNAL_DIR = os.getenv("JOB_JOURNAL_DIR", os.path.join(CACHE_DIR, "jobs"))
+JOB_JOURNAL_SCRAPE_MAX_AGE = int(os.getenv("JOB_JOURNAL_SCRAPE_MAX_AGE", str(SCRAPE_CACHE_TTL)))
+
+# Upload product images once to the WordPress media library and reference them by ID.
+# Requires a WordPress user with an application password (wp/v2 does not accept WooCommerce keys).
+WP_USERNAME = os.getenv("WP_USERNAME")
+WP_APP_PASSWORD = os.getenv("WP_APP_PASSWORD")
+WC_UPLOAD_MEDIA = os.getenv("WC_UPLOAD_MEDIA", "true" if WP_APP_PASSWORD else "false").lower() == "true"
+MEDIA_INDEX_PATH = os.getenv("MEDIA_INDEX_PATH", os.path.join(CACHE_DIR, "media_index.json"))
+MEDIA_UPLOAD_WORKERS = int(os.getenv("MEDIA_UPLOAD_WORKERS", "6"))
+MEDIA_MIN_BYTES = int(os.getenv("MEDIA_MIN_BYTES", "1024"))  # Smaller files are placeholders, not product photos
+
+# Rule-based repricing (repricing.py): JSON rules file (see repricing_rules.example.json), also used
+# for every store price (imports, CSV export, resync.py) when present, and concurrent
+# products/{id}/variations/batch calls when applying
+REPRICING_RULES_PATH = os.getenv("REPRICING_RULES_PATH", "repricing_rules.json")
+REPRICE_WORKERS = int(os.getenv("REPRICE_WORKERS", "4"))
+
+# Run-level metrics report (JSON + Prometheus textfile)
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(CACHE_DIR, "metrics"))
+
+# Store registry (stores.py). STORES_FILE is a JSON object {store name: settings}; without it the
+# only store is "default", built from the WC_*/WP_* settings above and the IDs below.
+STORES_FILE = os.getenv("STORES_FILE", "stores.json")
+DEFAULT_STORE = os.getenv("DEFAULT_STORE", "default")
+TARGET_STORES = [name.strip() for name in os.getenv("TARGET_STORES", DEFAULT_STORE).split(",") if name.strip()]
+
+# Category and attribute IDs of the default store. Gender code -> categories every product gets
+# ("initial") and the category the Shein breadcrumb is created under ("parent").
+DEFAULT_GENDER_CATEGORIES = {
+    "1": {"label": "Mujer", "initial": [183, 145], "parent": 145},              # Ropa, Ropa Mujer
+    "2": {"label": "Hombre", "initial": [184, 200], "parent": 200},             # Ropa, Ropa Hombre
+    "5": {"label": "Mujer Joyas", "initial": [183, 298], "parent": 298},        # Ropa, Joyeria y Bisuteria
+    "6": {"label": "Mujer Calzado", "initial": [183, 243], "parent": 243},      # Ropa, Zapatos Mujer
+}
+DEFAULT_FALLBACK_CATEGORIES = {"label": "Uncategorized", "initial": [15], "parent": 0}
+DEFAULT_ATTR_ID_COLOR = 8
+DEFAULT_ATTR_ID_SIZE = 7
@@ -0,0 +1,167 @@
+import csv
+import os
+import threading
+
+from category_index import CategoryIndex
+from main import calculate_store_price, resolve_gender_categories
+from shein_parsing import goods_id_from_url
+from stores import get_store
+from woocommerce_manager import variation_sku
+
+# Column names of WooCommerce's built-in product CSV importer (Products > Import)
+CSV_COLUMNS = [
+    "Type", "SKU", "Parent", "Name", "Published", "Short description", "Description", "In stock?",
+    "Regular price", "Categories", "Images",
+    "Attribute 1 name", "Attribute 1 value(s)", "Attribute 1 visible", "Attribute 1 global",
+    "Attribute 2 name", "Attribute 2 value(s)", "Attribute 2 visible", "Attribute 2 global",
+]
+
+
+def escape_csv_list_item(value):
+    """The importer splits list cells (categories, attribute values) on commas; literal commas are escaped."""
+    return str(value).replace(",", "\\,")
+
+
+class WooCommerceCsvExporter:
+    """
+    Writes products to a CSV file for WooCommerce's product CSV importer instead of creating them
+    through the REST API: one "variable" row per product followed by one "variation" row per size,
+    with the same -raic- SKUs, prices and categories an API import would produce. Rows are written
+    and flushed per product, so memory use does not grow with the number of products.
+
+    Categories are exported as "Parent > Child" paths. The store's existing categories (initial
+    and parent categories of the gender code) are named from its on-disk category index; no API
+    call is made, so an ID missing from the index (and a breadcrumb under it) is skipped with a warning.
+    """
+
+    def __init__(self, path, store=None):
+        self.path = path
+        self.store = get_store(store)
+        self.category_index = CategoryIndex(path=self.store["category_index_path"])
+        if not self.category_index.load(allow_expired=True):
+            print(f"Warning: No category index at {self.category_index.path}, only Shein categories "
+                  "are exported (run an API import once to build it).")
+        self._category_paths = {} # category ID -> path names, None when unknown
+        self._lock = threading.Lock() # Upload workers share one exporter
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=CSV_COLUMNS)
+        self._writer.writeheader()
+        self.products_written = 0
+
+    def category_path(self, category_id):
+        if category_id not in self._category_paths:
+            self._category_paths[category_id] = self.category_index.category_path(category_id)
+            if self._category_paths[category_id] is None:
+                print(f"Warning: Category {category_id} is not in the category index of store "
+                      f"'{self.store['name']}', it is left out of the CSV.")
+        return self._category_paths[category_id]
+
+    def product_categories(self, shein_categories, gender_code_str):
+        """
+        Returns the product's "Categories" cell and the IDs of its categories already in the store
+        (used by the pricing rules). Category paths of a product: its initial categories, then every level of its Shein
+        breadcrumb under the gender's parent category (as WooCommerceManager.plan_categories assigns them).
+        Breadcrumb levels that already exist in the store keep their WooCommerce name.
+        """
+        initial_category_ids, parent_category_id = resolve_gender_categories(gender_code_str, self.store)
+        paths = [self.category_path(category["id"]) for category in initial_category_ids]
+        category_ids = [category["id"] for category in initial_category_ids]
+        if parent_category_id:
+            category_ids.append(parent_category_id)
+        breadcrumb_path = self.category_path(parent_category_id) if parent_category_id else []
+        current_parent_id = parent_category_id or 0
+        # Under an unknown parent the breadcrumb is left out rather than created at the top level
+        for name in (shein_categories or []) if breadcrumb_path is not None else []:
+            if name and name.strip():
+                existing_id = self.category_index.get(current_parent_id, name) if current_parent_id is not None else None
+                if existing_id is not None:
+                    category_ids.append(existing_id)
+                    breadcrumb_path = breadcrumb_path + [self.category_index.records[existing_id]["name"]]
+                else:
+                    breadcrumb_path = breadcrumb_path + [name.strip()]
+                current_parent_id = existing_id # Below a new category every level is new as well
+                paths.append(breadcrumb_path)
+        unique_paths = dict.fromkeys(" > ".join(path) for path in paths if path)
+        return ", ".join(escape_csv_list_item(path) for path in unique_paths), list(dict.fromkeys(category_ids))
+
+    def build_rows(self, scraped_product_data, tallas_list, markup_percentage_str, gender_code_str, product_url=None):
+        """
+        Returns the parent row and the variation rows of one product. A product scraped without a
+        SKU gets one derived from its goods ID; raises ValueError when the URL has none either.
+        """
+        categories_cell, category_ids = self.product_categories(
+            scraped_product_data.get("shein_categories"), gender_code_str)
+        price = calculate_store_price(scraped_product_data["shein_price"], markup_percentage_str, category_ids)
+        base_sku = scraped_product_data.get("sku")
+        if not base_sku:
+            goods_id = goods_id_from_url(product_url)
+            if not goods_id:
+                raise ValueError(f"Product '{scraped_product_data['product_name']}' has no SKU and its URL "
+                                 f"({product_url}) no goods ID, so it cannot be exported without SKU collisions.")
+            base_sku = f"SHEIN{goods_id}"
+        color = (scraped_product_data.get("color") or "").strip()
+        image_urls = scraped_product_data.get("image_urls") or []
+        sizes = [size.strip() for size in tallas_list]
+
+        parent_row = {
+            "Type": "variable",
+            "SKU": base_sku,
+            "Name": scraped_product_data["product_name"],
+            "Published": 1,
+            "Short description": scraped_product_data.get("description", ""),
+            "Description": scraped_product_data.get("description", ""),
+            "Categories": categories_cell,
+            "Images": ", ".join(image_urls),
+            "Attribute 1 name": "Talla",
+            "Attribute 1 value(s)": ", ".join(escape_csv_list_item(size) for size in sizes),
+            "Attribute 1 visible": 1,
+            "Attribute 1 global": 1,
+        }
+        if color:
+            parent_row.update({"Attribute 2 name": "Color", "Attribute 2 value(s)": escape_csv_list_item(color),
+                               "Attribute 2 visible": 1, "Attribute 2 global": 1})
+
+        variation_rows = []
+        for size in sizes:
+            variation_row = {
+                "Type": "variation",
+                "SKU": variation_sku(base_sku, size, color),
+                "Parent": base_sku,
+                "Name": f"{scraped_product_data['product_name']} - {size}",
+                "Published": 1,
+                "In stock?": 1,
+                "Regular price": price,
+                "Images": image_urls[0] if image_urls else "",
+                "Attribute 1 name": "Talla",
+                "Attribute 1 value(s)": escape_csv_list_item(size),
+                "Attribute 1 global": 1,
+            }
+            if color:
+                variation_row.update({"Attribute 2 name": "Color", "Attribute 2 value(s)": escape_csv_list_item(color),
+                                      "Attribute 2 global": 1})
+            variation_rows.append(variation_row)
+        return [parent_row] + variation_rows
+
+    def write_product(self, scraped_product_data, tallas_list, markup_percentage_str, gender_code_str, product_url=None):
+        """Appends one product (parent and variation rows) to the CSV. Returns the number of rows written."""
+        rows = self.build_rows(scraped_product_data, tallas_list, markup_percentage_str, gender_code_str, product_url)
+        with self._lock:
+            self._writer.writerows(rows)
+            self._file.flush() # Rows of finished products are on disk even if the run is interrupted
+            self.products_written += 1
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                print(f"Exported {self.products_written} products to {self.path}.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
@@ -0,0 +1,133 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from metrics import metrics
+from shein_parsing import extract_embedded_json, parse_price_and_stock_json, parse_product_json, parse_review_texts
+from translation import translate_reviews
+
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "es-ES,es;q=0.9",
+}
+
+
+def create_http_session(pool_size=None):
+    """Creates a keep-alive requests session with a connection pool for Shein pages."""
+    pool_size = pool_size or config.SHEIN_HTTP_POOL_SIZE
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+class SheinHttpScraper:
+    """
+    Browserless scraper with the same interface as SheinScraper. It fetches the product page
+    over a pooled HTTP session and parses the product JSON embedded in the HTML. Only when
+    that fails does it fall back to a Selenium SheinScraper (borrowed from scraper_pool if given).
+    """
+
+    def __init__(self, session=None, scraper_pool=None):
+        self.session = session or create_http_session()
+        self.scraper_pool = scraper_pool
+        self.fallback_scraper = None
+        self.current_url = None
+        self.page_html = None
+        self.page_data = None
+        self.page_timings = {}
+
+    @metrics.timed("http_scraper.fetch_html")
+    def fetch_html(self, url):
+        response = self.session.get(url, timeout=config.SHEIN_HTTP_TIMEOUT)
+        metrics.incr("shein_http_requests", status=response.status_code)
+        response.raise_for_status()
+        return response.text
+
+    @metrics.timed("http_scraper.load_page")
+    def load_page(self, url):
+        """Fetches and parses the page; switches to the Selenium fallback if parsing fails."""
+        self.page_timings = {}
+        self.current_url = url
+        self.page_html = None
+        self.page_data = None
+        self._release_fallback()
+        start_time = time.perf_counter()
+        try:
+            self.page_html = self.fetch_html(url)
+            self.page_data = extract_embedded_json(self.page_html)
+            print(f"Page fetched and parsed over HTTP in {time.perf_counter() - start_time:.2f}s: {url}")
+        except Exception as e:
+            print(f"HTTP scraping failed for {url} ({e}). Falling back to the browser scraper.")
+            self._load_with_fallback(url)
+        self.page_timings["load"] = time.perf_counter() - start_time
+
+    def _load_with_fallback(self, url):
+        if self.fallback_scraper is None:
+            if self.scraper_pool:
+                self.fallback_scraper = self.scraper_pool.acquire()
+            else:
+                from scraper import SheinScraper # Imported lazily: Selenium is only needed for fallbacks
+                self.fallback_scraper = SheinScraper()
+        self.page_data = None
+        self.fallback_scraper.load_page(url)
+        self.fallback_scraper.close_popup_if_present()
+
+    def close_popup_if_present(self):
+        pass # No browser, no popups
+
+    @metrics.timed("http_scraper.extract_product_details")
+    def extract_product_details(self):
+        start_time = time.perf_counter()
+        if self.page_data is not None:
+            try:
+                details = parse_product_json(self.page_data)
+                self.page_timings["extract"] = time.perf_counter() - start_time
+                print("Page timings: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.page_timings.items()))
+                return details
+            except ValueError as e:
+                print(f"Embedded product JSON could not be parsed ({e}). Falling back to the browser scraper.")
+                self._load_with_fallback(self.current_url)
+        return self.fallback_scraper.extract_product_details()
+
+    @metrics.timed("http_scraper.extract_price_and_stock")
+    def extract_price_and_stock(self):
+        if self.page_data is not None:
+            result = parse_price_and_stock_json(self.page_data)
+            if result["shein_price"] is not None:
+                return result
+            print("Embedded product JSON has no price. Falling back to the browser scraper.")
+            self._load_with_fallback(self.current_url)
+        return self.fallback_scraper.extract_price_and_stock()
+
+    @metrics.timed("http_scraper.extract_and_translate_reviews")
+    def extract_and_translate_reviews(self):
+        if self.fallback_scraper is not None:
+            return self.fallback_scraper.extract_and_translate_reviews()
+        review_texts = parse_review_texts(self.page_data)
+        print(f"Found {len(review_texts)} embedded reviews.")
+        return translate_reviews(review_texts)
+
+    def get_page_html(self):
+        if self.fallback_scraper is not None:
+            return self.fallback_scraper.get_page_html()
+        return self.page_html
+
+    def _release_fallback(self):
+        if self.fallback_scraper is None:
+            return
+        if self.scraper_pool:
+            self.scraper_pool.release(self.fallback_scraper)
+        else:
+            self.fallback_scraper.quit_driver()
+        self.fallback_scraper = None
+
+    def quit_driver(self):
+        """Releases the fallback browser, if one was used. The HTTP session stays reusable."""
+        self._release_fallback()
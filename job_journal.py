@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import time
+
+import config
+
+# Stages of crear_producto in execution order; a rerun resumes at the first one not recorded
+JOB_STAGES = ("scrape", "categories", "images", "product", "variations", "reviews")
+
+
+class JobJournal:
+    """
+    Per-job journal persisting the output of each crear_producto stage (scraped data,
+    category IDs, product ID, variation IDs, reviews), so a crashed job resumes at the
+    first incomplete stage instead of re-scraping and POSTing a second product. A journaled
+    scrape older than scrape_max_age is dropped, so a job resumed much later re-scrapes current
+    prices (the WooCommerce stages are still resumed).
+    """
+
+    def __init__(self, job_id, directory=None, scrape_max_age=None):
+        self.job_id = job_id
+        self.directory = directory or config.JOB_JOURNAL_DIR
+        self.path = os.path.join(self.directory, f"{job_id}.json")
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self.path, "r", encoding="utf-8") as journal_file:
+                self.stages = json.load(journal_file).get("stages", {})
+        except (OSError, ValueError):
+            self.stages = {}
+        scrape_max_age = config.JOB_JOURNAL_SCRAPE_MAX_AGE if scrape_max_age is None else scrape_max_age
+        scrape_stage = self.stages.get("scrape")
+        if scrape_stage and time.time() - scrape_stage.get("completed_at", 0) > scrape_max_age:
+            print(f"Journaled scrape of job {job_id} is older than {scrape_max_age}s, scraping again.")
+            del self.stages["scrape"]
+        if self.stages:
+            print(f"Resuming job {job_id} at stage '{self.first_incomplete_stage()}'.")
+
+    @staticmethod
+    def job_id_for(product_url_shein, tallas_list, markup_percentage_str, gender_code_str):
+        """Derives a stable job ID from the crear_producto inputs."""
+        job_inputs = json.dumps([product_url_shein, list(tallas_list), str(markup_percentage_str), str(gender_code_str)])
+        return hashlib.sha1(job_inputs.encode("utf-8")).hexdigest()[:16]
+
+    def has(self, stage):
+        return stage in self.stages
+
+    def get(self, stage):
+        return self.stages[stage]["output"]
+
+    def record(self, stage, output):
+        """Persists a stage output atomically (write to a temp file, then rename)."""
+        self.stages[stage] = {"output": output, "completed_at": time.time()}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as journal_file:
+            json.dump({"job_id": self.job_id, "stages": self.stages}, journal_file, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def first_incomplete_stage(self):
+        return next((stage for stage in JOB_STAGES if stage not in self.stages), None)
+
+    def discard(self):
+        """Removes the journal once the job is complete."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.stages = {}
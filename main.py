@@ -1,168 +1,558 @@
-from scraper import SheinScraper
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from job_journal import JobJournal
+from metrics import metrics
+from shein_parsing import goods_id_from_url
+from stores import get_store, store_categories
 from woocommerce_manager import WooCommerceManager
-# No other imports like os, load_dotenv, time, API, selenium, GoogleTranslator, Faker, or utils are needed here.
+# selenium (scraper), deep_translator and Faker are imported only by the code paths that use them.
 
-def crear_producto(tallas_list, product_url_shein, markup_percentage_str, gender_code_str):
-    """
-    Orchestrates the creation of a product by scraping data from Shein and adding it to WooCommerce.
 
-    Args:
-        tallas_list (list): List of available sizes for the product (e.g., ['S', 'M']).
-        product_url_shein (str): URL of the Shein product page.
-        markup_percentage_str (str): Markup percentage string (e.g., "20" for 20%).
-        gender_code_str (str): Gender code for product categorization.
+class ProductImportError(Exception):
+    """Raised when a product cannot be imported; the message explains which step failed."""
+
+
+def resolve_gender_categories(gender_code_str, store=None):
+    """
+    Returns the initial WooCommerce category IDs and the parent category for Shein
+    categories, based on the gender code and the store's category mapping (see stores.py).
     """
-    initial_category_ids = []
-    parent_category_id_for_shein_cats = 0
-
-    # Define initial WooCommerce categories and parent for Shein categories based on gender_code_str
-    if gender_code_str == "2":  # Hombre
-        print(f"Processing for 'Hombre' (Men): {gender_code_str}")
-        initial_category_ids = [{"id": 184}, {"id": 200}]  # Ropa, Ropa Hombre
-        parent_category_id_for_shein_cats = 200
-    elif gender_code_str == "1":  # Mujer
-        print(f"Processing for 'Mujer' (Women): {gender_code_str}")
-        initial_category_ids = [{"id": 183}, {"id": 145}]  # Ropa, Ropa Mujer
-        parent_category_id_for_shein_cats = 145
-    elif gender_code_str == "5":  # Mujer Joyas
-        print(f"Processing for 'Mujer Joyas' (Women's Jewelry): {gender_code_str}")
-        initial_category_ids = [{"id": 183}, {"id": 298}]  # Ropa, Joyeria y Bisuteria
-        parent_category_id_for_shein_cats = 298
-    elif gender_code_str == "6":  # Mujer Calzado
-        print(f"Processing for 'Mujer Calzado' (Women's Footwear): {gender_code_str}")
-        initial_category_ids = [{"id": 183}, {"id": 243}]  # Ropa, Zapatos Mujer
-        parent_category_id_for_shein_cats = 243
+    store = get_store(store)
+    mapping = store["gender_categories"].get(str(gender_code_str))
+    if mapping:
+        print(f"Processing for '{mapping.get('label', gender_code_str)}' in store '{store['name']}': {gender_code_str}")
     else:
-        print(f"Warning: Gender code {gender_code_str} not recognized. Using default 'Uncategorized'.")
-        initial_category_ids = [{"id": 15}] # 'Uncategorized'
-        parent_category_id_for_shein_cats = 0 # No parent
+        print(f"Warning: Gender code {gender_code_str} not recognized. Using default "
+              f"'{store['fallback_categories'].get('label', 'Uncategorized')}'.")
+    return store_categories(store, gender_code_str)
 
-    scraper_instance = SheinScraper()
-    woo_commerce_manager_instance = WooCommerceManager()
 
-    try:
-        print("####################### \n  INITIALIZING SCRAPER    \n#######################")
-        scraper_instance.load_page(product_url_shein)
-        scraper_instance.close_popup_if_present()
-        
-        scraped_product_data = scraper_instance.extract_product_details()
+_pricing_rules_lock = threading.Lock()
+_pricing_rules_cache = {"key": None, "rules": None} # (path, mtime) of the loaded rules file
+
 
-        if not scraped_product_data or not scraped_product_data.get("product_name") or scraped_product_data.get("shein_price") is None:
-            print("Error: Could not extract essential product data from Shein. Aborting process.")
-            return
+def load_store_pricing_rules():
+    """
+    Returns the PricingRules of config.REPRICING_RULES_PATH (reloaded when the file changes),
+    or None when there is no rules file and prices use the plain markup formula.
+    """
+    try:
+        rules_key = (config.REPRICING_RULES_PATH, os.path.getmtime(config.REPRICING_RULES_PATH))
+    except OSError:
+        return None
+    with _pricing_rules_lock:
+        if _pricing_rules_cache["key"] != rules_key:
+            from repricing import PricingRules # Imported only when rules exist: it needs numpy
+            _pricing_rules_cache["rules"] = PricingRules.load(config.REPRICING_RULES_PATH)
+            _pricing_rules_cache["key"] = rules_key
+            print(f"Store prices follow the pricing rules in {config.REPRICING_RULES_PATH}.")
+        return _pricing_rules_cache["rules"]
 
-        product_name_shein = scraped_product_data["product_name"]
-        print(f"Successfully scraped product: {product_name_shein}")
 
-        # Calculate final product price with markup
+def calculate_store_price(shein_price, markup_percentage_str, category_ids=None):
+    """
+    Returns the store price of a Shein price as a string. With a pricing rules file the rules
+    decide (as repricing.py and resync.py apply them, given the product's WooCommerce category
+    IDs); otherwise the markup percentage is applied to the Shein price. With rules, the markup
+    only applies to prices above every band (category rules still override it), also for the
+    markup typed in the interactive importer.
+    """
+    pricing_rules = load_store_pricing_rules()
+    if pricing_rules:
         try:
-            markup_percentage = int(markup_percentage_str)
-            shein_base_price = float(scraped_product_data["shein_price"])
-            # The term "discount" in the original script was actually used as a markup.
-            # If discount_percentage is e.g. 20, it means 20% markup.
-            final_product_price_calculated = shein_base_price * (1 + markup_percentage / 100)
-            final_product_price_str = str(round(final_product_price_calculated, 2))
-            print(f"Shein Price: {shein_base_price}, Markup: {markup_percentage}%, Final Store Price: {final_product_price_str}")
+            final_product_price_str = pricing_rules.price_for(shein_price, markup_percentage_str, category_ids)
         except ValueError:
-            print(f"Error: Invalid markup percentage '{markup_percentage_str}'. Using Shein price without changes.")
-            final_product_price_str = str(scraped_product_data["shein_price"])
-
-        translated_product_reviews = scraper_instance.extract_and_translate_reviews()
-        print(f"Extracted and translated {len(translated_product_reviews)} reviews.")
-
-        print("\n####################### \n  PROCESSING WOOCOMMERCE    \n#######################")
-        
-        # Get or create product categories in WooCommerce
-        product_category_ids_wc = woo_commerce_manager_instance.get_or_create_categories(
-            shein_categories=scraped_product_data.get('shein_categories', []), 
-            dynamic_parent_id=parent_category_id_for_shein_cats, 
-            initial_category_ids=initial_category_ids
-        )
-        print(f"Final category IDs for WooCommerce product: {product_category_ids_wc}")
+            print(f"Error: Invalid markup percentage '{markup_percentage_str}'. Pricing rules apply without it.")
+            final_product_price_str = pricing_rules.price_for(shein_price, None, category_ids)
+        print(f"Shein Price: {shein_price}, Markup: {markup_percentage_str}%, "
+              f"Final Store Price (pricing rules): {final_product_price_str}")
+        return final_product_price_str
+    try:
+        markup_percentage = int(markup_percentage_str)
+        shein_base_price = float(shein_price)
+        # The term "discount" in the original script was actually used as a markup.
+        # If discount_percentage is e.g. 20, it means 20% markup.
+        final_product_price_calculated = shein_base_price * (1 + markup_percentage / 100)
+        final_product_price_str = str(round(final_product_price_calculated, 2))
+        print(f"Shein Price: {shein_base_price}, Markup: {markup_percentage}%, Final Store Price: {final_product_price_str}")
+        return final_product_price_str
+    except ValueError:
+        print(f"Error: Invalid markup percentage '{markup_percentage_str}'. Using Shein price without changes.")
+        return str(shein_price)
+
+
+def open_scraper(scraper_pool=None, http_session=None):
+    """
+    Returns the scraper for one product according to config.SCRAPER_BACKEND.
+    Pass the result to close_scraper when done.
+    """
+    if config.SCRAPER_BACKEND == "http":
+        from http_scraper import SheinHttpScraper
+        return SheinHttpScraper(session=http_session, scraper_pool=scraper_pool)
+    if scraper_pool:
+        return scraper_pool.acquire()
+    from scraper import SheinScraper # Imported lazily: selenium is slow to import and not needed by every path
+    return SheinScraper()
+
+
+def close_scraper(scraper_instance, scraper_pool=None):
+    """Returns a pooled browser to its pool, or closes the scraper's own browser."""
+    if scraper_pool and config.SCRAPER_BACKEND != "http": # Pooled browsers come from the pool (see open_scraper)
+        scraper_pool.release(scraper_instance) # Keep the browser warm for the next product
+        return
+    scraper_instance.quit_driver()
+
+
+def scrape_product(scraper_instance, product_url_shein):
+    """
+    Scrape stage: loads the Shein page and extracts product details and translated reviews.
+
+    Returns:
+        tuple: (scraped_product_data dict, translated_product_reviews list)
+    """
+    print("####################### \n  INITIALIZING SCRAPER    \n#######################")
+    scraper_instance.load_page(product_url_shein)
+    scraper_instance.close_popup_if_present()
+
+    scraped_product_data = scraper_instance.extract_product_details()
+
+    if not scraped_product_data or not scraped_product_data.get("product_name") or scraped_product_data.get("shein_price") is None:
+        raise ProductImportError("Could not extract essential product data from Shein.")
+
+    print(f"Successfully scraped product: {scraped_product_data['product_name']}")
+
+    translated_product_reviews = scraper_instance.extract_and_translate_reviews()
+    print(f"Extracted and translated {len(translated_product_reviews)} reviews.")
+    return scraped_product_data, translated_product_reviews
+
+
+@metrics.timed("stage.scrape")
+def scrape_product_cached(product_url_shein, scraper_pool=None, http_session=None, scrape_cache=None, journal=None):
+    """
+    Scrape stage with the on-disk scrape cache in front: a fresh cached result is returned
+    without opening a browser; otherwise the page is scraped and the result (with page HTML) cached.
+    With a JobJournal, a scrape already recorded for the job is reused, and new results are recorded.
+
+    Returns:
+        tuple: (scraped_product_data dict, translated_product_reviews list)
+    """
+    if journal and journal.has("scrape"):
+        scrape_stage = journal.get("scrape")
+        return scrape_stage["details"], scrape_stage["reviews"]
+
+    if scrape_cache:
+        cached_entry = scrape_cache.get(product_url_shein)
+        if cached_entry:
+            if journal:
+                journal.record("scrape", {"details": cached_entry["details"], "reviews": cached_entry["reviews"]})
+            return cached_entry["details"], cached_entry["reviews"]
+
+    scraper_instance = open_scraper(scraper_pool, http_session)
+    try:
+        scraped_product_data, translated_product_reviews = scrape_product(scraper_instance, product_url_shein)
+        page_html = scraper_instance.get_page_html() if scrape_cache else None
+    finally:
+        close_scraper(scraper_instance, scraper_pool)
+
+    if scrape_cache:
+        scrape_cache.put(product_url_shein, scraped_product_data, translated_product_reviews, page_html)
+    if journal:
+        journal.record("scrape", {"details": scraped_product_data, "reviews": translated_product_reviews})
+    return scraped_product_data, translated_product_reviews
+
+
+def create_scrape_cache(bypass_cache=False):
+    """Returns the configured ScrapeCache, or None when SCRAPE_CACHE_ENABLED is off."""
+    if not config.SCRAPE_CACHE_ENABLED:
+        return None
+    from scrape_cache import ScrapeCache
+    return ScrapeCache(bypass=bypass_cache)
+
+
+def compute_content_hash(product_fields, price, sizes):
+    """Hash of everything sent to WooCommerce for a product, used to skip re-imports that change nothing."""
+    payload = json.dumps({"product": product_fields, "price": price, "sizes": sizes}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def create_or_update_product(woo_commerce_manager_instance, product_fields, content_hash, scraped_product_data,
+                             product_url_shein):
+    """
+    Product stage: looks the product up in the local product index, then updates it in place,
+    skips it when its content hash is unchanged, or creates it.
+
+    Returns:
+        dict: product_id, permalink and action ("created", "updated" or "unchanged").
+    """
+    base_product_sku = scraped_product_data.get("sku")
+    goods_id = goods_id_from_url(product_url_shein)
+
+    # Look the product up in the local index so re-imports update it instead of duplicating it
+    product_index = woo_commerce_manager_instance.product_index
+    indexed_product = None
+    if base_product_sku:
+        woo_commerce_manager_instance.seed_product_index()
+        indexed_product = product_index.find_product(sku=base_product_sku, url=product_url_shein, goods_id=goods_id)
+    else:
+        print("Warning: Product has no Shein SKU, it cannot be matched against previous imports.")
+
+    if indexed_product and indexed_product["content_hash"] == content_hash:
+        wc_product_id = indexed_product["wc_product_id"]
+        print(f"Product {base_product_sku} is unchanged since its last import (ID {wc_product_id}). Skipping.")
+        return {"product_id": wc_product_id, "permalink": "N/A", "action": "unchanged"}
+
+    if indexed_product:
+        # Update the existing product in place
+        wc_product_info = woo_commerce_manager_instance.update_variable_product(
+            indexed_product["wc_product_id"], **product_fields)
+        action = "updated"
+    else:
+        # Create the variable product in WooCommerce
+        wc_product_info = woo_commerce_manager_instance.create_variable_product(**product_fields)
+        action = "created"
+
+    if not wc_product_info or "id" not in wc_product_info:
+        raise ProductImportError(f"Failed to {action[:-1]} variable product in WooCommerce.")
+
+    wc_product_id = wc_product_info["id"]
+    wc_product_url = wc_product_info.get("permalink", "N/A")
+    print(f"Variable product {action} successfully in WooCommerce. ID: {wc_product_id}, URL: {wc_product_url}")
+
+    if base_product_sku:
+        # Index the product right away (with no content hash yet) so even a crash before the
+        # variations are created leads to an update, not a duplicate, on the next run
+        product_index.record_product(base_product_sku, wc_product_id, url=product_url_shein, goods_id=goods_id,
+                                     content_hash="")
+    return {"product_id": wc_product_id, "permalink": wc_product_url, "action": action}
+
+
+@metrics.timed("stage.upload")
+def upload_product(woo_commerce_manager_instance, scraped_product_data, translated_product_reviews,
+                   tallas_list, markup_percentage_str, gender_code_str, product_url_shein=None, journal=None,
+                   category_ids=None):
+    """
+    Upload stage: creates categories, the variable product, its variations and reviews in WooCommerce.
+    Products already in the local product index (same Shein SKU, URL or goods ID) are updated
+    in place, or skipped when nothing changed since the last import.
+    With a JobJournal, stages already recorded are not repeated and new stage outputs are recorded.
+    category_ids, when given, are the product's categories already resolved for a whole batch
+    (see WooCommerceManager.plan_categories) and replace the per-product category lookup.
+
+    Returns:
+        dict: product_id, permalink, variation_ids, reviews_added and action ("created", "updated"
+        or "unchanged") of the product.
+    """
+    initial_category_ids, parent_category_id_for_shein_cats = resolve_gender_categories(
+        gender_code_str, woo_commerce_manager_instance.store)
+    product_name_shein = scraped_product_data["product_name"]
 
-        # Prepare product attributes for WooCommerce
-        product_attributes_wc = [
+    print("\n####################### \n  PROCESSING WOOCOMMERCE    \n#######################")
+
+    # Get or create product categories in WooCommerce
+    if journal and journal.has("categories"):
+        product_category_ids_wc = journal.get("categories")
+    else:
+        product_category_ids_wc = category_ids
+        if product_category_ids_wc is None:
+            product_category_ids_wc = woo_commerce_manager_instance.get_or_create_categories(
+                shein_categories=scraped_product_data.get('shein_categories', []),
+                dynamic_parent_id=parent_category_id_for_shein_cats,
+                initial_category_ids=initial_category_ids
+            )
+        if journal:
+            journal.record("categories", product_category_ids_wc)
+    print(f"Final category IDs for WooCommerce product: {product_category_ids_wc}")
+
+    # Calculate final product price (category pricing rules need the resolved categories)
+    final_product_price_str = calculate_store_price(
+        scraped_product_data["shein_price"], markup_percentage_str,
+        [category["id"] for category in product_category_ids_wc])
+
+    # Prepare product attributes for WooCommerce
+    product_attributes_wc = [
+        {
+            "id": woo_commerce_manager_instance.attr_id_size, # Using ID from WooCommerceManager
+            "name": "Talla", # Name of the attribute as it should appear in WC
+            "visible": True,
+            "variation": True,
+            "options": tallas_list,
+        },
+    ]
+    product_color_shein = scraped_product_data.get("color")
+    if product_color_shein:
+        product_attributes_wc.append(
             {
-                "id": woo_commerce_manager_instance.attr_id_size, # Using ID from WooCommerceManager
-                "name": "Talla", # Name of the attribute as it should appear in WC
+                "id": woo_commerce_manager_instance.attr_id_color, # Using ID from WooCommerceManager
+                "name": "Color", # Name of the attribute
                 "visible": True,
                 "variation": True,
-                "options": tallas_list,
-            },
-        ]
-        product_color_shein = scraped_product_data.get("color")
-        if product_color_shein:
-            product_attributes_wc.append(
-                {
-                    "id": woo_commerce_manager_instance.attr_id_color, # Using ID from WooCommerceManager
-                    "name": "Color", # Name of the attribute
-                    "visible": True,
-                    "variation": True,
-                    "options": [product_color_shein],
-                }
-            )
-        
-        # Create the variable product in WooCommerce
-        created_wc_product_info = woo_commerce_manager_instance.create_variable_product(
-            name=product_name_shein,
-            short_description=scraped_product_data.get("description", ""), # Using full description as short as well
-            description=scraped_product_data.get("description", ""),
-            category_ids=product_category_ids_wc,
-            image_urls=scraped_product_data.get("image_urls", []),
-            attributes_data=product_attributes_wc
+                "options": [product_color_shein],
+            }
         )
 
-        if not created_wc_product_info or "id" not in created_wc_product_info:
-            print("Error: Failed to create variable product in WooCommerce. Aborting.")
-            return
-        
-        wc_product_id = created_wc_product_info["id"]
-        wc_product_url = created_wc_product_info.get("permalink", "N/A")
-        print(f"Variable product created successfully in WooCommerce. ID: {wc_product_id}, URL: {wc_product_url}")
-
-        # Create product variations in WooCommerce
-        base_product_sku = scraped_product_data.get("sku", "RAICSKU") # Default SKU if not found
-        # Use the first image as the featured image for variations, if available
-        featured_product_image = None
-        if scraped_product_data.get("image_urls"):
-            featured_product_image = scraped_product_data["image_urls"][0]
-        
-        variations_successfully_created = woo_commerce_manager_instance.create_product_variations(
+    base_product_sku = scraped_product_data.get("sku") or "RAICSKU" # Default SKU if not found
+    # Use the first image as the featured image for variations, if available
+    featured_product_image = None
+    if scraped_product_data.get("image_urls"):
+        featured_product_image = scraped_product_data["image_urls"][0]
+
+    # Upload images once to the media library; product and variations then reference media IDs
+    if journal and journal.has("images"):
+        image_media_ids = journal.get("images")
+    else:
+        image_media_ids = woo_commerce_manager_instance.upload_images(scraped_product_data.get("image_urls", []))
+        if journal:
+            journal.record("images", image_media_ids)
+
+    product_fields = {
+        "name": product_name_shein,
+        "short_description": scraped_product_data.get("description", ""), # Using full description as short as well
+        "description": scraped_product_data.get("description", ""),
+        "category_ids": sorted(product_category_ids_wc, key=lambda category: category["id"]), # Stable order for the hash
+        "image_urls": scraped_product_data.get("image_urls", []),
+        "attributes_data": product_attributes_wc,
+        "image_media_ids": image_media_ids,
+    }
+    content_hash = compute_content_hash(product_fields, final_product_price_str, tallas_list)
+
+    product_index = woo_commerce_manager_instance.product_index
+    if journal and journal.has("product"):
+        product_stage = journal.get("product")
+    else:
+        product_stage = create_or_update_product(
+            woo_commerce_manager_instance, product_fields, content_hash, scraped_product_data, product_url_shein)
+        if journal:
+            journal.record("product", product_stage)
+
+    wc_product_id = product_stage["product_id"]
+    wc_product_url = product_stage["permalink"]
+    action = product_stage["action"]
+    if action == "unchanged":
+        return {
+            "product_id": wc_product_id,
+            "permalink": wc_product_url,
+            "variation_ids": [v["variation_id"] for v in product_index.get_variations(wc_product_id).values()],
+            "reviews_added": 0,
+            "action": action,
+        }
+
+    # Create (or update) product variations in WooCommerce
+    if journal and journal.has("variations"):
+        synced_variations = journal.get("variations")
+        variations_complete = True # Only journaled once every size synced
+    else:
+        existing_variations = {}
+        if action == "updated":
+            existing_variations = {sku: v["variation_id"] for sku, v in product_index.get_variations(wc_product_id).items()}
+        synced_variations = woo_commerce_manager_instance.sync_product_variations(
             product_id=wc_product_id,
             base_sku=base_product_sku,
             price=final_product_price_str,
             sizes=tallas_list,
             featured_image_url=featured_product_image,
-            color=product_color_shein
+            color=product_color_shein,
+            existing_variations=existing_variations,
+            featured_image_id=image_media_ids.get(featured_product_image)
         )
-        if variations_successfully_created:
-            print("Product variations created successfully.")
+        missing_sizes = ({size.strip() for size in tallas_list if size and size.strip()}
+                         - {variation["size"] for variation in synced_variations})
+        variations_complete = bool(synced_variations) and not missing_sizes
+        if variations_complete:
+            print(f"{len(synced_variations)} product variations {action} successfully.")
+            if journal:
+                journal.record("variations", synced_variations)
+        elif synced_variations:
+            print(f"Warning: {len(synced_variations)} product variations {action}, but sizes "
+                  f"{', '.join(sorted(missing_sizes))} failed; they are retried on the next import.")
         else:
             print("Warning: No product variations were created, or an error occurred during variation creation.")
 
-        # Add reviews to the product in WooCommerce
-        if translated_product_reviews:
-            reviews_added_count = woo_commerce_manager_instance.add_reviews(
-                product_id=wc_product_id,
-                reviews_text=translated_product_reviews,
-                gender_code=gender_code_str # Pass gender_code for fake name generation
+    if scraped_product_data.get("sku"):
+        product_index.record_product(
+            base_product_sku, wc_product_id, url=product_url_shein, goods_id=goods_id_from_url(product_url_shein),
+            content_hash=content_hash if variations_complete else "", # Retry variations next time if any failed
+            markup=markup_percentage_str, gender_code=gender_code_str,
+            shein_price=scraped_product_data["shein_price"], regular_price=final_product_price_str,
+            categories=product_category_ids_wc,
+        )
+        product_index.record_variations(wc_product_id, synced_variations)
+
+    # Add reviews to the product in WooCommerce (only on creation, updates would duplicate them)
+    reviews_added_count = 0
+    if journal and journal.has("reviews"):
+        reviews_added_count = journal.get("reviews")
+    elif action == "updated":
+        print("Existing product updated, reviews are not added again.")
+    elif translated_product_reviews:
+        reviews_added_count = woo_commerce_manager_instance.add_reviews(
+            product_id=wc_product_id,
+            reviews_text=translated_product_reviews,
+            gender_code=gender_code_str # Pass gender_code for fake name generation
+        )
+        print(f"{reviews_added_count} reviews added to the product in WooCommerce.")
+    else:
+        print("No reviews to add for this product.")
+    if journal and not journal.has("reviews"):
+        journal.record("reviews", reviews_added_count)
+
+    return {
+        "product_id": wc_product_id,
+        "permalink": wc_product_url,
+        "variation_ids": [variation["variation_id"] for variation in synced_variations],
+        "reviews_added": reviews_added_count,
+        "action": action,
+    }
+
+
+def store_journal(job_id, store_name):
+    """
+    Journal of a product's upload stages in one store. The default store uses the job's own
+    journal (which also holds the scrape stage); other stores get "<job_id>-<store>".
+    """
+    if store_name == config.DEFAULT_STORE:
+        return JobJournal(job_id)
+    return JobJournal(f"{job_id}-{store_name}")
+
+
+def upload_product_to_stores(woo_commerce_managers, scraped_product_data, translated_product_reviews,
+                             tallas_list, markup_percentage_str, gender_code_str, product_url_shein=None,
+                             job_id=None, category_ids_by_store=None):
+    """
+    Uploads one scraped product to several stores concurrently (one thread per store), so the
+    total time is roughly that of the slowest store. Each store has its own upload journal when
+    job_id is given, and a failure in one store does not stop the others.
+
+    Returns:
+        dict: {store name: {"status": "ok", "result": upload result} or {"status": "failed", "error": str}}.
+    """
+    category_ids_by_store = category_ids_by_store or {}
+
+    def upload_to_store(woo_commerce_manager_instance):
+        store_name = woo_commerce_manager_instance.store_name
+        journal = store_journal(job_id, store_name) if job_id else None
+        try:
+            with metrics.trace(f"{job_id}:{store_name}" if job_id else store_name):
+                upload_result = upload_product(
+                    woo_commerce_manager_instance, scraped_product_data, translated_product_reviews,
+                    tallas_list, markup_percentage_str, gender_code_str, product_url_shein, journal,
+                    category_ids=category_ids_by_store.get(store_name)
+                )
+            return {"status": "ok", "result": upload_result}
+        except Exception as e:
+            if not isinstance(e, ProductImportError):
+                import traceback
+                traceback.print_exc()
+            print(f"Upload to store '{store_name}' failed: {e}")
+            return {"status": "failed", "error": str(e)}
+
+    if len(woo_commerce_managers) == 1:
+        return {woo_commerce_managers[0].store_name: upload_to_store(woo_commerce_managers[0])}
+    with ThreadPoolExecutor(max_workers=len(woo_commerce_managers), thread_name_prefix="store-upload") as executor:
+        outcomes = list(executor.map(upload_to_store, woo_commerce_managers))
+    return {manager.store_name: outcome for manager, outcome in zip(woo_commerce_managers, outcomes)}
+
+
+def crear_producto(tallas_list, product_url_shein, markup_percentage_str, gender_code_str,
+                   scraper_pool=None, woo_commerce_manager=None, bypass_cache=False, job_id=None):
+    """
+    Orchestrates the creation of a product by scraping data from Shein and adding it to WooCommerce.
+
+    Args:
+        tallas_list (list): List of available sizes for the product (e.g., ['S', 'M']).
+        product_url_shein (str): URL of the Shein product page.
+        markup_percentage_str (str): Markup percentage string (e.g., "20" for 20%).
+        gender_code_str (str): Gender code for product categorization.
+        scraper_pool (ScraperPool, optional): Pool of warm browsers to borrow a scraper from.
+            When omitted, a new SheinScraper is launched and closed for this product.
+        woo_commerce_manager (WooCommerceManager, optional): Manager to reuse across products.
+        bypass_cache (bool): Ignore cached scrape results for this run (fresh results are still cached).
+        job_id (str, optional): Journal ID used to resume an interrupted run. Defaults to an ID
+            derived from the other arguments, so rerunning the same import resumes it.
+
+    Returns:
+        dict or None: The upload result (see upload_product), or None if the import failed.
+    """
+    woo_commerce_manager_instance = woo_commerce_manager or WooCommerceManager()
+    journal = JobJournal(job_id or JobJournal.job_id_for(
+        product_url_shein, tallas_list, markup_percentage_str, gender_code_str))
+
+    try:
+        with metrics.trace(journal.job_id):
+            scraped_product_data, translated_product_reviews = scrape_product_cached(
+                product_url_shein, scraper_pool, scrape_cache=create_scrape_cache(bypass_cache), journal=journal)
+            upload_result = upload_product(
+                woo_commerce_manager_instance, scraped_product_data, translated_product_reviews,
+                tallas_list, markup_percentage_str, gender_code_str, product_url_shein, journal
             )
-            print(f"{reviews_added_count} reviews added to the product in WooCommerce.")
-        else:
-            print("No reviews to add for this product.")
+        journal.discard() # Job complete, nothing left to resume
+        metrics.incr("products", status="ok", stage="done")
+        print(f"\nProduct creation process complete! View product at: {upload_result['permalink']}")
+        return upload_result
 
-        print(f"\nProduct creation process complete! View product at: {wc_product_url}")
+    except ProductImportError as e:
+        metrics.incr("products", status="failed", stage="import")
+        print(f"Error: {e} Aborting process.")
 
     except Exception as e:
+        metrics.incr("products", status="failed", stage="unexpected")
         print(f"An unexpected error occurred in the main product creation process: {e}")
         import traceback
         traceback.print_exc() # Print full traceback for debugging
 
     finally:
-        if 'scraper_instance' in locals() and scraper_instance: # Ensure scraper_instance was initialized
-            scraper_instance.quit_driver()
         print("####################### \n  PROCESS FINISHED    \n#######################")
 
+    return None
+
+def crear_producto_en_tiendas(tallas_list, product_url_shein, markup_percentage_str, gender_code_str,
+                              stores=None, scraper_pool=None, woo_commerce_managers=None, bypass_cache=False,
+                              job_id=None):
+    """
+    Scrapes a product once and pushes it to several stores concurrently.
+
+    Args:
+        stores (list, optional): Store names from the registry. Defaults to config.TARGET_STORES.
+        woo_commerce_managers (list, optional): Managers to reuse instead of creating one per store.
+        The other arguments are those of crear_producto.
+
+    Returns:
+        dict or None: Per-store outcomes (see upload_product_to_stores), or None if scraping failed.
+    """
+    woo_commerce_managers = woo_commerce_managers or [WooCommerceManager(store=name)
+                                                      for name in (stores or config.TARGET_STORES)]
+    job_id = job_id or JobJournal.job_id_for(product_url_shein, tallas_list, markup_percentage_str, gender_code_str)
+
+    try:
+        with metrics.trace(job_id):
+            scraped_product_data, translated_product_reviews = scrape_product_cached(
+                product_url_shein, scraper_pool, scrape_cache=create_scrape_cache(bypass_cache),
+                journal=JobJournal(job_id))
+    except Exception as e:
+        metrics.incr("products", status="failed", stage="scrape")
+        print(f"Error: could not scrape {product_url_shein}: {e}")
+        return None
+
+    store_outcomes = upload_product_to_stores(
+        woo_commerce_managers, scraped_product_data, translated_product_reviews,
+        tallas_list, markup_percentage_str, gender_code_str, product_url_shein, job_id)
+    for store_name, outcome in store_outcomes.items():
+        metrics.incr("products", status=outcome["status"], stage="done" if outcome["status"] == "ok" else "upload",
+                     store=store_name)
+        if outcome["status"] == "ok":
+            print(f"Store '{store_name}': product {outcome['result']['action']} at {outcome['result']['permalink']}")
+        else:
+            print(f"Store '{store_name}': FAILED - {outcome['error']}")
+    if all(outcome["status"] == "ok" for outcome in store_outcomes.values()):
+        for store_name in store_outcomes:
+            store_journal(job_id, store_name).discard() # Job complete in every store
+        JobJournal(job_id).discard()
+    return store_outcomes
+
 
 if __name__ == "__main__":
     print("--- Shein to WooCommerce Product Importer ---")
@@ -179,6 +569,10 @@ if __name__ == "__main__":
             print("Error: Las tallas no pueden estar vacías. Por favor, ingrese al menos una talla.")
             
     # Get Markup Percentage (formerly discount)
+    if os.path.exists(config.REPRICING_RULES_PATH):
+        # The rules file takes precedence over the typed markup (see calculate_store_price)
+        print(f"Aviso: el precio final lo deciden las reglas de {config.REPRICING_RULES_PATH} (bandas, categorías, "
+              "margen mínimo y redondeo). La ganancia ingresada solo se usa para precios que ninguna banda cubre.")
     while True:
         markup_input_str = input("Ingresa el porcentaje de GANANCIA deseado sobre el precio de Shein (ej: 20 para 20%): ")
         if markup_input_str.strip().isdigit(): # Basic validation for digits
@@ -215,4 +609,5 @@ if __name__ == "__main__":
         product_url_shein=shein_url_input, 
         markup_percentage_str=markup_input_str, # Pass as string, convert inside function
         gender_code_str=gender_selection_str
-    )
\ No newline at end of file
+    )
+    metrics.write_reports(run_name="crear_producto")
\ No newline at end of file
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import config
+from http_scraper import create_http_session
+from wc_client import WooCommerceClient
+
+# Leading bytes of the image formats Shein serves
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def detect_image_type(content):
+    """Returns the MIME type of image bytes based on their signature, or None if they are not an image."""
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if content.startswith(signature):
+            return mime_type
+    return None
+
+
+class MediaUploader:
+    """
+    Downloads product images concurrently, validates and dedupes them (by source URL and by
+    content hash) and uploads each one once to the WordPress media library (wp/v2/media).
+    Products and variations can then reference the returned media IDs instead of remote srcs,
+    so WooCommerce no longer sideloads the same image for every variation.
+    """
+
+    def __init__(self, store_url=None, username=None, app_password=None, index_path=None, max_workers=None):
+        # wp/v2 endpoints authenticate with a WordPress application password, not WooCommerce keys
+        self.wp_client = WooCommerceClient(
+            url=store_url or config.WC_STORE_URL,
+            consumer_key=username or config.WP_USERNAME,
+            consumer_secret=app_password or config.WP_APP_PASSWORD,
+            version="wp/v2",
+            query_string_auth=False,
+        )
+        self.download_session = create_http_session()
+        self.index_path = index_path or config.MEDIA_INDEX_PATH
+        self.max_workers = max_workers or config.MEDIA_UPLOAD_WORKERS
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {"by_url": {}, "by_hash": {}}
+
+    def _save_index(self):
+        directory = os.path.dirname(self.index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(self._index, index_file)
+        os.replace(tmp_path, self.index_path)
+
+    def _remember(self, source_url, content_hash, media_id):
+        with self._lock:
+            self._index["by_url"][source_url] = media_id
+            if content_hash:
+                self._index["by_hash"][content_hash] = media_id
+            self._save_index()
+
+    def _download(self, source_url):
+        response = self.download_session.get(source_url, timeout=config.SHEIN_HTTP_TIMEOUT)
+        response.raise_for_status()
+        content = response.content
+        mime_type = detect_image_type(content)
+        if mime_type is None or len(content) < config.MEDIA_MIN_BYTES:
+            raise ValueError(f"not a valid image ({len(content)} bytes, Content-Type {response.headers.get('Content-Type')})")
+        return content, mime_type
+
+    def _upload_one(self, source_url):
+        with self._lock:
+            media_id = self._index["by_url"].get(source_url)
+        if media_id:
+            return media_id
+
+        content, mime_type = self._download(source_url)
+        content_hash = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            media_id = self._index["by_hash"].get(content_hash)
+        if media_id:
+            print(f"Image {source_url} is identical to media {media_id}, reusing it.")
+            self._remember(source_url, content_hash, media_id)
+            return media_id
+
+        file_name = os.path.basename(urlsplit(source_url).path) or f"{content_hash[:16]}.img"
+        response = self.wp_client.post(
+            "media", None,
+            raw_data=content,
+            headers={"Content-Type": mime_type, "Content-Disposition": f'attachment; filename="{file_name}"'},
+        )
+        response.raise_for_status()
+        media_id = response.json()["id"]
+        print(f"Uploaded image {file_name} to the media library as ID {media_id}.")
+        self._remember(source_url, content_hash, media_id)
+        return media_id
+
+    def upload_images(self, image_urls):
+        """
+        Uploads the images (concurrently, each at most once) and returns {source URL: media ID}.
+        Images that fail to download, validate or upload are left out of the result.
+        """
+        unique_urls = list(dict.fromkeys(url for url in image_urls if url))
+        media_ids = {}
+
+        def upload(source_url):
+            try:
+                return source_url, self._upload_one(source_url)
+            except Exception as e:
+                print(f"Error uploading image {source_url} to the media library: {e}")
+                return source_url, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="media-upload") as executor:
+            for source_url, media_id in executor.map(upload, unique_urls):
+                if media_id:
+                    media_ids[source_url] = media_id
+        return media_ids
@@ -0,0 +1,159 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def endpoint_template(endpoint):
+    """Collapses IDs in REST endpoints ('products/123/variations' -> 'products/{id}/variations') for metric labels."""
+    return re.sub(r"/\d+(?=/|$)", "/{id}", endpoint.split("?")[0])
+
+
+class Metrics:
+    """
+    Lightweight in-process instrumentation: timing spans, counters and per-product traces.
+    A run-level report can be written as JSON and as a Prometheus textfile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started_at = time.time()
+        self.counters = {}  # (name, labels) -> value
+        self.timings = {}   # (name, labels) -> [seconds, ...]
+        self.traces = {}    # trace ID -> [{"span", "seconds", "outcome", "labels"}, ...]
+
+    def incr(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, outcome="ok", **labels):
+        with self._lock:
+            self.timings.setdefault((name, _label_key(labels)), []).append(seconds)
+            trace_id = getattr(self._local, "trace_id", None)
+            if trace_id is not None:
+                self.traces.setdefault(trace_id, []).append(
+                    {"span": name, "seconds": round(seconds, 4), "outcome": outcome, "labels": labels})
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Times the enclosed block; the outcome is 'error' if it raises."""
+        start_time = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start_time, outcome, **labels)
+            self.incr("spans", span=name, outcome=outcome)
+
+    def timed(self, name):
+        """Decorator version of span()."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def trace(self, trace_id):
+        """Attaches every span recorded by this thread inside the block to trace_id (e.g. one product)."""
+        previous_trace_id = getattr(self._local, "trace_id", None)
+        self._local.trace_id = trace_id
+        try:
+            yield
+        finally:
+            self._local.trace_id = previous_trace_id
+
+    def report(self):
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            timings = []
+            for (name, labels), samples in sorted(self.timings.items()):
+                ordered = sorted(samples)
+                timings.append({
+                    "name": name, "labels": dict(labels), "count": len(ordered), "total": sum(ordered),
+                    "p50": _percentile(ordered, 0.5), "p95": _percentile(ordered, 0.95), "max": ordered[-1],
+                })
+            traces = {trace_id: list(spans) for trace_id, spans in self.traces.items()}
+        return {
+            "started_at": self.started_at,
+            "duration": time.time() - self.started_at,
+            "counters": counters,
+            "timings": timings,
+            "traces": traces,
+        }
+
+    def to_prometheus(self, report=None):
+        report = report or self.report()
+
+        def labels_text(labels):
+            if not labels:
+                return ""
+            escaped = []
+            for key, value in sorted(labels.items()):
+                value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                escaped.append(f'{key}="{value}"')
+            return "{" + ",".join(escaped) + "}"
+
+        def metric_name(name):
+            return "shein_importer_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+        lines = []
+        for counter_name in sorted({counter["name"] for counter in report["counters"]}):
+            lines.append(f"# TYPE {metric_name(counter_name)}_total counter")
+            for counter in report["counters"]:
+                if counter["name"] == counter_name:
+                    lines.append(f"{metric_name(counter_name)}_total{labels_text(counter['labels'])} {counter['value']}")
+        lines.append("# TYPE shein_importer_span_seconds summary")
+        for timing in report["timings"]:
+            labels = dict(timing["labels"], span=timing["name"])
+            for quantile in ("p50", "p95"):
+                quantile_labels = dict(labels, quantile="0.5" if quantile == "p50" else "0.95")
+                lines.append(f"shein_importer_span_seconds{labels_text(quantile_labels)} {timing[quantile]:.6f}")
+            lines.append(f"shein_importer_span_seconds_sum{labels_text(labels)} {timing['total']:.6f}")
+            lines.append(f"shein_importer_span_seconds_count{labels_text(labels)} {timing['count']}")
+        lines.append(f"shein_importer_run_duration_seconds {report['duration']:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self, directory=None, run_name="run"):
+        """Writes <run_name>.json and <run_name>.prom into directory; returns the two paths."""
+        directory = directory or config.METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        json_path = os.path.join(directory, f"{run_name}.json")
+        prom_path = os.path.join(directory, f"{run_name}.prom")
+        with open(json_path, "w", encoding="utf-8") as json_file:
+            json.dump(report, json_file, indent=2, default=str)
+        tmp_path = f"{prom_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as prom_file:
+            prom_file.write(self.to_prometheus(report))
+        os.replace(tmp_path, prom_path) # node_exporter's textfile collector must never read a partial file
+        print(f"Metrics written to {json_path} and {prom_path}.")
+        return json_path, prom_path
+
+
+# Process-wide registry used by the scrapers, the WooCommerce client and the pipelines
+metrics = Metrics()
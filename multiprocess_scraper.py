@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import config
+
+_STOP = None # Task queue sentinel telling a worker process to exit
+_TASKS_DONE = object() # Marks the end of the tasks in the parent's pending queue
+
+
+def _process_rss_bytes():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return 0
+
+
+def plan_worker_count(requested=None, rss_budget_bytes=None):
+    """
+    Caps the number of scrape processes by the requested count, the CPU count and, when psutil
+    is installed, by how many workers of rss_budget_bytes fit in the currently available RAM.
+    """
+    requested = requested or config.SCRAPE_PROCESSES or os.cpu_count() or 1
+    worker_count = min(requested, os.cpu_count() or 1)
+    if rss_budget_bytes:
+        try:
+            import psutil
+            worker_count = min(worker_count, max(1, psutil.virtual_memory().available // rss_budget_bytes))
+        except ImportError:
+            pass
+    return max(1, int(worker_count))
+
+
+def _scrape_worker(worker_index, task_queue, result_queue, rss_budget_bytes, bypass_cache):
+    """
+    Worker process: owns one scraper (browser or HTTP session) for its whole life and scrapes the
+    URLs the parent puts on its own task_queue, one at a time. The browser is relaunched when the worker exceeds its RSS budget.
+    """
+    # Imported in the child so the parent does not need selenium loaded to start workers
+    from browser_pool import ScraperPool
+    from http_scraper import create_http_session
+    from job_journal import JobJournal
+    from main import create_scrape_cache, scrape_product_cached
+
+    scraper_pool = ScraperPool(size=1)
+    http_session = create_http_session() if config.SCRAPER_BACKEND == "http" else None
+    scrape_cache = create_scrape_cache(bypass_cache)
+    result_queue.put(("ready", worker_index, None, None))
+    try:
+        while True:
+            task = task_queue.get()
+            if task is _STOP:
+                break
+            task_id, url, job_id = task
+            start_time = time.perf_counter()
+            try:
+                details, reviews = scrape_product_cached(
+                    url, scraper_pool, http_session, scrape_cache, JobJournal(job_id) if job_id else None)
+                result_queue.put(("ok", worker_index, task_id,
+                                  {"details": details, "reviews": reviews, "seconds": time.perf_counter() - start_time}))
+            except Exception as e:
+                result_queue.put(("failed", worker_index, task_id,
+                                  {"error": str(e), "seconds": time.perf_counter() - start_time}))
+
+            worker_rss = _process_rss_bytes() + scraper_pool.memory_usage_bytes()
+            if rss_budget_bytes and worker_rss > rss_budget_bytes:
+                print(f"Scrape worker {worker_index} uses {worker_rss / 2 ** 20:.0f} MB "
+                      f"(budget {rss_budget_bytes / 2 ** 20:.0f} MB), relaunching its browser.")
+                scraper_pool.close()
+                scraper_pool = ScraperPool(size=1)
+    finally:
+        scraper_pool.close()
+        result_queue.put(("exited", worker_index, None, None))
+
+
+def scrape_in_processes(tasks, workers=None, rss_budget_mb=None, bypass_cache=False, queue_size=None):
+    """
+    Scrapes (task_id, url, job_id) tasks on a pool of worker processes, each with its own browser,
+    so scraping scales across cores instead of sharing one GIL. job_id may be None (no journal).
+
+    Yields (task_id, status, payload) as soon as each task finishes, in completion order:
+    status "ok" with payload {"details", "reviews", "seconds"}, or "failed" with {"error", "seconds"}.
+    Tasks are assigned by this process, one per idle worker, so it always knows which task each
+    worker holds: a worker that dies (e.g. killed by the OOM killer) fails its task and is replaced.
+    """
+    rss_budget_bytes = (rss_budget_mb or config.SCRAPE_PROCESS_RSS_BUDGET_MB) * 2 ** 20
+    worker_count = plan_worker_count(workers, rss_budget_bytes)
+    print(f"Starting {worker_count} scrape processes (RSS budget {rss_budget_bytes / 2 ** 20:.0f} MB each).")
+
+    # spawn, not fork: the parent may already run pipeline threads that hold locks
+    context = multiprocessing.get_context("spawn")
+    pending_tasks = queue.Queue(maxsize=queue_size or config.BULK_QUEUE_SIZE)
+    result_queue = context.Queue()
+    processes = {}
+    task_queues = {} # worker index -> the worker's own task queue
+    ready_workers = set()
+    assigned = {} # worker index -> task it was given and has not reported yet
+    stopping = False # _STOP was sent to every worker
+
+    def start_worker(worker_index):
+        task_queues[worker_index] = context.Queue()
+        process = context.Process(
+            target=_scrape_worker, name=f"scrape-process-{worker_index}", daemon=True,
+            args=(worker_index, task_queues[worker_index], result_queue, rss_budget_bytes, bypass_cache))
+        process.start()
+        processes[worker_index] = process
+
+    def feed_tasks():
+        for task in tasks:
+            pending_tasks.put(task) # Blocks while every worker is busy and the queue is full
+        pending_tasks.put(_TASKS_DONE)
+
+    for worker_index in range(worker_count):
+        start_worker(worker_index)
+    feeder_thread = threading.Thread(target=feed_tasks, name="scrape-process-feeder", daemon=True)
+    feeder_thread.start()
+
+    next_worker_index = worker_count
+    tasks_done = False
+    last_liveness_check = time.monotonic()
+    try:
+        while processes:
+            # Hand pending tasks to idle workers, one each
+            for worker_index in sorted(ready_workers - set(assigned)):
+                try:
+                    task = pending_tasks.get_nowait() if not tasks_done else _TASKS_DONE
+                except queue.Empty:
+                    break
+                if task is _TASKS_DONE:
+                    tasks_done = True
+                    break
+                assigned[worker_index] = task
+                task_queues[worker_index].put(task)
+            if tasks_done and not assigned and not stopping:
+                for task_queue in task_queues.values():
+                    task_queue.put(_STOP)
+                stopping = True
+
+            try:
+                status, worker_index, task_id, payload = result_queue.get(timeout=0.1)
+            except queue.Empty:
+                status = None
+
+            if status == "ready":
+                ready_workers.add(worker_index)
+            elif status == "exited":
+                process = processes.pop(worker_index, None)
+                if process is not None:
+                    process.join()
+                ready_workers.discard(worker_index)
+                task_queues.pop(worker_index, None)
+            elif status in ("ok", "failed"):
+                task = assigned.get(worker_index)
+                if task is not None and task[0] == task_id: # Otherwise already failed as lost with its worker
+                    del assigned[worker_index]
+                    yield task_id, status, payload
+
+            if status is not None and time.monotonic() - last_liveness_check < 1:
+                continue
+            last_liveness_check = time.monotonic()
+            for worker_index, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                del processes[worker_index]
+                task_queues.pop(worker_index, None)
+                if stopping:
+                    continue # Stopped (its "exited" may still be in the queue); nothing is assigned anymore
+                # Died without reporting "exited": fail its task and start a replacement
+                if worker_index not in ready_workers:
+                    # Replacing it would fail the same way (e.g. a broken import or environment)
+                    raise RuntimeError(f"Scrape process {worker_index} exited with code "
+                                       f"{process.exitcode} before it was ready.")
+                ready_workers.discard(worker_index)
+                lost_task = assigned.pop(worker_index, None)
+                print(f"Scrape process {worker_index} died (exit code {process.exitcode}).")
+                if lost_task is not None:
+                    yield lost_task[0], "failed", {"error": f"Scrape process died (exit code {process.exitcode}).",
+                                                   "seconds": None}
+                start_worker(next_worker_index)
+                next_worker_index += 1
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join(timeout=5)
+        # Unblock the feeder if it waits on a full pending queue, so it can see the tasks source end
+        while True:
+            try:
+                pending_tasks.get_nowait()
+            except queue.Empty:
+                break
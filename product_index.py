@@ -0,0 +1,174 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    sku TEXT PRIMARY KEY,
+    url TEXT,
+    goods_id TEXT,
+    wc_product_id INTEGER NOT NULL,
+    content_hash TEXT,
+    markup TEXT,
+    gender_code TEXT,
+    shein_price REAL,
+    regular_price TEXT,
+    categories TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS products_url ON products (url);
+CREATE INDEX IF NOT EXISTS products_goods_id ON products (goods_id);
+CREATE INDEX IF NOT EXISTS products_wc_product_id ON products (wc_product_id);
+CREATE TABLE IF NOT EXISTS variations (
+    variation_id INTEGER PRIMARY KEY,
+    wc_product_id INTEGER NOT NULL,
+    sku TEXT UNIQUE,
+    size TEXT,
+    color TEXT,
+    regular_price TEXT,
+    stock_status TEXT
+);
+CREATE INDEX IF NOT EXISTS variations_product ON variations (wc_product_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ProductIndex:
+    """
+    Local SQLite index mapping Shein SKU / product URL / goods ID to the WooCommerce product
+    and its variation IDs, so imports can update products in place instead of duplicating them.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.PRODUCT_INDEX_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def is_seeded(self):
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'seeded_at'").fetchone()
+        return row is not None
+
+    def mark_seeded(self):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('seeded_at', ?)", (str(time.time()),))
+
+    def find_product(self, sku=None, url=None, goods_id=None):
+        """Returns the indexed product row (as a dict) matching the SKU, URL or goods ID, or None."""
+        with self._lock:
+            for column, value in (("sku", sku), ("goods_id", goods_id), ("url", url)):
+                if not value:
+                    continue
+                row = self._connection.execute(f"SELECT * FROM products WHERE {column} = ?", (value,)).fetchone()
+                if row is not None:
+                    product = dict(row)
+                    product["categories"] = json.loads(product["categories"] or "[]")
+                    return product
+        return None
+
+    def get_variations(self, wc_product_id):
+        """Returns {variation SKU: variation row dict} for a product."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM variations WHERE wc_product_id = ?", (wc_product_id,)).fetchall()
+        return {row["sku"]: dict(row) for row in rows}
+
+    def all_products(self):
+        with self._lock:
+            rows = self._connection.execute("SELECT * FROM products ORDER BY sku").fetchall()
+        products = []
+        for row in rows:
+            product = dict(row)
+            product["categories"] = json.loads(product["categories"] or "[]")
+            products.append(product)
+        return products
+
+    def all_variations(self):
+        """Returns every indexed variation row (variation_id, wc_product_id, sku, regular_price, ...) as dicts."""
+        with self._lock:
+            rows = self._connection.execute("SELECT * FROM variations ORDER BY wc_product_id").fetchall()
+        return [dict(row) for row in rows]
+
+    def known_goods_ids(self):
+        with self._lock:
+            rows = self._connection.execute("SELECT goods_id FROM products WHERE goods_id IS NOT NULL").fetchall()
+        return {row["goods_id"] for row in rows}
+
+    def record_product(self, sku, wc_product_id, url=None, goods_id=None, content_hash=None, markup=None,
+                       gender_code=None, shein_price=None, regular_price=None, categories=None):
+        """Inserts or updates a product; fields passed as None keep their stored value."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO products (sku, url, goods_id, wc_product_id, content_hash, markup, gender_code,
+                                      shein_price, regular_price, categories, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (sku) DO UPDATE SET
+                    url = COALESCE(excluded.url, url),
+                    goods_id = COALESCE(excluded.goods_id, goods_id),
+                    wc_product_id = excluded.wc_product_id,
+                    content_hash = COALESCE(excluded.content_hash, content_hash),
+                    markup = COALESCE(excluded.markup, markup),
+                    gender_code = COALESCE(excluded.gender_code, gender_code),
+                    shein_price = COALESCE(excluded.shein_price, shein_price),
+                    regular_price = COALESCE(excluded.regular_price, regular_price),
+                    categories = COALESCE(excluded.categories, categories),
+                    updated_at = excluded.updated_at
+                """,
+                (sku, url, goods_id, wc_product_id, content_hash, markup, gender_code, shein_price,
+                 regular_price, json.dumps(categories) if categories is not None else None, time.time()),
+            )
+
+    def record_variations(self, wc_product_id, variations):
+        """
+        Inserts or updates variations. Each item is a dict with variation_id and sku, and
+        optionally size, color, regular_price and stock_status. A SKU that comes back under a new
+        variation ID (the variation was deleted and recreated in the store) replaces its old row.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM variations WHERE sku = :sku AND variation_id != :variation_id",
+                [{"sku": variation["sku"], "variation_id": variation["variation_id"]} for variation in variations],
+            )
+            self._connection.executemany(
+                """
+                INSERT INTO variations (variation_id, wc_product_id, sku, size, color, regular_price, stock_status)
+                VALUES (:variation_id, :wc_product_id, :sku, :size, :color, :regular_price, :stock_status)
+                ON CONFLICT (variation_id) DO UPDATE SET
+                    sku = excluded.sku,
+                    size = COALESCE(excluded.size, size),
+                    color = COALESCE(excluded.color, color),
+                    regular_price = COALESCE(excluded.regular_price, regular_price),
+                    stock_status = COALESCE(excluded.stock_status, stock_status)
+                """,
+                [
+                    {
+                        "variation_id": variation["variation_id"],
+                        "wc_product_id": wc_product_id,
+                        "sku": variation["sku"],
+                        "size": variation.get("size"),
+                        "color": variation.get("color"),
+                        "regular_price": variation.get("regular_price"),
+                        "stock_status": variation.get("stock_status"),
+                    }
+                    for variation in variations
+                ],
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,126 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import config
+
+
+def parse_retry_after(header_value):
+    """Parses a Retry-After header (seconds or HTTP date) into seconds to wait, or None."""
+    if not header_value:
+        return None
+    try:
+        return max(0.0, float(header_value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(header_value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter with AIMD adjustment and a concurrency cap, shared by every
+    call to one store. It starts at max_rate and only slows down when the server pushes back:
+      - 429/503 answers halve the rate (once per window, however many calls were in flight) and
+        pause all callers for Retry-After (if given),
+      - latency rising well above the observed baseline halves the rate (at most once per window),
+      - successful calls add `increase_step` requests/second back (at most once per window), up to max_rate.
+    Latency is tracked per request class (method and endpoint template), so slow batch POSTs are
+    compared with earlier batch POSTs, not with fast GETs.
+    """
+
+    def __init__(self, max_rate=None, min_rate=None, max_concurrency=None, increase_step=None,
+                 decrease_factor=0.5, latency_threshold=None, window_seconds=1.0):
+        self.max_rate = max_rate or config.WC_RATE_LIMIT_MAX
+        self.min_rate = min_rate or config.WC_RATE_LIMIT_MIN
+        self.max_concurrency = max_concurrency or config.WC_MAX_CONCURRENCY
+        self.increase_step = increase_step or config.WC_RATE_LIMIT_INCREASE
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold or config.WC_LATENCY_BACKOFF_THRESHOLD
+        self.window_seconds = window_seconds
+
+        self.rate = self.max_rate # Requests per second currently allowed
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._latency = {} # request class -> [latency EWMA, latency baseline]
+        self._last_decrease = 0.0
+        self._last_increase = 0.0
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        burst = max(1.0, self.rate) # Allow up to one second worth of requests as a burst
+        self._tokens = min(burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Blocks until a request may be sent: a token is available, no pause is active and a concurrency slot is free."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait_seconds = self._paused_until - now
+                elif self._in_flight >= self.max_concurrency:
+                    wait_seconds = None # Woken up by release()
+                elif self._tokens < 1.0:
+                    wait_seconds = (1.0 - self._tokens) / self.rate
+                else:
+                    self._tokens -= 1.0
+                    self._in_flight += 1
+                    return
+                self._condition.wait(wait_seconds)
+
+    def release(self, status_code=None, latency=None, retry_after=None, request_class=None):
+        """
+        Records the outcome of a call started with acquire() and adapts the rate. request_class
+        (e.g. "POST products/batch") groups calls whose latencies are comparable.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+
+            if status_code in (429, 503):
+                self._decrease(now)
+                pause_seconds = retry_after if retry_after is not None else 1.0 / self.rate
+                self._paused_until = max(self._paused_until, now + pause_seconds)
+                print(f"Store is throttling (HTTP {status_code}). Rate lowered to {self.rate:.1f} req/s, "
+                      f"pausing {pause_seconds:.1f}s.")
+            elif latency is not None:
+                latency_stats = self._latency.get(request_class)
+                if latency_stats is None:
+                    latency_stats = self._latency[request_class] = [latency, latency]
+                latency_stats[0] = 0.8 * latency_stats[0] + 0.2 * latency
+                # Baseline follows improvements immediately but degradations only very slowly
+                if latency_stats[0] < latency_stats[1]:
+                    latency_stats[1] = latency_stats[0]
+                else:
+                    latency_stats[1] = 0.99 * latency_stats[1] + 0.01 * latency_stats[0]
+                if latency_stats[0] > latency_stats[1] * self.latency_threshold:
+                    self._decrease(now)
+                elif now - self._last_increase >= self.window_seconds:
+                    # One additive step per window, so recovery speed does not depend on concurrency
+                    self.rate = min(self.max_rate, self.rate + self.increase_step)
+                    self._last_increase = now
+            self._condition.notify_all()
+
+    def _decrease(self, now):
+        if now - self._last_decrease < self.window_seconds:
+            return # One multiplicative decrease per window: a burst of 429s or slow calls is one signal
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._last_decrease = now
+
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(key):
+    """Returns the process-wide limiter for a store (keyed by its URL), creating it on first use."""
+    with _shared_limiters_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = AdaptiveRateLimiter()
+        return _shared_limiters[key]
@@ -0,0 +1,219 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import config
+from metrics import metrics
+from woocommerce_manager import WooCommerceManager
+
+PRICE_TOLERANCE = 0.005 # Prices are compared in cents, "12.0" and "12.00" are the same price
+
+
+class PricingRules:
+    """
+    Declarative store-price rules (see repricing_rules.example.json), evaluated with NumPy over
+    arrays of products at once:
+
+    - exchange_rate: store currency per unit of the scraped Shein price (default 1).
+    - bands: [{"up_to": shein_price, "markup": percent}, ...] in ascending order; a band without
+      up_to matches every higher price. Prices above every band keep the product's own markup.
+    - categories: [{"ids": [WooCommerce category IDs], "markup": percent}, ...] override the band
+      markup for products in those categories; the first matching rule wins.
+    - min_margin / min_margin_percent: the store price is at least cost + min_margin and
+      cost * (1 + min_margin_percent / 100), cost being the converted Shein price.
+    - rounding: {"step": 1, "ending": 0.99} rounds prices up to the next x.99 (e.g. step 1000 and
+      ending 900 for 49.900 style prices). Rounding up never breaks the minimum margin.
+    """
+
+    def __init__(self, rules):
+        self.exchange_rate = float(rules.get("exchange_rate", 1.0))
+        bands = rules.get("bands") or []
+        self.band_limits = np.array([band.get("up_to", np.inf) for band in bands], dtype=float)
+        self.band_markups = np.array([band["markup"] for band in bands], dtype=float)
+        if np.any(np.diff(self.band_limits) <= 0):
+            raise ValueError("Price bands must be in ascending 'up_to' order.")
+        self.category_rules = [
+            (np.array(rule["ids"], dtype=np.int64), float(rule["markup"])) for rule in rules.get("categories") or []]
+        self.min_margin = float(rules.get("min_margin", 0))
+        self.min_margin_percent = float(rules.get("min_margin_percent", 0))
+        rounding = rules.get("rounding") or {}
+        self.rounding_step = float(rounding.get("step", 0))
+        self.rounding_ending = float(rounding.get("ending", 0))
+
+    @classmethod
+    def load(cls, path=None):
+        with open(path or config.REPRICING_RULES_PATH, "r", encoding="utf-8") as rules_file:
+            return cls(json.load(rules_file))
+
+    def evaluate(self, shein_prices, product_markups, product_category_ids):
+        """
+        Computes the store prices of many products at once.
+
+        Args:
+            shein_prices: Scraped Shein prices, one per product.
+            product_markups: Markup percent each product was imported with (NaN for none, read as 0).
+            product_category_ids: WooCommerce category IDs of each product (one list per product).
+
+        Returns:
+            tuple: (store prices, applied markup percentages) as float arrays.
+        """
+        shein_prices = np.asarray(shein_prices, dtype=float)
+        markups = np.nan_to_num(np.asarray(product_markups, dtype=float))
+
+        if len(self.band_limits):
+            band_numbers = np.searchsorted(self.band_limits, shein_prices, side="left") # price <= up_to
+            in_band = band_numbers < len(self.band_limits)
+            markups = np.where(in_band, self.band_markups[np.minimum(band_numbers, len(self.band_limits) - 1)], markups)
+
+        if self.category_rules:
+            # Flatten the per-product category lists into (product number, category ID) pairs
+            category_counts = np.array([len(category_ids) for category_ids in product_category_ids], dtype=np.int64)
+            owners = np.repeat(np.arange(len(shein_prices)), category_counts)
+            flat_category_ids = np.fromiter(
+                (category_id for category_ids in product_category_ids for category_id in category_ids),
+                dtype=np.int64, count=int(category_counts.sum()))
+            for rule_category_ids, rule_markup in reversed(self.category_rules): # Earlier rules overwrite later ones
+                in_category = np.zeros(len(shein_prices), dtype=bool)
+                in_category[owners[np.isin(flat_category_ids, rule_category_ids)]] = True
+                markups = np.where(in_category, rule_markup, markups)
+
+        costs = shein_prices * self.exchange_rate
+        prices = costs * (1 + markups / 100)
+        prices = np.maximum(prices, costs * (1 + self.min_margin_percent / 100))
+        prices = np.maximum(prices, costs + self.min_margin)
+        if self.rounding_step:
+            # Next price ending in rounding_ending (the epsilon keeps prices that already end in it)
+            prices = np.ceil((prices - self.rounding_ending) / self.rounding_step - 1e-9) * self.rounding_step \
+                + self.rounding_ending
+        return np.round(prices, 2), markups
+
+    def price_for(self, shein_price, markup_percentage_str=None, category_ids=None):
+        """Store price of a single product, formatted for WooCommerce (e.g. "24.99")."""
+        markup = float(markup_percentage_str) if markup_percentage_str not in (None, "") else np.nan
+        prices, _ = self.evaluate([shein_price], [markup], [category_ids or []])
+        return format_price(prices[0])
+
+
+def format_price(price):
+    return f"{price:.2f}"
+
+
+def load_pricing_rules(path=None):
+    """Returns the PricingRules of the rules file, or None when it does not exist."""
+    try:
+        return PricingRules.load(path)
+    except FileNotFoundError:
+        return None
+
+
+def plan_repricing(product_index, pricing_rules, skus=None):
+    """
+    Evaluates the rules over every indexed product with a known Shein price and returns the
+    products whose variations would change price: a list of dicts with sku, wc_product_id,
+    old_price, new_price, markup and the variations/batch "update" items.
+    """
+    products = [product for product in product_index.all_products()
+                if product.get("shein_price") is not None and (not skus or product["sku"] in skus)]
+    if not products:
+        return []
+
+    product_ids = np.array([product["wc_product_id"] for product in products], dtype=np.int64)
+    new_prices, applied_markups = pricing_rules.evaluate(
+        [product["shein_price"] for product in products],
+        [float(product["markup"]) if product.get("markup") else np.nan for product in products],
+        [[category["id"] for category in product["categories"]] for product in products],
+    )
+
+    # Match every indexed variation to its product's new price and keep the ones that differ
+    variations = product_index.all_variations()
+    variation_product_ids = np.array([variation["wc_product_id"] for variation in variations], dtype=np.int64)
+    old_variation_prices = np.array(
+        [float(variation["regular_price"]) if variation.get("regular_price") else np.nan for variation in variations],
+        dtype=float)
+    product_order = np.argsort(product_ids)
+    positions = np.searchsorted(product_ids[product_order], variation_product_ids)
+    positions = np.minimum(positions, len(product_ids) - 1)
+    product_numbers = product_order[positions]
+    known_product = product_ids[product_numbers] == variation_product_ids
+    changed = known_product & ~np.isclose(old_variation_prices, new_prices[product_numbers], rtol=0,
+                                          atol=PRICE_TOLERANCE)
+
+    changes_by_product = {}
+    for variation_number in np.flatnonzero(changed):
+        variation = variations[variation_number]
+        product_number = int(product_numbers[variation_number])
+        product_changes = changes_by_product.setdefault(product_number, {
+            "sku": products[product_number]["sku"],
+            "wc_product_id": products[product_number]["wc_product_id"],
+            "old_price": variation.get("regular_price"),
+            "new_price": format_price(new_prices[product_number]),
+            "markup": float(applied_markups[product_number]),
+            "updates": [],
+        })
+        product_changes["updates"].append({
+            "id": variation["variation_id"],
+            "regular_price": product_changes["new_price"],
+            "sku": variation["sku"], # Only used to label errors; ignored by WooCommerce on update
+        })
+    return [changes_by_product[product_number] for product_number in sorted(changes_by_product)]
+
+
+def print_repricing_diff(planned_changes):
+    for change in planned_changes:
+        print(f"{change['sku']} (product {change['wc_product_id']}): {change['old_price']} -> {change['new_price']} "
+              f"(markup {change['markup']:g}%), {len(change['updates'])} variations")
+
+
+@metrics.timed("repricing.apply")
+def apply_repricing(woo_commerce_manager, planned_changes, workers=None):
+    """
+    Sends the changed prices through products/{id}/variations/batch (one call per product and
+    100 variations, several products in flight) and records the new prices in the product index.
+    Returns (variations updated, variations failed).
+    """
+    product_index = woo_commerce_manager.product_index
+
+    def apply_product(change):
+        outcomes = woo_commerce_manager.send_batch(
+            f"products/{change['wc_product_id']}/variations/batch", "update", change["updates"])
+        updated_variations = [
+            {"variation_id": result["id"], "sku": update["sku"], "regular_price": result.get("regular_price")}
+            for update, result in outcomes if result is not None
+        ]
+        product_index.record_variations(change["wc_product_id"], updated_variations)
+        if updated_variations:
+            product_index.record_product(change["sku"], change["wc_product_id"], regular_price=change["new_price"])
+        return len(updated_variations), len(outcomes) - len(updated_variations)
+
+    with ThreadPoolExecutor(max_workers=workers or config.REPRICE_WORKERS, thread_name_prefix="reprice") as executor:
+        results = list(executor.map(apply_product, planned_changes))
+    return sum(updated for updated, _ in results), sum(failed for _, failed in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprice every imported product from declarative pricing rules.")
+    parser.add_argument("--rules", default=config.REPRICING_RULES_PATH, help="Pricing rules JSON file")
+    parser.add_argument("--sku", action="append", help="Only reprice this Shein SKU (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the price changes without sending them")
+    parser.add_argument("--store", default=config.DEFAULT_STORE, help="Store of the registry to reprice")
+    parser.add_argument("--workers", type=int, default=config.REPRICE_WORKERS,
+                        help="Products whose variations are updated concurrently")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    rules = PricingRules.load(args.rules)
+    manager = WooCommerceManager(store=args.store)
+    with metrics.span("repricing.plan"):
+        changes = plan_repricing(manager.product_index, rules, skus=args.sku)
+    print_repricing_diff(changes)
+    changed_variations = sum(len(change["updates"]) for change in changes)
+    print(f"\n{len(changes)} products ({changed_variations} variations) change price "
+          f"(planned in {time.time() - start_time:.2f}s).")
+    if changes and not args.dry_run:
+        variations_updated, variations_failed = apply_repricing(manager, changes, workers=args.workers)
+        print(f"{variations_updated} variations updated, {variations_failed} failures "
+              f"in {time.time() - start_time:.1f}s.")
+    metrics.write_reports(run_name="repricing")
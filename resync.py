@@ -0,0 +1,141 @@
+import argparse
+import time
+
+import config
+from browser_pool import ScraperPool
+from http_scraper import create_http_session
+from metrics import metrics
+from repricing import PRICE_TOLERANCE
+from main import calculate_store_price, close_scraper, open_scraper
+from shein_parsing import normalize_size
+from woocommerce_manager import WooCommerceManager
+
+
+def refresh_variations_from_store(woo_commerce_manager, product):
+    """Re-reads a product's variations from WooCommerce and stores their current price/stock in the index."""
+    variations = woo_commerce_manager.get_all_pages(f"products/{product['wc_product_id']}/variations")
+    woo_commerce_manager.product_index.record_variations(product["wc_product_id"], [
+        woo_commerce_manager.variation_index_record(variation)
+        for variation in variations if "-raic-" in (variation.get("sku") or "")
+    ])
+
+
+def prices_differ(old_price, new_price):
+    """Compares WooCommerce price strings as amounts ("12", "12.0" and "12.00" are the same price)."""
+    try:
+        return abs(float(old_price) - float(new_price)) > PRICE_TOLERANCE
+    except (TypeError, ValueError):
+        return True # Missing or unreadable stored price
+
+
+def diff_variations(indexed_variations, store_price, size_stock):
+    """
+    Returns the variations/batch "update" items whose regular_price or stock_status differ
+    from the freshly scraped values. Sizes missing from size_stock keep their stock status.
+    """
+    updates = []
+    for variation in indexed_variations.values():
+        changes = {}
+        if store_price is not None and prices_differ(variation.get("regular_price"), store_price):
+            changes["regular_price"] = store_price
+        size = normalize_size(variation.get("size"))
+        if size in size_stock:
+            stock_status = "instock" if size_stock[size] else "outofstock"
+            if variation.get("stock_status") != stock_status:
+                changes["stock_status"] = stock_status
+        if changes:
+            changes["id"] = variation["variation_id"]
+            changes["sku"] = variation["sku"] # Only used to label errors; ignored by WooCommerce on update
+            updates.append(changes)
+    return updates
+
+
+def resync_prices_and_stock(skus=None, dry_run=False, refresh_remote=False, store=None):
+    """
+    Re-scrapes price and per-size availability of already imported products, recomputes the
+    store price with the product's markup and pushes only the changed regular_price/stock_status
+    values through products/{id}/variations/batch of the given store (default config.DEFAULT_STORE).
+
+    Returns:
+        dict: counts of products checked, products changed, variations updated and failures.
+    """
+    woo_commerce_manager = WooCommerceManager(store=store)
+    product_index = woo_commerce_manager.product_index
+    products = [p for p in product_index.all_products() if p.get("url") and (not skus or p["sku"] in skus)]
+    print(f"Re-syncing price and stock of {len(products)} imported products.")
+
+    summary = {"checked": 0, "changed": 0, "variations_updated": 0, "failed": 0}
+    scraper_pool = ScraperPool(size=1)
+    http_session = create_http_session() if config.SCRAPER_BACKEND == "http" else None
+    try:
+        for product in products:
+            scraper_instance = open_scraper(scraper_pool, http_session)
+            try:
+                scraper_instance.load_page(product["url"])
+                scraper_instance.close_popup_if_present()
+                scraped = scraper_instance.extract_price_and_stock()
+            except Exception as e:
+                print(f"Error re-scraping {product['url']}: {e}")
+                summary["failed"] += 1
+                continue
+            finally:
+                close_scraper(scraper_instance, scraper_pool)
+
+            summary["checked"] += 1
+            if scraped["shein_price"] is None:
+                print(f"Could not read the Shein price of {product['sku']}, skipping.")
+                summary["failed"] += 1
+                continue
+
+            # Same pricing as the import (and repricing.py's rules), so a re-sync does not undo a repricing
+            store_price = calculate_store_price(scraped["shein_price"], product.get("markup") or "0",
+                                                [category["id"] for category in product["categories"]])
+            if refresh_remote:
+                refresh_variations_from_store(woo_commerce_manager, product)
+            updates = diff_variations(
+                product_index.get_variations(product["wc_product_id"]), store_price, scraped["size_stock"])
+            if not updates:
+                print(f"{product['sku']}: price and stock unchanged.")
+                continue
+
+            summary["changed"] += 1
+            print(f"{product['sku']}: {len(updates)} variations changed.")
+            if dry_run:
+                for update in updates:
+                    print(f"  [dry-run] {update}")
+                continue
+
+            outcomes = woo_commerce_manager.send_batch(
+                f"products/{product['wc_product_id']}/variations/batch", "update", updates)
+            updated_variations = [
+                {"variation_id": result["id"], "sku": update["sku"],
+                 "regular_price": result.get("regular_price"), "stock_status": result.get("stock_status")}
+                for update, result in outcomes if result is not None
+            ]
+            product_index.record_variations(product["wc_product_id"], updated_variations)
+            product_index.record_product(
+                product["sku"], product["wc_product_id"], shein_price=scraped["shein_price"], regular_price=store_price)
+            summary["variations_updated"] += len(updated_variations)
+            summary["failed"] += len(outcomes) - len(updated_variations)
+    finally:
+        scraper_pool.close()
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-sync price and stock of imported products from Shein.")
+    parser.add_argument("--sku", action="append", help="Only re-sync this Shein SKU (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the changes without sending them")
+    parser.add_argument("--refresh-remote", action="store_true",
+                        help="Re-read current variation prices/stock from WooCommerce before diffing")
+    parser.add_argument("--store", default=config.DEFAULT_STORE, help="Store of the registry to re-sync")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    resync_summary = resync_prices_and_stock(skus=args.sku, dry_run=args.dry_run, refresh_remote=args.refresh_remote,
+                                             store=args.store)
+    print(f"\nChecked {resync_summary['checked']} products, {resync_summary['changed']} changed, "
+          f"{resync_summary['variations_updated']} variations updated, {resync_summary['failed']} failures "
+          f"in {time.time() - start_time:.1f}s.")
+    metrics.write_reports(run_name="resync")
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import config
+from shein_parsing import goods_id_from_url
+
+
+class ScrapeCache:
+    """
+    On-disk cache of scrape results (product details, translated reviews and page HTML), keyed by
+    Shein goods ID or normalized product URL. Entries expire after the TTL, and the least recently
+    used entries are evicted once the cache grows past max_bytes. The cache size is tracked in
+    memory (scanned once at startup), so the directory is only scanned again when eviction is due.
+    With bypass=True lookups always miss, but fresh results are still written.
+    """
+
+    def __init__(self, directory=None, ttl_seconds=None, max_bytes=None, bypass=False):
+        self.directory = directory or config.SCRAPE_CACHE_DIR
+        self.ttl_seconds = config.SCRAPE_CACHE_TTL if ttl_seconds is None else ttl_seconds
+        self.max_bytes = config.SCRAPE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.bypass = bypass
+        self._lock = threading.Lock()
+        self._entry_sizes = {} # path -> size in bytes of the entries written or found on disk
+        self._total_bytes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self.evict() # Drops expired entries and measures the cache once
+
+    @staticmethod
+    def cache_key(url):
+        goods_id = goods_id_from_url(url)
+        if goods_id:
+            return f"goods-{goods_id}"
+        parts = urlsplit(url.strip())
+        normalized_url = f"{parts.netloc.lower()}{parts.path.rstrip('/')}" # Drop scheme, query and fragment
+        return "url-" + hashlib.sha1(normalized_url.encode("utf-8")).hexdigest()
+
+    def _path(self, url):
+        return os.path.join(self.directory, f"{self.cache_key(url)}.json")
+
+    def get(self, url):
+        """Returns the cached entry (details, reviews, html) for the URL, or None on a miss."""
+        if self.bypass:
+            return None
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("cached_at", 0) >= self.ttl_seconds:
+            return None
+        try:
+            os.utime(path) # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        print(f"Scrape cache hit for {url} (cached {time.time() - entry['cached_at']:.0f}s ago).")
+        return entry
+
+    def put(self, url, details, reviews, html=None):
+        entry = {"url": url, "cached_at": time.time(), "details": details, "reviews": reviews, "html": html}
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(entry, cache_file, ensure_ascii=False)
+        entry_size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._total_bytes += entry_size - self._entry_sizes.get(path, 0)
+            self._entry_sizes[path] = entry_size
+            eviction_due = self._total_bytes > self.max_bytes
+        if eviction_due:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes expired entries, then least recently used ones until the cache is back under 90%
+        of max_bytes (the headroom keeps the next puts from triggering another directory scan).
+        """
+        with self._lock:
+            entries = []
+            now = time.time()
+            for file_name in os.listdir(self.directory):
+                if not file_name.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime >= self.ttl_seconds:
+                    self._remove(path) # Not read within the TTL, so it is expired as well
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            kept_entries = sorted(entries)
+            if total_bytes > self.max_bytes:
+                while kept_entries and total_bytes > self.max_bytes * 0.9:
+                    _, size, path = kept_entries.pop(0)
+                    self._remove(path)
+                    total_bytes -= size
+            # Re-measured from disk, which also picks up entries written by other processes
+            self._entry_sizes = {path: size for _, size, path in kept_entries}
+            self._total_bytes = total_bytes
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,74 +1,364 @@
+import json
+import os
+import threading
 import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.expected_conditions import presence_of_element_located as EC
+from selenium.webdriver.support.expected_conditions import element_to_be_clickable, invisibility_of_element_located
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
-from deep_translator import GoogleTranslator
+import config
+from metrics import metrics
+from translation import translate_reviews
+from shein_parsing import (
+    clean_image_urls, clean_sku, empty_product_details, format_description, normalize_size, parse_price,
+    process_categories,
+)
+
+# Main product block; once present the fields extracted below are available
+PRODUCT_INTRO_XPATH = '//div[contains(@class,"product-intro__info")]'
+POPUP_CLOSE_XPATH = '//div[@class="c-coupon-box"]//i | //div[@class="sui-dialog-close"]'
+
+# Collects every product field in one round trip. Selectors mirror the XPaths of the
+# per-element path; textContent is used so collapsed description rows are still read.
+EXTRACTION_SCRIPT = """
+const text = (el) => el ? el.textContent.replace(/\\s+/g, ' ').trim() : null;
+const first = (selector, root) => (root || document).querySelector(selector);
+const all = (selector, root) => Array.from((root || document).querySelectorAll(selector));
+return {
+    name: text(first('.product-intro__info h1')),
+    sku: text(first('.product-intro__head-sku')),
+    price: text(first('.product-intro__head-price > div:first-of-type span')),
+    price_fallback: text(first('div.from')),
+    breadcrumbs: all('.bread-crumb__inner .bread-crumb__item')
+        .filter((item) => item.querySelector('a, span'))
+        .map(text),
+    thumbnails: all('.product-intro__thumbs-inner .product-intro__thumbs-item img')
+        .map((img) => img.src)
+        .filter(Boolean),
+    description_pairs: all('[class*="product-intro__description-table-item"]')
+        .map((item) => [text(first('[class*="key"]', item)), text(first('[class*="val"]', item))])
+        .filter((pair) => pair[0] && pair[1]),
+    description_text: text(first('.product-intro__description')),
+    color: text(first('.product-intro__color > div > span > span')),
+};
+"""
+
+# URL patterns blocked through CDP in the "fast" profile: images, media, fonts and third-party analytics
+FAST_PROFILE_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+    "*connect.facebook.com*", "*analytics.tiktok.com*", "*bat.bing.com*", "*criteo.*", "*hotjar.com*",
+    "*pinterest.com/ct*", "*snapchat.com*", "*clarity.ms*",
+]
+
+
+# Price and per-size availability only, for re-syncing already imported products
+PRICE_STOCK_SCRIPT = """
+const text = (el) => el ? el.textContent.replace(/\\s+/g, ' ').trim() : null;
+const first = (selector, root) => (root || document).querySelector(selector);
+return {
+    price: text(first('.product-intro__head-price > div:first-of-type span')),
+    price_fallback: text(first('div.from')),
+    sizes: Array.from(document.querySelectorAll('.product-intro__size-radio'))
+        .map((radio) => [text(first('.product-intro__size-radio-inner', radio) || radio),
+                         radio.className.indexOf('soldout') !== -1 || radio.className.indexOf('disabled') !== -1]),
+};
+"""
+
+_chromedriver_lock = threading.Lock()
+_resolved_chromedriver = {} # Memoized resolution for this process: {"path": str or None}
+
+
+def _read_chromedriver_cache():
+    try:
+        with open(config.CHROMEDRIVER_CACHE_PATH, "r", encoding="utf-8") as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        return None, None
+    path = cached.get("path")
+    if not path or not os.path.isfile(path):
+        return None, None
+    return path, cached.get("resolved_at", 0)
+
+
+def _write_chromedriver_cache(path):
+    directory = os.path.dirname(config.CHROMEDRIVER_CACHE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{config.CHROMEDRIVER_CACHE_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as cache_file:
+        json.dump({"path": path, "resolved_at": time.time()}, cache_file)
+    os.replace(tmp_path, config.CHROMEDRIVER_CACHE_PATH)
+
+
+def resolve_chromedriver_path():
+    """
+    Returns the chromedriver binary to launch, resolved once per process:
+    config.CHROMEDRIVER_PATH (offline mode), else the locally cached path while its TTL lasts,
+    else webdriver-manager's download (then cached). When webdriver-manager fails, a stale
+    cached path is reused; None lets Selenium Manager locate a driver matching the installed Chrome.
+    """
+    with _chromedriver_lock:
+        if "path" in _resolved_chromedriver:
+            return _resolved_chromedriver["path"]
+
+        if config.CHROMEDRIVER_PATH:
+            path = config.CHROMEDRIVER_PATH
+        else:
+            path, resolved_at = _read_chromedriver_cache()
+            if path is None or time.time() - resolved_at > config.CHROMEDRIVER_CACHE_TTL:
+                try:
+                    from webdriver_manager.chrome import ChromeDriverManager # Network access, only when the cache is cold
+                    path = ChromeDriverManager().install()
+                    _write_chromedriver_cache(path)
+                except Exception as e:
+                    if path:
+                        print(f"Could not refresh chromedriver ({e}), using cached {path}.")
+                    else:
+                        print(f"Could not download chromedriver ({e}), letting Selenium Manager locate one.")
+        _resolved_chromedriver["path"] = path
+        return path
+
 
 class SheinScraper:
-    def __init__(self):
+    def __init__(self, profile=None):
+        """
+        Launches Chrome with the given profile: "default" (visible, maximized browser) or
+        "fast" (headless, eager page loads, images/media/fonts/trackers blocked, small window).
+        """
+        self.profile = (profile or config.SCRAPER_PROFILE).lower()
+        fast_profile = self.profile == "fast"
+
         chrome_options = Options()
-        # chrome_options.add_argument("--headless") # Optional: run in headless mode
+        if fast_profile:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument(f"--window-size={config.SCRAPER_FAST_WINDOW_SIZE}")
+            chrome_options.page_load_strategy = "eager" # Don't wait for images/subresources, DOM is enough
+        else:
+            chrome_options.add_argument("--start-maximized")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--start-maximized")
         chrome_options.add_argument("--lang=es")
         chrome_options.add_argument("--log-level=3")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
         
-        # Preferences to disable images and JavaScript for faster loading (optional)
-        # prefs = {"profile.managed_default_content_settings.images": 2,
-        #          "profile.managed_default_content_settings.javascript": 2} # 1:Allow, 2:Block
-        # chrome_options.add_experimental_option("prefs", prefs)
+        # Images are blocked in the fast profile; thumbnail src attributes are still in the DOM.
+        # JavaScript stays enabled because Shein renders the product block client-side.
+        if fast_profile:
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2}) # 1:Allow, 2:Block
+        self.chrome_options = chrome_options
+
+        self.driver = None
+        self._launch_driver()
+        # document.readyState values accepted as "page ready" by load_page
+        # With eager page loads the product block is usable as soon as the DOM is interactive
+        self.ready_states = ("interactive", "complete") if fast_profile else ("complete",)
+        self.page_timings = {} # Wall time per stage (load, popup, extract) for the current page
 
+    def _launch_driver(self):
+        """Starts Chrome and resets the per-session state used by the recycling policy."""
         try:
-            self.driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
+            self.driver = webdriver.Chrome(service=ChromeService(resolve_chromedriver_path()), options=self.chrome_options)
         except Exception as e:
             print(f"Error initializing WebDriver: {e}")
-            # Fallback or specific version if needed
-            try:
-                print("Attempting fallback to specific ChromeDriverManager version...")
-                self.driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager(version="114.0.5735.90").install()), options=chrome_options)
-            except Exception as e_fallback:
-                print(f"Fallback WebDriver initialization failed: {e_fallback}")
-                raise  # Re-raise the exception if fallback also fails
-                
+            raise
+
+        self._count_webdriver_commands()
         self.driver.set_page_load_timeout(120)
+        if self.profile == "fast":
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": FAST_PROFILE_BLOCKED_URLS})
+            except Exception as e:
+                print(f"Could not set blocked URLs through CDP: {e}")
+        # Set once the first-visit popup has been closed; cookies keep it from reappearing
+        self.popup_dismissed = False
+        self.driver_started_at = time.monotonic()
+        self.pages_served = 0
+        self.consecutive_failures = 0
+
+    def recycle_reason(self):
+        """
+        Returns (trigger, description) when the browser session should be relaunched: "pages", "age",
+        "failures" or "rss" over its SCRAPER_RECYCLE_* limit (0 disables a limit). None otherwise.
+        """
+        if config.SCRAPER_RECYCLE_MAX_PAGES and self.pages_served >= config.SCRAPER_RECYCLE_MAX_PAGES:
+            return "pages", f"{self.pages_served} pages served"
+        session_age = time.monotonic() - self.driver_started_at
+        if config.SCRAPER_RECYCLE_MAX_AGE and session_age >= config.SCRAPER_RECYCLE_MAX_AGE:
+            return "age", f"session age {session_age:.0f}s"
+        if config.SCRAPER_RECYCLE_MAX_FAILURES and self.consecutive_failures >= config.SCRAPER_RECYCLE_MAX_FAILURES:
+            return "failures", f"{self.consecutive_failures} consecutive extraction failures"
+        if config.SCRAPER_RECYCLE_MAX_RSS_MB and self.pages_served:
+            chrome_rss = self.chrome_rss_bytes()
+            if chrome_rss and chrome_rss >= config.SCRAPER_RECYCLE_MAX_RSS_MB * 2 ** 20:
+                return "rss", f"Chrome RSS {chrome_rss / 2 ** 20:.0f} MB"
+        return None
+
+    def recycle_if_needed(self):
+        """
+        Quits and relaunches Chrome when a recycling trigger has fired. Called before each page
+        is loaded, so a session is only ever replaced between products.
+        """
+        reason = self.recycle_reason()
+        if reason is None:
+            return False
+        trigger, description = reason
+        print(f"Recycling WebDriver after {self.pages_served} pages ({description}).")
+        metrics.incr("scraper_recycles", trigger=trigger)
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error closing recycled WebDriver: {e}")
+        self._launch_driver()
+        return True
 
+    def _count_webdriver_commands(self):
+        """Wraps driver.execute so every WebDriver round trip is counted per command."""
+        execute = self.driver.execute
+
+        def counted_execute(driver_command, params=None):
+            metrics.incr("webdriver_commands", command=driver_command)
+            return execute(driver_command, params)
+
+        self.driver.execute = counted_execute
+
+    @metrics.timed("scraper.load_page")
     def load_page(self, url):
+        """
+        Loads the product page and waits until it is ready: document.readyState is complete
+        and the product-intro block is present. Each wait is capped by a configurable timeout.
+        """
+        self.recycle_if_needed()
+        self.pages_served += 1
+        self.page_timings = {}
+        start_time = time.perf_counter()
         try:
             self.driver.get(url)
-            time.sleep(5)  # Wait for the page to load initially
+            WebDriverWait(self.driver, config.SCRAPER_PAGE_READY_TIMEOUT).until(
+                lambda driver: driver.execute_script("return document.readyState") in self.ready_states)
+            WebDriverWait(self.driver, config.SCRAPER_PRODUCT_INTRO_TIMEOUT).until(EC((By.XPATH, PRODUCT_INTRO_XPATH)))
         except Exception as e:
             print(f"Error loading page {url}: {e}")
             # Consider adding more robust error handling or retries here
+        self.page_timings["load"] = time.perf_counter() - start_time
+        print(f"Page ready in {self.page_timings['load']:.2f}s: {url}")
 
+    @metrics.timed("scraper.get_listing_html")
+    def get_listing_html(self, url):
+        """
+        Loads a category/listing page, scrolls down to trigger the lazily loaded product cards
+        and returns the page HTML (None if the page could not be loaded).
+        """
+        self.recycle_if_needed()
+        self.pages_served += 1
+        try:
+            self.driver.get(url)
+            WebDriverWait(self.driver, config.SCRAPER_PAGE_READY_TIMEOUT).until(
+                lambda driver: driver.execute_script("return document.readyState") in self.ready_states)
+            WebDriverWait(self.driver, config.SCRAPER_PRODUCT_INTRO_TIMEOUT).until(
+                EC((By.CSS_SELECTOR, 'a[href*="-p-"]')))
+        except Exception as e:
+            print(f"Error loading listing page {url}: {e}")
+            self.consecutive_failures += 1
+            return self.get_page_html()
+        self.consecutive_failures = 0
+        self.close_popup_if_present()
+        for _ in range(config.CRAWLER_SCROLLS):
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(config.CRAWLER_SCROLL_PAUSE) # Give lazy-loaded cards time to render
+        return self.get_page_html()
+
+    @metrics.timed("scraper.close_popup_if_present")
     def close_popup_if_present(self):
+        if self.popup_dismissed:
+            return # Already dismissed earlier in this browser session
+        start_time = time.perf_counter()
         try:
-            time.sleep(2) # Wait for popup to potentially appear
-            popup_close_button = WebDriverWait(self.driver, 10).until(
-                EC((By.XPATH, '//div[@class="c-coupon-box"]//i | //div[@class="sui-dialog-close"]'))) # Added alternative XPath
+            popup_close_button = WebDriverWait(self.driver, config.SCRAPER_POPUP_TIMEOUT).until(
+                element_to_be_clickable((By.XPATH, POPUP_CLOSE_XPATH))) # Added alternative XPath
             popup_close_button.click()
+            self.popup_dismissed = True
+            WebDriverWait(self.driver, config.SCRAPER_POPUP_TIMEOUT).until(
+                invisibility_of_element_located((By.XPATH, POPUP_CLOSE_XPATH)))
             print("Popup closed.")
-            time.sleep(2) # Wait for popup to disappear
         except Exception as e:
             print(f"No popup found or error closing popup: {e}")
+        self.page_timings["popup"] = time.perf_counter() - start_time
+
+    @metrics.timed("scraper.extract_product_details")
+    def extract_product_details(self, use_script=None):
+        """
+        Extracts the product details of the loaded page. By default all fields are collected
+        with a single execute_script round trip; the per-element WebDriver path is used as a
+        fallback when the script fails or misses the essential fields (name and price).
+        """
+        start_time = time.perf_counter()
+        use_script = config.SCRAPER_SCRIPT_EXTRACTION if use_script is None else use_script
+
+        details = None
+        if use_script:
+            try:
+                details = self._extract_product_details_script()
+            except Exception as e:
+                print(f"Single-script extraction failed: {e}")
+            if details and (not details.get("product_name") or details.get("shein_price") is None):
+                print("Single-script extraction missed essential fields. Falling back to per-element extraction.")
+                details = None
+        if details is None:
+            details = self._extract_product_details_dom()
+        if details.get("product_name") and details.get("shein_price") is not None:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+
+        self.page_timings["extract"] = time.perf_counter() - start_time
+        print("Page timings: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.page_timings.items()))
+        return details
+
+    def _extract_product_details_script(self):
+        """
+        Collects every field in one execute_script call, then applies the same
+        Python post-processing as the per-element path.
+        """
+        raw = self.driver.execute_script(EXTRACTION_SCRIPT)
+        details = empty_product_details()
+
+        details["product_name"] = raw.get("name") or None
+        if raw.get("sku"):
+            details["sku"] = clean_sku(raw["sku"])
+
+        for price_text in (raw.get("price"), raw.get("price_fallback")):
+            if not price_text:
+                continue
+            try:
+                details["shein_price"] = parse_price(price_text)
+                break
+            except ValueError as e:
+                print(f"Error parsing Shein price '{price_text}': {e}")
+
+        details["shein_categories"] = process_categories(raw.get("breadcrumbs") or [])
+        details["image_urls"] = clean_image_urls(raw.get("thumbnails") or [])
+
+        details["description"] = format_description(raw.get("description_pairs") or [])
+        if not details["description"]: # Fallback if structured description is empty
+            details["description"] = (raw.get("description_text") or "").strip()
 
-    def extract_product_details(self):
-        details = {
-            "product_name": None,
-            "sku": None,
-            "shein_price": None,
-            "shein_categories": [],
-            "image_urls": [],
-            "description": None,
-            "color": None,
-        }
+        details["color"] = raw.get("color") or "No especificado" # Default if not found
+        return details
+
+    def _extract_product_details_dom(self):
+        """
+        Per-element extraction path (one WebDriver round trip per lookup), kept as a fallback.
+        """
+        details = empty_product_details()
 
         # Product Name
         try:
@@ -80,20 +370,19 @@ class SheinScraper:
         # SKU
         try:
             sku_element = WebDriverWait(self.driver, 10).until(EC((By.XPATH, '//div[@class="product-intro__head-sku"]')))
-            details["sku"] = sku_element.text.replace("SKU: ", "").strip()
+            details["sku"] = clean_sku(sku_element.text)
         except Exception as e:
             print(f"Error extracting SKU: {e}")
 
         # Shein Price
         try:
             price_element = WebDriverWait(self.driver, 10).until(EC((By.XPATH, '//div[@class="product-intro__head-price j-expose__product-intro__head-price"]/div[1]//span')))
-            details["shein_price"] = float(price_element.text.replace('€', '').replace(',', '.').strip())
+            details["shein_price"] = parse_price(price_element.text)
         except Exception as e:
             print(f"Error extracting Shein price: {e}")
             try: # Fallback for different price structure
                 price_element_fallback = WebDriverWait(self.driver, 5).until(EC((By.XPATH, '//div[@class="from"]')))
-                price_text = price_element_fallback.text.replace('€', '').replace(',', '.').strip()
-                details["shein_price"] = float(price_text)
+                details["shein_price"] = parse_price(price_element_fallback.text)
             except Exception as e_fallback:
                 print(f"Fallback error extracting Shein price: {e_fallback}")
 
@@ -102,15 +391,7 @@ class SheinScraper:
         try:
             category_elements = WebDriverWait(self.driver, 10).until(EC((By.XPATH, '//div[@class="bread-crumb__inner"]//div[@class="bread-crumb__item"][a or span]')))
             categories_raw = [elem.text.strip() for elem in self.driver.find_elements(By.XPATH, '//div[@class="bread-crumb__inner"]//div[@class="bread-crumb__item"][a or span]')]
-            categories_processed = []
-            for cat_text in categories_raw:
-                if '&' in cat_text:
-                    categories_processed.extend([c.strip() for c in cat_text.split('&')])
-                else:
-                    categories_processed.append(cat_text)
-            
-            unwanted_categories = {"SHEIN", "rebajas", "Rebajas", "Home", "Hogar"} # Added "Hogar"
-            details["shein_categories"] = [cat for cat in categories_processed if cat and cat not in unwanted_categories]
+            details["shein_categories"] = process_categories(categories_raw)
 
         except Exception as e:
             print(f"Error extracting categories: {e}")
@@ -119,32 +400,7 @@ class SheinScraper:
         try:
             images_container = WebDriverWait(self.driver, 10).until(EC((By.XPATH, '//div[@class="product-intro__thumbs-inner"]')))
             thumbnail_elements = images_container.find_elements(By.XPATH, './/div[@class="product-intro__thumbs-item"]//img') # Simpler XPath for img
-            
-            image_urls_raw = []
-            for thumb in thumbnail_elements:
-                src = thumb.get_attribute('src')
-                if src:
-                    image_urls_raw.append(src)
-            
-            cleaned_urls = []
-            for url in image_urls_raw:
-                if url.startswith("//"):
-                    url = "https:" + url
-                url = url.replace('_thumbnail_', '_') # General replacement for higher quality
-                # Ensure .webp, but avoid double .webp.webp
-                if ".webp" not in url:
-                     if ".jpg" in url:
-                         url = url.split(".jpg")[0] + ".webp"
-                     elif ".png" in url:
-                         url = url.split(".png")[0] + ".webp"
-                     else: # if no common extension, just append (less ideal)
-                         url += ".webp"
-                elif url.endswith(".webp.webp"):
-                    url = url[:-5]
-
-                if url not in cleaned_urls: # Avoid duplicates
-                    cleaned_urls.append(url)
-            details["image_urls"] = cleaned_urls
+            details["image_urls"] = clean_image_urls([thumb.get_attribute('src') for thumb in thumbnail_elements])
         except Exception as e:
             print(f"Error extracting image URLs: {e}")
 
@@ -154,11 +410,10 @@ class SheinScraper:
             try:
                 desc_icon = WebDriverWait(self.driver, 5).until(EC((By.XPATH, '//div[@class="product-intro__description"]//i')))
                 self.driver.execute_script("arguments[0].click();", desc_icon) # JS click
-                time.sleep(1)
             except Exception:
                 print("Description reveal icon not found or not clickable, proceeding anyway.")
 
-            desc_items = WebDriverWait(self.driver, 10).until(
+            desc_items = WebDriverWait(self.driver, config.SCRAPER_DESCRIPTION_TIMEOUT).until(
                 EC((By.XPATH, '//div[contains(@class,"product-intro__description-table-item")]'))
             )
             description_parts = []
@@ -170,10 +425,9 @@ class SheinScraper:
                 try:
                     key_element = item.find_element(By.XPATH, './/div[contains(@class,"key")]')
                     value_element = item.find_element(By.XPATH, './/div[contains(@class,"val")]')
-                    key = key_element.text.strip().replace(":", "")
-                    value = value_element.text.strip()
-                    if key and value: # Ensure both key and value are present
-                         description_parts.append(f"{key}: {value}")
+                    item_description = format_description([(key_element.text, value_element.text)])
+                    if item_description:
+                         description_parts.append(item_description)
                 except Exception as e_item:
                     # If specific key/value structure is not found, try to get text of the item
                     print(f"Could not parse key/value for a description item: {e_item}. Using item's text.")
@@ -201,8 +455,34 @@ class SheinScraper:
 
         return details
 
+    @metrics.timed("scraper.extract_price_and_stock")
+    def extract_price_and_stock(self):
+        """
+        Returns {"shein_price": float or None, "size_stock": {size: in_stock}} for the loaded page,
+        in one round trip. size_stock is empty if the size selector could not be read.
+        """
+        result = {"shein_price": None, "size_stock": {}}
+        try:
+            raw = self.driver.execute_script(PRICE_STOCK_SCRIPT)
+        except Exception as e:
+            print(f"Error extracting price and stock: {e}")
+            return result
+        for price_text in (raw.get("price"), raw.get("price_fallback")):
+            if not price_text:
+                continue
+            try:
+                result["shein_price"] = parse_price(price_text)
+                break
+            except ValueError as e:
+                print(f"Error parsing Shein price '{price_text}': {e}")
+        for size_text, sold_out in raw.get("sizes") or []:
+            if size_text:
+                result["size_stock"][normalize_size(size_text)] = not sold_out
+        return result
+
+    @metrics.timed("scraper.extract_and_translate_reviews")
     def extract_and_translate_reviews(self):
-        reviews_list = []
+        review_texts = []
         try:
             review_elements_xpath = '//div[contains(@class,"common-reviews__list")]//div[contains(@class,"j-expose__common-reviews__list-item")]//div[@class="rate-des"]'
             WebDriverWait(self.driver, 15).until(EC((By.XPATH, review_elements_xpath)))
@@ -213,44 +493,68 @@ class SheinScraper:
                 return []
 
             print(f"Found {len(review_elements)} review elements.")
-            translator = GoogleTranslator(source='auto', target='es')
-
             for i, review_element in enumerate(review_elements):
                 try:
-                    review_text = review_element.text.strip()
-                    if review_text:
-                        # Basic cleaning of review text (optional, can be expanded)
-                        review_text = review_text.replace("\n", " ").strip()
-                        
-                        # Translate if not empty
-                        if review_text:
-                            time.sleep(1) # Sleep before translation to avoid rate limiting
-                            translated_text = translator.translate(review_text)
-                            reviews_list.append(translated_text)
-                            print(f"Review {i+1} translated: {translated_text[:50]}...") # Print first 50 chars
-                        else:
-                            print(f"Review {i+1} was empty after cleaning, skipping translation.")
-                    else:
-                        print(f"Review {i+1} has no text, skipping.")
+                    review_texts.append(review_element.text.strip())
                 except Exception as e_review:
-                    print(f"Error processing or translating review {i+1}: {e_review}")
-                    original_text = review_element.text.strip() # Try to get original text for logging
-                    if original_text:
-                        reviews_list.append(f"[Translation Error] {original_text}") # Add original with error mark
-                    else:
-                        reviews_list.append("[Translation Error] Review text was empty or unreadable")
-                
-                if i >= 4 and not reviews_list: # If first 5 reviews failed, likely a broader issue
-                    print("First 5 reviews failed to process. Aborting further review extraction.")
-                    break
+                    print(f"Error reading review {i+1}: {e_review}")
         
         except Exception as e:
             print(f"Error finding or processing review container: {e}")
         
-        if not reviews_list:
-            print("No reviews were extracted or translated.")
-        
-        return reviews_list
+        return translate_reviews(review_texts)
+
+    def get_page_html(self):
+        try:
+            return self.driver.page_source
+        except Exception as e:
+            print(f"Error reading page source: {e}")
+            return None
+
+    def is_healthy(self):
+        """
+        Returns True if the WebDriver session still responds (Chrome has not crashed or been closed).
+        """
+        try:
+            return self.driver.execute_script("return 1;") == 1
+        except Exception as e:
+            print(f"WebDriver health check failed: {e}")
+            return False
+
+    def chrome_rss_bytes(self):
+        """
+        Returns the resident memory of chromedriver and its Chrome process tree in bytes,
+        or None if psutil is not installed or the processes cannot be inspected.
+        """
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            root_process = psutil.Process(self.driver.service.process.pid)
+            total_rss = 0
+            for process in [root_process] + root_process.children(recursive=True):
+                try:
+                    total_rss += process.memory_info().rss
+                except psutil.Error:
+                    pass # Process exited while we were walking the tree
+            return total_rss
+        except Exception as e:
+            print(f"Could not measure Chrome memory: {e}")
+            return None
+
+    def reset_session(self, clear_cookies=False):
+        """
+        Prepares a warm browser for the next product page. Cookies are kept by default
+        so popups already dismissed in this session stay dismissed.
+        """
+        try:
+            self.driver.get("about:blank") # Stop pending scripts/requests of the previous page
+            if clear_cookies:
+                self.driver.delete_all_cookies()
+                self.popup_dismissed = False
+        except Exception as e:
+            print(f"Error resetting browser session: {e}")
 
     def quit_driver(self):
         if self.driver:
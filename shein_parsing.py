@@ -0,0 +1,264 @@
+# Post-processing shared by every Shein extraction path (Selenium per-element, single-script, HTTP).
+import json
+import re
+from urllib.parse import urljoin, urlsplit
+
+UNWANTED_CATEGORIES = {"SHEIN", "rebajas", "Rebajas", "Home", "Hogar"} # Added "Hogar"
+
+
+def empty_product_details():
+    """Returns the product details dict every scraper backend fills in."""
+    return {
+        "product_name": None,
+        "sku": None,
+        "shein_price": None,
+        "shein_categories": [],
+        "image_urls": [],
+        "description": None,
+        "color": None,
+    }
+
+
+def parse_price(price_text):
+    """Converts a Shein price text such as '12,99€' to a float."""
+    return float(str(price_text).replace('€', '').replace(',', '.').strip())
+
+
+def clean_sku(sku_text):
+    return sku_text.replace("SKU: ", "").strip()
+
+
+def process_categories(categories_raw):
+    """Splits 'A & B' breadcrumb items and drops store-wide crumbs such as 'SHEIN' or 'Home'."""
+    categories_processed = []
+    for cat_text in categories_raw:
+        cat_text = cat_text.strip()
+        if '&' in cat_text:
+            categories_processed.extend([c.strip() for c in cat_text.split('&')])
+        else:
+            categories_processed.append(cat_text)
+
+    return [cat for cat in categories_processed if cat and cat not in UNWANTED_CATEGORIES]
+
+
+def clean_image_urls(image_urls_raw):
+    """Turns thumbnail srcs into absolute, full-size .webp URLs without duplicates."""
+    cleaned_urls = []
+    for url in image_urls_raw:
+        if not url:
+            continue
+        if url.startswith("//"):
+            url = "https:" + url
+        url = url.replace('_thumbnail_', '_') # General replacement for higher quality
+        # Ensure .webp, but avoid double .webp.webp
+        if ".webp" not in url:
+             if ".jpg" in url:
+                 url = url.split(".jpg")[0] + ".webp"
+             elif ".png" in url:
+                 url = url.split(".png")[0] + ".webp"
+             else: # if no common extension, just append (less ideal)
+                 url += ".webp"
+        elif url.endswith(".webp.webp"):
+            url = url[:-5]
+
+        if url not in cleaned_urls: # Avoid duplicates
+            cleaned_urls.append(url)
+    return cleaned_urls
+
+
+def format_description(description_pairs):
+    """Formats (key, value) description rows as 'Key: Value' lines."""
+    description_parts = []
+    for key, value in description_pairs:
+        key = (key or "").strip().replace(":", "")
+        value = (value or "").strip()
+        if key and value: # Ensure both key and value are present
+            description_parts.append(f"{key}: {value}")
+    return "\n".join(description_parts)
+
+
+# Script variables under which Shein product pages embed their product data, in lookup order
+EMBEDDED_JSON_MARKERS = ("productIntroData", "gbRawData", "goodsDetailv2SsrData", "__NEXT_DATA__")
+
+
+def _dig(data, *path):
+    """Follows a path of dict keys / list indexes, returning None as soon as a step is missing."""
+    for step in path:
+        if isinstance(data, dict):
+            data = data.get(step)
+        elif isinstance(data, list) and isinstance(step, int) and -len(data) <= step < len(data):
+            data = data[step]
+        else:
+            return None
+    return data
+
+
+def _find_key(data, key):
+    """Depth-first search for the first dict value stored under key."""
+    if isinstance(data, dict):
+        if key in data:
+            return data[key]
+        children = data.values()
+    elif isinstance(data, list):
+        children = data
+    else:
+        return None
+    for child in children:
+        found = _find_key(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def extract_embedded_json(html):
+    """
+    Returns the first JSON object assigned to one of EMBEDDED_JSON_MARKERS in the page HTML,
+    e.g. `window.gbRawData = {...}` or `"productIntroData": {...}`. Raises ValueError if none parses.
+    """
+    decoder = json.JSONDecoder()
+    for marker in EMBEDDED_JSON_MARKERS:
+        search_from = 0
+        while True:
+            marker_pos = html.find(marker, search_from)
+            if marker_pos == -1:
+                break
+            search_from = marker_pos + len(marker)
+            object_start = html.find("{", search_from)
+            if object_start == -1:
+                break
+            # Only accept an object that directly follows the marker (`= {`, `": {`), or the body
+            # of a <script id="..." type="application/json"> tag
+            gap = html[search_from:object_start]
+            if gap.strip(" \t\r\n\"'=:>") and "application/json" not in gap:
+                continue
+            try:
+                data, _ = decoder.raw_decode(html, object_start)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                return data
+    raise ValueError("No embedded product JSON found in page.")
+
+
+def _parse_json_price(intro):
+    for price_path in (("getPrice", "salePrice", "amount"), ("detail", "salePrice", "amount"),
+                       ("detail", "retailPrice", "amount"), ("getPrice", "salePrice", "amountWithSymbol")):
+        price_value = _dig(intro, *price_path)
+        if price_value not in (None, ""):
+            try:
+                return parse_price(price_value)
+            except ValueError:
+                continue
+    return None
+
+
+def normalize_size(size_text):
+    """Normalizes a size label so scraped sizes can be matched against the sizes given at import ('m ' -> 'M')."""
+    return " ".join((size_text or "").split()).upper()
+
+
+def parse_price_and_stock_json(data):
+    """
+    Returns {"shein_price": float or None, "size_stock": {size: in_stock}} from the embedded
+    product JSON. size_stock is empty when the page carries no per-size stock data.
+    """
+    intro = _find_key(data, "productIntroData") or data
+    size_stock = {}
+    for sku in _find_key(intro, "sku_list") or []:
+        if not isinstance(sku, dict):
+            continue
+        sale_attributes = sku.get("sku_sale_attr") or []
+        size_attribute = next(
+            (attr for attr in sale_attributes if str(attr.get("attr_name", "")).lower() in ("size", "talla")),
+            sale_attributes[0] if sale_attributes else None,
+        )
+        if not size_attribute or not size_attribute.get("attr_value_name"):
+            continue
+        in_stock = int(sku.get("stock") or 0) > 0
+        size = normalize_size(size_attribute["attr_value_name"])
+        size_stock[size] = size_stock.get(size, False) or in_stock
+    return {"shein_price": _parse_json_price(intro), "size_stock": size_stock}
+
+
+def parse_product_json(data):
+    """
+    Maps Shein's embedded product data (productIntroData) to the product details dict.
+    Raises ValueError when the essential fields (name and price) are missing.
+    """
+    intro = _find_key(data, "productIntroData") or data
+    detail = intro.get("detail") or _find_key(intro, "detail") or {}
+    details = empty_product_details()
+
+    details["product_name"] = (detail.get("goods_name") or "").strip() or None
+    details["sku"] = (detail.get("goods_sn") or "").strip() or None
+
+    details["shein_price"] = _parse_json_price(intro)
+
+    # Breadcrumb: parentCats is a chain of {cat_name, children: [...]} from the root category down
+    breadcrumbs = []
+    category_node = intro.get("parentCats")
+    while isinstance(category_node, dict) and category_node.get("cat_name"):
+        breadcrumbs.append(category_node["cat_name"])
+        children = category_node.get("children") or []
+        category_node = children[0] if children else None
+    current_category = _dig(intro, "currentCat", "cat_name")
+    if current_category and current_category not in breadcrumbs:
+        breadcrumbs.append(current_category)
+    details["shein_categories"] = process_categories(breadcrumbs)
+
+    images_raw = []
+    goods_imgs = intro.get("goods_imgs") or {}
+    main_image = _dig(goods_imgs, "main_image", "origin_image")
+    if main_image:
+        images_raw.append(main_image)
+    images_raw.extend(image.get("origin_image") for image in goods_imgs.get("detail_image") or [])
+    details["image_urls"] = clean_image_urls(images_raw)
+
+    details["description"] = format_description(
+        (attribute.get("attr_name"), attribute.get("attr_value")) for attribute in detail.get("productDetails") or []
+    )
+
+    color = _dig(detail, "mainSaleAttribute", 0, "attr_value") or _dig(intro, "colorData", "colorName")
+    details["color"] = color or "No especificado" # Default if not found
+
+    if not details["product_name"] or details["shein_price"] is None:
+        raise ValueError("Embedded product JSON is missing the product name or price.")
+    return details
+
+
+def parse_review_texts(data):
+    """Returns the review texts embedded in the product JSON (may be empty)."""
+    comments = _find_key(data, "comment_list") or _find_key(data, "commentList") or []
+    return [comment.get("content", "") for comment in comments if isinstance(comment, dict)]
+
+
+def parse_product_html(html):
+    """Parses a saved or fetched Shein product page into the product details dict (no browser needed)."""
+    return parse_product_json(extract_embedded_json(html))
+
+
+def goods_id_from_url(url):
+    """Returns the Shein goods ID of a product URL ('...-p-11365602-cat-1738.html' -> '11365602'), or None."""
+    match = re.search(r"-p-(\d+)", url or "")
+    return match.group(1) if match else None
+
+
+# Product links on listing pages: "/Vestido-Largo-p-11365602-cat-1738.html?src_module=..."
+PRODUCT_LINK_PATTERN = re.compile(r'href="([^"]*-p-\d+[^"]*?\.html)[^"]*"')
+
+
+def parse_listing_product_urls(html, page_url):
+    """
+    Returns [(product URL, goods ID)] for the product cards of a category/listing page, in page
+    order and without duplicates. URLs are made absolute and stripped of tracking query strings.
+    """
+    products = []
+    seen_goods_ids = set()
+    for href in PRODUCT_LINK_PATTERN.findall(html or ""):
+        product_url = urljoin(page_url, href.replace("&amp;", "&"))
+        product_url = urlsplit(product_url)._replace(query="", fragment="").geturl()
+        goods_id = goods_id_from_url(product_url)
+        if goods_id and goods_id not in seen_goods_ids:
+            seen_goods_ids.add(goods_id)
+            products.append((product_url, goods_id))
+    return products
@@ -0,0 +1,93 @@
+import json
+import os
+
+import config
+
+_stores = None # Registry loaded from config.STORES_FILE on first use
+# Store-specific IDs and URL every store other than the default one must set (never inherited)
+REQUIRED_STORE_FIELDS = ("url", "attr_id_color", "attr_id_size", "gender_categories", "fallback_categories")
+
+
+def _default_store():
+    return {
+        "url": config.WC_STORE_URL,
+        "consumer_key": config.WC_CONSUMER_KEY,
+        "consumer_secret": config.WC_CONSUMER_SECRET,
+        "wp_username": config.WP_USERNAME,
+        "wp_app_password": config.WP_APP_PASSWORD,
+        "upload_media": config.WC_UPLOAD_MEDIA,
+        "attr_id_color": config.DEFAULT_ATTR_ID_COLOR,
+        "attr_id_size": config.DEFAULT_ATTR_ID_SIZE,
+        "gender_categories": config.DEFAULT_GENDER_CATEGORIES,
+        "fallback_categories": config.DEFAULT_FALLBACK_CATEGORIES,
+        # The default store keeps the pre-registry index locations
+        "category_index_path": config.CATEGORY_INDEX_PATH,
+        "product_index_path": config.PRODUCT_INDEX_PATH,
+        "media_index_path": config.MEDIA_INDEX_PATH,
+    }
+
+
+def _build_store(name, settings):
+    """
+    Completes one registry entry. Secrets can be given as "<field>_env" (the name of an environment
+    variable) instead of in the file. Stores other than the default one must set REQUIRED_STORE_FIELDS
+    (raises ValueError otherwise), get their own index paths under CACHE_DIR/stores/<name>/ and
+    share nothing else with the default store.
+    """
+    store = _default_store()
+    if name != config.DEFAULT_STORE:
+        # Other stores share no credentials or persisted state with the default store
+        store_dir = os.path.join(config.CACHE_DIR, "stores", name)
+        store.update(
+            consumer_key=None, consumer_secret=None, wp_username=None, wp_app_password=None, upload_media=None,
+            category_index_path=os.path.join(store_dir, "category_index.json"),
+            product_index_path=os.path.join(store_dir, "product_index.sqlite3"),
+            media_index_path=os.path.join(store_dir, "media_index.json"),
+        )
+    for field, value in settings.items():
+        if field.endswith("_env"):
+            store[field[:-len("_env")]] = os.getenv(value)
+        else:
+            store[field] = value
+    if name != config.DEFAULT_STORE:
+        missing_fields = [field for field in REQUIRED_STORE_FIELDS
+                          if field not in settings and f"{field}_env" not in settings]
+        if missing_fields:
+            raise ValueError(f"Store '{name}' in {config.STORES_FILE} is missing {', '.join(missing_fields)}; "
+                             "category and attribute IDs differ between stores, so they are not inherited.")
+    if store["upload_media"] is None:
+        store["upload_media"] = bool(store["wp_app_password"])
+    store["name"] = name
+    store["gender_categories"] = {str(code): mapping for code, mapping in store["gender_categories"].items()}
+    return store
+
+
+def load_stores():
+    """Returns the store registry {name: store dict}, loading STORES_FILE once."""
+    global _stores
+    if _stores is None:
+        try:
+            with open(config.STORES_FILE, "r", encoding="utf-8") as stores_file:
+                registry = json.load(stores_file)
+        except FileNotFoundError:
+            registry = {}
+        registry.setdefault(config.DEFAULT_STORE, {})
+        _stores = {name: _build_store(name, settings) for name, settings in registry.items()}
+    return _stores
+
+
+def get_store(store=None):
+    """Returns the store dict for a store name (None = DEFAULT_STORE); a store dict is returned unchanged."""
+    if isinstance(store, dict):
+        return store
+    stores = load_stores()
+    name = store or config.DEFAULT_STORE
+    if name not in stores:
+        raise ValueError(f"Unknown store '{name}'. Configured stores: {', '.join(sorted(stores))}.")
+    return stores[name]
+
+
+def store_categories(store, gender_code):
+    """Returns (initial category ID dicts, parent ID for Shein categories) of a gender code in a store."""
+    mapping = store["gender_categories"].get(str(gender_code), store["fallback_categories"])
+    return [{"id": category_id} for category_id in mapping["initial"]], mapping["parent"]
@@ -0,0 +1,58 @@
+import threading
+
+from bulk_import import read_import_rows, run_bulk_import
+
+
+def run_with_timeout(rows, timeout=15):
+    """Runs the bulk import on a thread, so a pipeline that never shuts down fails the test instead of hanging."""
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(results=run_bulk_import(rows, scrape_workers=1,
+                                                                                     upload_workers=1)),
+                              daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "run_bulk_import did not finish"
+    return outcome["results"]
+
+
+def test_unreadable_rows_fail_without_stopping_the_import(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # Per-store indexes are created under the working directory
+    rows_path = tmp_path / "rows.jsonl"
+    rows_path.write_text('{"url": "", "sizes": "S", "markup": "20"}\n{not json\n["a list"]\n', encoding="utf-8")
+
+    results = run_with_timeout(read_import_rows(str(rows_path)))
+
+    assert [(result["row"], result["status"], result["stage"]) for result in results] == [
+        (1, "failed", "input"), (2, "failed", "input"), (3, "failed", "input")]
+    assert results[0]["error"] == "Missing url."
+    assert results[1]["error"].startswith("Invalid JSON")
+
+
+def test_failing_row_source_still_shuts_the_pipeline_down(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def crawled_rows():
+        yield {"url": "https://example.com/a-p-1.html", "sizes": "", "markup": "20"}
+        raise RuntimeError("listing page could not be loaded")
+
+    results = run_with_timeout(crawled_rows())
+
+    assert [(result["row"], result["stage"]) for result in results] == [(1, "input"), (2, "input")]
+    assert "listing page could not be loaded" in results[1]["error"]
+
+
+def test_scrape_processes_that_fail_to_start_fail_their_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Spawned workers re-import config, which cannot parse this, so they exit before reporting ready
+    monkeypatch.setenv("CRAWLER_MAX_PAGES", "not a number")
+    rows = ({"url": f"https://example.com/v-p-{goods_id}.html", "sizes": "S", "markup": "20", "gender_code": "1"}
+            for goods_id in range(6))
+
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(results=run_bulk_import(
+        rows, upload_workers=1, scrape_processes=1, queue_size=2)), daemon=True)
+    thread.start()
+    thread.join(60)
+
+    assert not thread.is_alive(), "run_bulk_import did not finish"
+    assert [(result["status"], result["stage"]) for result in outcome["results"]] == [("failed", "scrape")] * 6
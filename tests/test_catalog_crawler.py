@@ -0,0 +1,35 @@
+from catalog_crawler import CatalogCrawler, SeenSet
+
+
+def listing_html(goods_ids):
+    return "".join(f'<a href="/Vestido-p-{goods_id}-cat-1727.html?src_module=list">x</a>' for goods_id in goods_ids)
+
+
+class FakeListingCrawler(CatalogCrawler):
+    """Serves listing pages from a dict; a page mapped to an exception raises it like a failed browser load."""
+
+    def __init__(self, pages, seen_set, **kwargs):
+        super().__init__(seen_set=seen_set, max_pages=5, page_delay=0, **kwargs)
+        self.pages = pages
+
+    def fetch_listing_html(self, page_url):
+        page = self.pages.get(page_url, "")
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+
+def test_listing_error_ends_only_that_listing(tmp_path):
+    pages = {
+        "https://shein.test/a-c-1.html": listing_html([1, 2]),
+        "https://shein.test/a-c-1.html?page=2": RuntimeError("Chrome failed to start"),
+        "https://shein.test/b-c-2.html": listing_html([2, 3]),
+    }
+    seen_set = SeenSet(path=str(tmp_path / "seen.json"))
+    seen_set.add("3")
+    crawler = FakeListingCrawler(pages, seen_set)
+
+    crawled = [goods_id for _, goods_id in crawler.crawl(["https://shein.test/a-c-1.html", "https://shein.test/b-c-2.html"])]
+
+    assert crawled == ["1", "2"] # 2 is yielded once across listings, 3 was imported by an earlier crawl
+    assert seen_set.goods_ids == {"3"} # Crawling never marks products seen; only successful imports do
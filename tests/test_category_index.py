@@ -0,0 +1,19 @@
+from category_index import CategoryIndex
+
+
+def test_category_path_keeps_original_names_of_colliding_siblings(tmp_path):
+    index = CategoryIndex(path=str(tmp_path / "categories.json"))
+    index.replace_all([
+        {"id": 184, "parent": 0, "name": "Ropa"},
+        {"id": 183, "parent": 0, "name": "ropa"},
+        {"id": 190, "parent": 184, "name": "Ropa &amp; Mujer"},
+    ])
+
+    assert index.get(0, "ROPA") == 183 # Collisions resolve to the lowest ID
+    assert index.category_path(190) == ["Ropa", "Ropa & Mujer"]
+    assert index.category_path(183) == ["ropa"]
+    assert index.category_path(999) is None
+
+    reloaded = CategoryIndex(path=index.path)
+    assert reloaded.load()
+    assert reloaded.category_path(190) == ["Ropa", "Ropa & Mujer"]
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Same budgets as `python benchmarks/bench_cold_start.py --main-budget-ms ... --manager-budget-ms ...`
+MAIN_IMPORT_BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "400"))
+MANAGER_IMPORT_BUDGET_MS = float(os.getenv("MANAGER_COLD_START_BUDGET_MS", "300"))
+
+
+def import_in_fresh_interpreter(module, lazy_modules):
+    """Returns (cumulative import time of module in ms, the lazy_modules it loaded)."""
+    check = f"import {module}, sys; print(','.join(m for m in {lazy_modules!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", check], cwd=REPO_DIR,
+                            capture_output=True, text=True, check=True)
+
+    # -X importtime lines: "import time: <self us> | <cumulative us> | <module>"
+    cumulative_us = next(int(line.split("|")[1]) for line in result.stderr.splitlines()
+                         if line.startswith("import time:") and line.split("|")[-1].strip() == module)
+    return cumulative_us / 1000, [name for name in result.stdout.strip().split(",") if name]
+
+
+def test_import_main_stays_within_budget_and_skips_lazy_modules():
+    import_ms, loaded = import_in_fresh_interpreter("main", ("selenium", "deep_translator", "faker"))
+    assert import_ms < MAIN_IMPORT_BUDGET_MS
+    assert loaded == []
+
+
+def test_import_woocommerce_manager_stays_within_budget_and_skips_lazy_modules():
+    import_ms, loaded = import_in_fresh_interpreter("woocommerce_manager", ("selenium", "numpy", "faker"))
+    assert import_ms < MANAGER_IMPORT_BUDGET_MS
+    assert loaded == []
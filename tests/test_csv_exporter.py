@@ -0,0 +1,14 @@
+from csv_exporter import WooCommerceCsvExporter
+
+
+def test_variation_attribute_values_are_escaped_like_the_parent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # No category index here: only Shein categories are exported
+    scraped = {"product_name": "Vestido", "sku": "sw123", "shein_price": 10.0, "color": "Negro, rojo",
+               "shein_categories": ["Vestidos"], "image_urls": []}
+
+    with WooCommerceCsvExporter(str(tmp_path / "products.csv")) as exporter:
+        parent_row, variation_row = exporter.build_rows(scraped, ["38,5"], "20", "9")
+
+    assert parent_row["Attribute 1 value(s)"] == variation_row["Attribute 1 value(s)"] == "38\\,5"
+    assert parent_row["Attribute 2 value(s)"] == variation_row["Attribute 2 value(s)"] == "Negro\\, rojo"
+    assert variation_row["Parent"] == "sw123"
@@ -0,0 +1,88 @@
+import json
+import time
+
+import config
+from job_journal import JobJournal
+from main import upload_product
+from product_index import ProductIndex
+
+STORE = {"name": "test", "gender_categories": {"1": {"label": "Mujer", "initial": [10], "parent": 10}},
+         "fallback_categories": {"label": "Uncategorized", "initial": [1], "parent": 0}}
+SCRAPED = {"product_name": "Vestido", "sku": "sw1", "shein_price": 10.0, "color": "Negro",
+           "shein_categories": ["Vestidos"], "image_urls": ["https://img.test/1.webp"], "description": "Largo midi"}
+URL = "https://shein.test/Vestido-p-123-cat-1.html"
+
+
+class FlakyManager:
+    """WooCommerceManager stand-in whose variations stage loses the XL size until fixed."""
+
+    def __init__(self, product_index):
+        self.store = STORE
+        self.store_name = STORE["name"]
+        self.attr_id_color, self.attr_id_size = 1, 2
+        self.product_index = product_index
+        self.calls = []
+        self.failing_sizes = {"XL"}
+
+    def get_or_create_categories(self, **kwargs):
+        self.calls.append("categories")
+        return [{"id": 10}, {"id": 11}]
+
+    def upload_images(self, image_urls):
+        self.calls.append("images")
+        return {}
+
+    def seed_product_index(self):
+        pass
+
+    def create_variable_product(self, **product_fields):
+        self.calls.append("create")
+        return {"id": 500, "permalink": "https://store.test/p/500"}
+
+    def update_variable_product(self, product_id, **product_fields):
+        self.calls.append("update")
+        return {"id": product_id, "permalink": "https://store.test/p/500"}
+
+    def sync_product_variations(self, product_id, base_sku, price, sizes, featured_image_url, color=None,
+                                existing_variations=None, featured_image_id=None):
+        self.calls.append(("variations", tuple(sizes)))
+        return [{"variation_id": 600 + number, "sku": f"{base_sku}-raic-{size}", "size": size, "color": color,
+                 "regular_price": price}
+                for number, size in enumerate(sizes) if size not in self.failing_sizes]
+
+
+def test_resume_after_a_failed_variations_stage(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "REPRICING_RULES_PATH", str(tmp_path / "no_rules.json"))
+    manager = FlakyManager(ProductIndex(path=str(tmp_path / "products.sqlite3")))
+    journal = JobJournal("job1", directory=str(tmp_path))
+
+    upload_product(manager, SCRAPED, [], ["S", "XL"], "20", "1", URL, journal)
+
+    # The product stage is journaled, the partial variations stage is not
+    resumed = JobJournal("job1", directory=str(tmp_path))
+    assert resumed.has("product") and not resumed.has("variations")
+    assert manager.product_index.find_product(sku="sw1")["content_hash"] == ""
+
+    manager.failing_sizes = set()
+    manager.calls = []
+    result = upload_product(manager, SCRAPED, [], ["S", "XL"], "20", "1", URL,
+                            JobJournal("job1", directory=str(tmp_path)))
+
+    # Categories, images and the product come from the journal: only the variations are sent again
+    assert manager.calls == [("variations", ("S", "XL"))]
+    assert result["product_id"] == 500 and len(result["variation_ids"]) == 2
+    assert manager.product_index.find_product(sku="sw1")["content_hash"] != ""
+
+
+def test_stale_journaled_scrape_is_dropped(tmp_path):
+    journal = JobJournal("job2", directory=str(tmp_path))
+    journal.record("scrape", {"details": SCRAPED, "reviews": []})
+    journal.record("categories", [{"id": 10}])
+    stored = json.loads((tmp_path / "job2.json").read_text())
+    stored["stages"]["scrape"]["completed_at"] = time.time() - 7200
+    (tmp_path / "job2.json").write_text(json.dumps(stored))
+
+    assert JobJournal("job2", directory=str(tmp_path), scrape_max_age=86400).has("scrape")
+    resumed = JobJournal("job2", directory=str(tmp_path), scrape_max_age=3600)
+    assert not resumed.has("scrape")
+    assert resumed.get("categories") == [{"id": 10}] # Upload stages still resume
@@ -0,0 +1,57 @@
+from main import create_or_update_product
+from product_index import ProductIndex
+
+
+def test_record_variations_upserts_by_variation_id_and_sku(tmp_path):
+    index = ProductIndex(path=str(tmp_path / "products.sqlite3"))
+    index.record_variations(7, [
+        {"variation_id": 70, "sku": "sw1-raic-NEGROS", "size": "S", "regular_price": "12.00", "stock_status": "instock"},
+        {"variation_id": 71, "sku": "sw1-raic-NEGROM", "size": "M", "regular_price": "12.00"},
+    ])
+    # Same variation ID: fields given as None keep their stored value
+    index.record_variations(7, [{"variation_id": 70, "sku": "sw1-raic-NEGROS", "regular_price": "14.00"}])
+    # The M variation was deleted and recreated in the store under a new ID
+    index.record_variations(7, [{"variation_id": 75, "sku": "sw1-raic-NEGROM", "size": "M", "regular_price": "14.00"}])
+
+    variations = index.get_variations(7)
+    assert {sku: variation["variation_id"] for sku, variation in variations.items()} == {
+        "sw1-raic-NEGROS": 70, "sw1-raic-NEGROM": 75}
+    assert variations["sw1-raic-NEGROS"]["regular_price"] == "14.00"
+    assert variations["sw1-raic-NEGROS"]["stock_status"] == "instock"
+    index.close()
+
+
+class FakeManager:
+    """Stands in for WooCommerceManager: records product API calls against a real product index."""
+
+    def __init__(self, product_index):
+        self.product_index = product_index
+        self.calls = []
+
+    def seed_product_index(self):
+        pass
+
+    def create_variable_product(self, **product_fields):
+        self.calls.append("create")
+        return {"id": 500, "permalink": "https://store.test/p/500"}
+
+    def update_variable_product(self, product_id, **product_fields):
+        self.calls.append("update")
+        return {"id": product_id, "permalink": "https://store.test/p/500"}
+
+
+def test_product_with_unchanged_content_hash_is_skipped(tmp_path):
+    manager = FakeManager(ProductIndex(path=str(tmp_path / "products.sqlite3")))
+    scraped = {"sku": "sw1", "product_name": "Vestido"}
+    url = "https://shein.test/Vestido-p-123-cat-1.html"
+
+    created = create_or_update_product(manager, {}, "hash-1", scraped, url)
+    assert created["action"] == "created"
+    # A new product is indexed without a hash until its variations complete, so it is not skipped yet
+    assert create_or_update_product(manager, {}, "hash-1", scraped, url)["action"] == "updated"
+
+    manager.product_index.record_product("sw1", 500, content_hash="hash-1")
+    skipped = create_or_update_product(manager, {}, "hash-1", scraped, url)
+    assert skipped == {"product_id": 500, "permalink": "N/A", "action": "unchanged"}
+    assert create_or_update_product(manager, {}, "hash-2", scraped, url)["action"] == "updated"
+    assert manager.calls == ["create", "update", "update"]
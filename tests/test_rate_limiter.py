@@ -0,0 +1,40 @@
+import time
+
+from rate_limiter import AdaptiveRateLimiter
+
+
+def make_limiter():
+    return AdaptiveRateLimiter(max_rate=100, min_rate=1, max_concurrency=8, increase_step=1, latency_threshold=2.0,
+                               window_seconds=1.0)
+
+
+def test_burst_of_throttled_calls_halves_the_rate_once():
+    limiter = make_limiter()
+    for _ in range(8):
+        limiter.acquire()
+    for _ in range(8): # Every in-flight call comes back 429
+        limiter.release(status_code=429, retry_after=0)
+
+    assert limiter.rate == 50
+
+    limiter._last_decrease -= 1.0 # Next window
+    limiter.acquire()
+    limiter.release(status_code=429, retry_after=0)
+    assert limiter.rate == 25
+
+
+def test_increase_is_per_window_and_latency_is_per_request_class():
+    limiter = make_limiter()
+    limiter.rate = 50 # Fast enough for every call to fit in one window
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(status_code=200, latency=0.01, request_class="GET products")
+    assert limiter.rate == 51 # One additive step per window, not per call
+
+    # Batch POSTs are much slower than GETs, but only compared with earlier batch POSTs
+    limiter._last_increase -= 1.0
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(status_code=200, latency=2.0, request_class="POST products/batch")
+    assert limiter.rate == 52
+    assert time.monotonic() - limiter._last_decrease > 1.0 # Never decreased
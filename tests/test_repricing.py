@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+
+import config
+import main
+from product_index import ProductIndex
+from repricing import PricingRules, apply_repricing, plan_repricing
+
+
+def test_bands_pick_the_first_band_covering_the_price():
+    rules = PricingRules({"bands": [{"up_to": 10, "markup": 60}, {"up_to": 30, "markup": 40}]})
+
+    _, markups = rules.evaluate([5, 10, 10.01, 30, 50], [np.nan, np.nan, np.nan, np.nan, 10], [[]] * 5)
+
+    # up_to is inclusive; above every band the product keeps its own markup
+    assert markups.tolist() == [60, 60, 40, 40, 10]
+
+
+def test_first_matching_category_rule_wins_over_bands():
+    rules = PricingRules({
+        "bands": [{"markup": 25}],
+        "categories": [{"ids": [1], "markup": 80}, {"ids": [1, 2], "markup": 35}],
+    })
+
+    _, markups = rules.evaluate([10, 10, 10, 10], [0, 0, 0, 0], [[1], [2], [2, 1], [3]])
+
+    assert markups.tolist() == [80, 35, 80, 25]
+
+
+def test_minimum_margin_raises_low_markup_prices():
+    rules = PricingRules({"exchange_rate": 2, "min_margin": 3, "min_margin_percent": 15})
+
+    prices, _ = rules.evaluate([5, 50, 50], [0, 0, 40], [[]] * 3)
+
+    # Costs 10, 100, 100: at least cost + 3 and cost * 1.15
+    assert prices.tolist() == [13, 115, 140]
+
+
+def test_rounding_goes_up_to_the_next_price_ending():
+    cents = PricingRules({"rounding": {"step": 1, "ending": 0.99}})
+    thousands = PricingRules({"rounding": {"step": 1000, "ending": 900}})
+
+    assert cents.evaluate([12, 12.99, 13.001], [0, 0, 0], [[]] * 3)[0].tolist() == [12.99, 12.99, 13.99]
+    assert thousands.evaluate([49000, 49900, 49901], [0, 0, 0], [[]] * 3)[0].tolist() == [49900, 49900, 50900]
+    assert cents.price_for(12, "10") == "13.99"
+
+
+class FakeManager:
+    def __init__(self, product_index):
+        self.product_index = product_index
+        self.batches = []
+
+    def send_batch(self, endpoint, action, items):
+        self.batches.append((endpoint, action, items))
+        return [(item, {"id": item["id"], "regular_price": item["regular_price"]}) for item in items]
+
+
+def test_plan_and_apply_only_send_changed_variations(tmp_path):
+    index = ProductIndex(path=str(tmp_path / "products.sqlite3"))
+    index.record_product("sw1", 1, shein_price=10, markup="20", categories=[{"id": 5}])
+    index.record_product("sw2", 2, shein_price=20, markup="20", categories=[{"id": 6}])
+    index.record_variations(1, [{"variation_id": 11, "sku": "sw1-raic-S", "regular_price": "15"},
+                                {"variation_id": 12, "sku": "sw1-raic-M", "regular_price": "12.0"}])
+    index.record_variations(2, [{"variation_id": 21, "sku": "sw2-raic-S", "regular_price": "24.00"}])
+    rules = PricingRules({"categories": [{"ids": [5], "markup": 50}]})
+
+    changes = plan_repricing(index, rules)
+
+    # sw1 moves to 15.00 (only its M variation differs); sw2 keeps 24.00
+    assert [(change["sku"], change["new_price"], [update["id"] for update in change["updates"]])
+            for change in changes] == [("sw1", "15.00", [12])]
+
+    manager = FakeManager(index)
+    assert apply_repricing(manager, changes, workers=1) == (1, 0)
+    assert manager.batches[0][:2] == ("products/1/variations/batch", "update")
+    assert index.get_variations(1)["sw1-raic-M"]["regular_price"] == "15.00"
+    assert index.find_product(sku="sw1")["regular_price"] == "15.00"
+    assert plan_repricing(index, rules) == []
+
+
+def test_store_price_follows_the_rules_file_when_present(tmp_path, monkeypatch):
+    rules_path = tmp_path / "repricing_rules.json"
+    monkeypatch.setattr(config, "REPRICING_RULES_PATH", str(rules_path))
+    assert main.calculate_store_price(10.0, "20") == "12.0" # No rules file: the typed markup
+
+    rules_path.write_text(json.dumps({"bands": [{"markup": 50}], "categories": [{"ids": [7], "markup": 100}]}))
+    assert main.calculate_store_price(10.0, "20") == "15.00"
+    assert main.calculate_store_price(10.0, "20", category_ids=[7]) == "20.00"
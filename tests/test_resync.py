@@ -0,0 +1,17 @@
+from resync import diff_variations
+
+
+def test_diff_variations_compares_prices_as_amounts_and_updates_stock():
+    indexed_variations = {
+        "SKU-raic-S": {"variation_id": 1, "sku": "SKU-raic-S", "size": "S", "regular_price": "12", "stock_status": "instock"},
+        "SKU-raic-M": {"variation_id": 2, "sku": "SKU-raic-M", "size": "m ", "regular_price": "12.0",
+                       "stock_status": "instock"},
+        "SKU-raic-L": {"variation_id": 3, "sku": "SKU-raic-L", "size": "L", "regular_price": None, "stock_status": None},
+    }
+
+    updates = diff_variations(indexed_variations, "12.00", {"S": True, "M": False})
+
+    assert updates == [
+        {"stock_status": "outofstock", "id": 2, "sku": "SKU-raic-M"},
+        {"regular_price": "12.00", "id": 3, "sku": "SKU-raic-L"},
+    ]
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from http_scraper import SheinHttpScraper
+from shein_parsing import extract_embedded_json, parse_price_and_stock_json, parse_product_html, parse_review_texts
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "shein_product.html")
+PRODUCT_URL = "https://es.shein.com/SHEIN-Frenchy-Floral-Halter-Dress-p-16829437-cat-1727.html"
+
+
+@pytest.fixture
+def product_html():
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as fixture_file:
+        return fixture_file.read()
+
+
+def test_parse_product_html(product_html):
+    details = parse_product_html(product_html)
+
+    assert details["product_name"] == "SHEIN Frenchy Vestido midi de cuello halter con estampado floral"
+    assert details["sku"] == "sz2305127682164373"
+    assert details["shein_price"] == 14.99 # The sale price, not the retail price
+    assert details["shein_categories"] == ["Ropa de Mujer", "Vestidos", "Monos", "Vestidos Midi"]
+    assert details["image_urls"] == [
+        "https://img.ltwebstatic.com/images3_pi/2023/05/12/1683865551a3d5c21b8d0e2f5c3b8f6e8c1b7f3e92_405x552.webp",
+        "https://img.ltwebstatic.com/images3_pi/2023/05/12/16838655528f6c2a4e1e9d7b5a3c2f1e0d9c8b7a61_405x552.webp",
+        "https://img.ltwebstatic.com/images3_pi/2023/05/12/1683865553c7b6a5d4e3f2a1b0c9d8e7f6a5b4c3d2.webp",
+    ]
+    assert details["color"] == "Multicolor"
+    assert details["description"].splitlines()[0] == "Color: Multicolor"
+    assert "Composición: 100% Poliéster" in details["description"]
+
+
+def test_parse_price_and_stock(product_html):
+    result = parse_price_and_stock_json(extract_embedded_json(product_html))
+
+    assert result["shein_price"] == 14.99
+    assert result["size_stock"] == {"XS": False, "S": True, "M": True, "L": True, "XL": False}
+
+
+def test_parse_review_texts(product_html):
+    assert parse_review_texts(extract_embedded_json(product_html)) == [
+        "Muy bonito, la talla es correcta.",
+        "La tela es un poco fina pero queda bien.",
+    ]
+
+
+def test_parse_product_html_without_embedded_json():
+    with pytest.raises(ValueError):
+        parse_product_html("<html><body><h1>Access denied</h1></body></html>")
+
+
+def test_http_scraper_uses_embedded_json(product_html):
+    class FakeResponse:
+        status_code = 200
+        text = product_html
+
+        def raise_for_status(self):
+            pass
+
+    class FakeSession:
+        def get(self, url, timeout=None):
+            return FakeResponse()
+
+    http_scraper = SheinHttpScraper(session=FakeSession())
+    http_scraper.load_page(PRODUCT_URL)
+    details = http_scraper.extract_product_details()
+
+    assert http_scraper.fallback_scraper is None # Parsed without launching a browser
+    assert details["sku"] == "sz2305127682164373"
+    assert details["shein_price"] == 14.99
+    assert http_scraper.extract_price_and_stock()["size_stock"]["M"] is True
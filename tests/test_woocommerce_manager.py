@@ -0,0 +1,45 @@
+from woocommerce_manager import WooCommerceManager
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeBatchClient:
+    """Answers each */batch POST with the next canned response."""
+
+    def __init__(self, *payloads):
+        self.payloads = list(payloads)
+        self.requests = []
+
+    def post(self, endpoint, data):
+        self.requests.append((endpoint, data))
+        return FakeResponse(self.payloads.pop(0))
+
+
+def manager_with_client(client, batch_size=100):
+    manager = WooCommerceManager.__new__(WooCommerceManager) # No store registry or indexes needed
+    manager.wcapi = client
+    manager.batch_size = batch_size
+    return manager
+
+
+def test_send_batch_fails_items_without_a_result():
+    items = [{"sku": f"SKU-raic-{size}"} for size in ("S", "M", "L", "XL")]
+    client = FakeBatchClient(
+        {"create": [{"id": 11}, {"id": 0, "error": {"code": "invalid", "message": "Bad SKU"}}]},
+        {"create": [{"id": 13}]},
+    )
+
+    outcomes = manager_with_client(client, batch_size=2).send_batch("products/1/variations/batch", "create", items)
+
+    assert [result["id"] if result else None for _, result in outcomes] == [11, None, 13, None]
+    assert [item for item, _ in outcomes] == items
+    assert [len(data["create"]) for _, data in client.requests] == [2, 2]
@@ -0,0 +1,36 @@
+import time
+
+
+def translate_reviews(review_texts, target_language='es'):
+    """
+    Translates raw review texts into Spanish (or target_language).
+    Reviews that fail to translate are kept with a '[Translation Error]' mark.
+    """
+    from deep_translator import GoogleTranslator # Imported here so HTTP-only paths don't need it loaded upfront
+
+    reviews_list = []
+    translator = GoogleTranslator(source='auto', target=target_language)
+
+    for i, review_text in enumerate(review_texts):
+        # Basic cleaning of review text (optional, can be expanded)
+        review_text = (review_text or "").replace("\n", " ").strip()
+        if not review_text:
+            print(f"Review {i+1} has no text, skipping.")
+            continue
+        try:
+            time.sleep(1) # Sleep before translation to avoid rate limiting
+            translated_text = translator.translate(review_text)
+            reviews_list.append(translated_text)
+            print(f"Review {i+1} translated: {translated_text[:50]}...") # Print first 50 chars
+        except Exception as e_review:
+            print(f"Error processing or translating review {i+1}: {e_review}")
+            reviews_list.append(f"[Translation Error] {review_text}") # Add original with error mark
+
+        if i >= 4 and not reviews_list: # If first 5 reviews failed, likely a broader issue
+            print("First 5 reviews failed to process. Aborting further review extraction.")
+            break
+
+    if not reviews_list:
+        print("No reviews were extracted or translated.")
+
+    return reviews_list
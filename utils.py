@@ -1,11 +1,21 @@
-from faker import Faker
 from config import list_of_domains
 
-fake = Faker()
-fakename = Faker('es_CO')
+_fakers = {} # Faker instances, created on first use (building a Faker loads its locale providers)
+
+
+def __getattr__(name):
+    """Creates the module-level `fake` and `fakename` Faker instances on first access."""
+    if name not in ("fake", "fakename"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name not in _fakers:
+        from faker import Faker
+        _fakers[name] = Faker() if name == "fake" else Faker('es_CO')
+    return _fakers[name]
+
 
 def fakemail():
     """Generates a fake email address using a random domain from list_of_domains."""
+    fake = __getattr__("fake")
     domain = fake.random_element(elements=list_of_domains)
     # Ensure the domain doesn't have a trailing slash for email generation
     if domain.endswith('/'):
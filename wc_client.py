@@ -0,0 +1,164 @@
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+from metrics import endpoint_template, metrics
+from rate_limiter import get_shared_rate_limiter, parse_retry_after
+
+# 5xx answers worth retrying; POSTs are only retried on connection errors (the request never
+# reached the store), so a timed-out product/variation POST is never sent twice
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+RETRY_METHODS = frozenset({"GET", "PUT", "DELETE", "HEAD", "OPTIONS"})
+
+
+class WooCommerceClient:
+    """
+    WooCommerce REST client backed by one persistent requests session: keep-alive connections
+    from a configurable pool, and HTTP retries with exponential backoff on connection errors and 5xx.
+    Every call goes through an AdaptiveRateLimiter shared by all clients of the same store,
+    and 429 answers are retried after Retry-After.
+    Exposes the same get/post/put/delete/options methods as woocommerce.API.
+    """
+
+    def __init__(self, url, consumer_key, consumer_secret, version="wc/v3", timeout=None,
+                 pool_size=None, max_retries=None, backoff_factor=None, query_string_auth=None,
+                 rate_limiter=None):
+        self.url = url.rstrip("/")
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter(self.url)
+        self.version = version
+        self.timeout = timeout or config.WC_TIMEOUT
+        self.pool_size = pool_size or config.WC_POOL_SIZE
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.query_string_auth = config.WC_QUERY_STRING_AUTH if query_string_auth is None else query_string_auth
+
+        max_retries = config.WC_MAX_RETRIES if max_retries is None else max_retries
+        retry_policy = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=config.WC_BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False, # Hand the last 5xx response back so callers can raise_for_status()
+        )
+        # pool_block makes extra threads wait for a free connection instead of opening throwaway ones
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry_policy, pool_block=True)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json", "User-Agent": "shein-woocommerce-importer"})
+        if not self.query_string_auth:
+            self.session.auth = (consumer_key, consumer_secret)
+
+    def build_url(self, endpoint, version=None):
+        return f"{self.url}/wp-json/{version or self.version}/{endpoint.lstrip('/')}"
+
+    def request(self, method, endpoint, data=None, params=None, version=None, raw_data=None, **kwargs):
+        """
+        Sends one request through the pooled session and returns the requests.Response.
+        data is sent as JSON; raw_data (bytes) is sent as-is, e.g. a file for the media endpoint.
+        version overrides the API namespace (e.g. "wp/v2" for the media endpoint).
+        """
+        params = dict(params or {})
+        if self.query_string_auth:
+            params.update(consumer_key=self.consumer_key, consumer_secret=self.consumer_secret)
+        timeout = kwargs.pop("timeout", self.timeout)
+        endpoint_label = endpoint_template(endpoint)
+
+        for attempt in range(config.WC_MAX_THROTTLE_RETRIES + 1):
+            self.rate_limiter.acquire()
+            start_time = time.monotonic()
+            response = None
+            try:
+                with metrics.span("wc.http_request", method=method, endpoint=endpoint_label):
+                    response = self.session.request(
+                        method,
+                        self.build_url(endpoint, version),
+                        params=params,
+                        json=data,
+                        data=raw_data,
+                        timeout=timeout,
+                        **kwargs
+                    )
+            finally:
+                self.rate_limiter.release(
+                    status_code=response.status_code if response is not None else None,
+                    latency=time.monotonic() - start_time if response is not None else None,
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")) if response is not None else None,
+                    request_class=f"{method} {endpoint_label}",
+                )
+                metrics.incr("wc_http_requests", method=method, endpoint=endpoint_label,
+                             status=response.status_code if response is not None else "error")
+            # Retries done transparently by the urllib3 Retry policy (5xx, connection errors)
+            transport_retries = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+            if transport_retries:
+                metrics.incr("wc_http_retries", len(transport_retries), method=method, endpoint=endpoint_label, reason="transport")
+            if response.status_code != 429:
+                return response
+            if attempt == config.WC_MAX_THROTTLE_RETRIES:
+                print(f"{method} {endpoint} throttled (HTTP 429), giving up after {attempt} retries.")
+                break
+            metrics.incr("wc_http_retries", method=method, endpoint=endpoint_label, reason="throttled")
+            # 429 means the request was rejected before processing, so it is safe to resend
+            print(f"{method} {endpoint} throttled (HTTP 429), retry {attempt + 1}/{config.WC_MAX_THROTTLE_RETRIES}.")
+        return response
+
+    def get(self, endpoint, **kwargs):
+        return self.request("GET", endpoint, **kwargs)
+
+    def post(self, endpoint, data, **kwargs):
+        return self.request("POST", endpoint, data=data, **kwargs)
+
+    def put(self, endpoint, data, **kwargs):
+        return self.request("PUT", endpoint, data=data, **kwargs)
+
+    def delete(self, endpoint, **kwargs):
+        return self.request("DELETE", endpoint, **kwargs)
+
+    def options(self, endpoint, **kwargs):
+        return self.request("OPTIONS", endpoint, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncWooCommerceClient:
+    """
+    asyncio front-end for WooCommerceClient. Calls run on a thread pool sized to the
+    connection pool, so up to pool_size requests are in flight at once over keep-alive connections.
+    """
+
+    def __init__(self, client, max_concurrency=None):
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency or client.pool_size,
+                                            thread_name_prefix="wc-async")
+
+    async def request(self, method, endpoint, **kwargs):
+        import asyncio # Only asyncio callers pay for importing it
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.client.request, method, endpoint, **kwargs)
+        )
+
+    async def get(self, endpoint, **kwargs):
+        return await self.request("GET", endpoint, **kwargs)
+
+    async def post(self, endpoint, data, **kwargs):
+        return await self.request("POST", endpoint, data=data, **kwargs)
+
+    async def put(self, endpoint, data, **kwargs):
+        return await self.request("PUT", endpoint, data=data, **kwargs)
+
+    async def delete(self, endpoint, **kwargs):
+        return await self.request("DELETE", endpoint, **kwargs)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
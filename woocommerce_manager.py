@@ -1,92 +1,180 @@
-from woocommerce import API
 import config
-import time
+import threading
+from category_index import CategoryIndex
+from metrics import metrics
+from product_index import ProductIndex
+from stores import get_store
+from wc_client import WooCommerceClient
 # utils will be imported within add_reviews to avoid circular dependency issues
 # if utils also ends up importing this manager or config directly/indirectly at module level.
 
+
+def variation_sku(base_sku, size_option, color=None):
+    """The -raic- SKU of a size/color variation, e.g. "sw2301-raic-NEGROM" ("UNICO" when there is no color)."""
+    size_sku_part = size_option.replace(" ", "").upper()[:5] # Max 5 chars for size SKU part
+    if color and color.strip():
+        color_sku_part = color.replace(" ", "").upper()[:5] # Max 5 chars for color SKU part
+        return f"{base_sku}-raic-{color_sku_part}{size_sku_part}"
+    return f"{base_sku}-raic-UNICO{size_sku_part}" # "UNICO" for products without color choice
+
+
 class WooCommerceManager:
-    def __init__(self):
+    def __init__(self, store=None):
         """
-        Initializes the WooCommerce API client.
+        Initializes the pooled WooCommerce API client for a store of the registry (see stores.py):
+        a store name, a store dict, or None for config.DEFAULT_STORE.
         """
-        self.wcapi = API(
-            url="https://pjwaterfilters.com/",  # TODO: Consider making this a config value
-            consumer_key=config.WC_CONSUMER_KEY,
-            consumer_secret=config.WC_CONSUMER_SECRET,
-            wp_api=True,
+        self.store = get_store(store)
+        self.store_name = self.store["name"]
+        self.wcapi = WooCommerceClient(
+            url=self.store["url"],
+            consumer_key=self.store["consumer_key"],
+            consumer_secret=self.store["consumer_secret"],
             version="wc/v3",
-            timeout=120 # Increased timeout
-        )
-        # Attribute IDs - can be made configurable if they change
-        self.attr_id_color = 8 # Assuming 8 is for "Color"
-        self.attr_id_size = 7  # Assuming 7 is for "Talla" (Size)
+        ) # Persistent keep-alive session with retries, pool size/timeout from config
+        # Attribute IDs of "Color" and "Talla" (Size) in this store
+        self.attr_id_color = self.store["attr_id_color"]
+        self.attr_id_size = self.store["attr_id_size"]
+        # Max items per */batch request (WooCommerce default limit is 100)
+        self.batch_size = config.WC_BATCH_SIZE
+        # Persistent (parent_id, name) -> ID index shared by every product handled by this manager
+        self.category_index = CategoryIndex(path=self.store["category_index_path"])
+        # Shein SKU/URL -> WooCommerce product/variation IDs, used to update products instead of duplicating them
+        self.product_index = ProductIndex(path=self.store["product_index_path"])
+        self._media_uploader = None # Created on first use, see upload_images
+        # Serializes category lookups/creation when the manager is shared by several upload workers
+        self._category_lock = threading.Lock()
 
-    def get_or_create_categories(self, shein_categories, dynamic_parent_id, initial_category_ids):
+    @metrics.timed("woocommerce.upload_images")
+    def upload_images(self, image_urls):
         """
-        Fetches existing categories or creates new ones in WooCommerce.
-        Returns a list of category ID dictionaries for the product.
+        Uploads images once to the WordPress media library and returns {image URL: media ID}.
+        Returns an empty mapping (images stay remote srcs) when media upload is not configured.
         """
-        product_category_ids = list(initial_category_ids)  # Start with pre-defined category IDs
+        if not self.store["upload_media"]:
+            return {}
+        if self._media_uploader is None:
+            from media_uploader import MediaUploader
+            self._media_uploader = MediaUploader(
+                store_url=self.store["url"], username=self.store["wp_username"],
+                app_password=self.store["wp_app_password"], index_path=self.store["media_index_path"])
+        return self._media_uploader.upload_images(image_urls)
 
+    def get_all_pages(self, endpoint, params=None):
+        """
+        Fetches every page of a paginated collection endpoint (following X-WP-TotalPages).
+        """
+        items = []
+        page = 1
+        while True:
+            page_params = dict(params or {}, per_page=100, page=page)
+            response = self.wcapi.get(endpoint, params=page_params)
+            response.raise_for_status()
+            page_items = response.json()
+            items.extend(page_items)
+            total_pages = int(response.headers.get("X-WP-TotalPages", 1))
+            if not page_items or page >= total_pages:
+                break
+            page += 1
+        return items
+
+    @metrics.timed("woocommerce.load_category_index")
+    def load_category_index(self, force_refresh=False):
+        """
+        Makes sure the category index is loaded, fetching all category pages from
+        WooCommerce only when the on-disk index is missing or expired.
+        Returns False if the categories could not be fetched.
+        """
+        if not force_refresh and self.category_index.load():
+            return True
         try:
-            existing_wc_categories_response = self.wcapi.get("products/categories", params={"per_page": 100, "orderby": "id", "order":"asc"})
-            existing_wc_categories_response.raise_for_status() # Check for HTTP errors
-            existing_wc_categories = existing_wc_categories_response.json()
+            all_categories = self.get_all_pages("products/categories", params={"orderby": "id", "order": "asc"})
         except Exception as e:
             print(f"Error fetching WooCommerce categories: {e}")
-            return product_category_ids # Return initial IDs if fetch fails
+            return False
+        self.category_index.replace_all(all_categories)
+        print(f"Category index rebuilt with {len(all_categories)} WooCommerce categories.")
+        return True
 
-        wc_categories_map = {cat['name'].lower(): cat['id'] for cat in existing_wc_categories}
-        
-        last_created_parent_id = dynamic_parent_id
+    @metrics.timed("woocommerce.get_or_create_categories")
+    def get_or_create_categories(self, shein_categories, dynamic_parent_id, initial_category_ids):
+        """
+        Looks up categories in the category index or creates new ones in WooCommerce.
+        Each Shein category is resolved under the previous one, starting at dynamic_parent_id.
+        Returns a list of category ID dictionaries for the product.
+        """
+        return self.plan_categories([(shein_categories, dynamic_parent_id, initial_category_ids)])[0]
 
-        for shein_cat_name in shein_categories:
-            if not shein_cat_name or not shein_cat_name.strip(): # Skip empty category names
-                continue
+    @metrics.timed("woocommerce.plan_categories")
+    def plan_categories(self, category_requests):
+        """
+        Resolves the categories of a whole batch of products at once. category_requests holds one
+        (shein_categories, dynamic_parent_id, initial_category_ids) tuple per product. Categories
+        missing from the index are created level by level, one products/categories/batch call per
+        breadcrumb depth for the whole batch, so shared categories are created only once.
+        Returns the list of category ID dictionaries of each product, in request order.
+        """
+        with self._category_lock:
+            product_category_ids = [list(initial_category_ids) for _, _, initial_category_ids in category_requests]
+            if not self.load_category_index():
+                return product_category_ids # Initial IDs only if the categories cannot be fetched
 
-            normalized_shein_cat_name = shein_cat_name.strip().lower()
+            breadcrumbs = [[name.strip() for name in shein_categories if name and name.strip()]
+                           for shein_categories, _, _ in category_requests]
+            # Parent under which each product's next breadcrumb level is resolved. When a category
+            # cannot be created, the next level stays under the last known good parent.
+            parent_ids = [dynamic_parent_id for _, dynamic_parent_id, _ in category_requests]
 
-            if normalized_shein_cat_name in wc_categories_map:
-                cat_id = wc_categories_map[normalized_shein_cat_name]
-                if {'id': cat_id} not in product_category_ids:
-                    product_category_ids.append({'id': cat_id})
-                last_created_parent_id = cat_id # Use this existing category as parent for next potential sub-category
-            else:
-                # Category does not exist, create it
-                print(f"Creating category: '{shein_cat_name}' with parent ID: {last_created_parent_id}")
-                category_data = {
-                    "name": shein_cat_name.strip(),
-                    "parent": last_created_parent_id
-                }
-                try:
-                    created_category_response = self.wcapi.post("products/categories", category_data)
-                    created_category_response.raise_for_status()
-                    created_category = created_category_response.json()
-                    new_cat_id = created_category['id']
-                    print(f"Successfully created category '{shein_cat_name}' with ID {new_cat_id}.")
-                    if {'id': new_cat_id} not in product_category_ids:
-                        product_category_ids.append({'id': new_cat_id})
-                    wc_categories_map[normalized_shein_cat_name] = new_cat_id # Add to map for future reference
-                    last_created_parent_id = new_cat_id # New category becomes parent for the next one in the list
-                    time.sleep(1) # Brief pause after creating a category
-                except Exception as e:
-                    print(f"Error creating category '{shein_cat_name}': {e}")
-                    # If creation fails, subsequent categories will use the last known good parent_id
-        
-        # Remove potential duplicates that might have been added if initial_category_ids contained some overlap
-        # Convert list of dicts to list of tuples for set operation, then back to list of dicts
-        unique_category_ids_tuples = set(tuple(d.items()) for d in product_category_ids)
-        product_category_ids = [dict(t) for t in unique_category_ids_tuples]
-        
-        return product_category_ids
+            for depth in range(max((len(names) for names in breadcrumbs), default=0)):
+                missing_categories = {}
+                for names, parent_id in zip(breadcrumbs, parent_ids):
+                    if depth < len(names) and self.category_index.get(parent_id, names[depth]) is None:
+                        key = (parent_id, self.category_index.normalize_name(names[depth]))
+                        missing_categories.setdefault(key, {"name": names[depth], "parent": parent_id})
+                if missing_categories:
+                    self._create_categories(list(missing_categories.values()))
+
+                for request_number, (names, parent_id) in enumerate(zip(breadcrumbs, parent_ids)):
+                    if depth >= len(names):
+                        continue
+                    cat_id = self.category_index.get(parent_id, names[depth])
+                    if cat_id is None:
+                        continue
+                    product_category_ids[request_number].append({'id': cat_id})
+                    parent_ids[request_number] = cat_id # This category is the parent of the next level
 
-    def create_variable_product(self, name, short_description, description, category_ids, image_urls, attributes_data):
+        # Remove duplicates (initial IDs may overlap with the resolved ones), keeping the order
+        return [[{'id': cat_id} for cat_id in dict.fromkeys(category['id'] for category in category_ids)]
+                for category_ids in product_category_ids]
+
+    def _create_categories(self, categories):
         """
-        Creates a variable product in WooCommerce.
+        Creates {"name", "parent"} categories through products/categories/batch and adds them to the index.
+        If some fail (e.g. created meanwhile by someone else), the index is reloaded from the store once.
         """
-        formatted_images = [{"src": url} for url in image_urls]
+        print(f"Creating {len(categories)} categories: "
+              + ", ".join(f"'{category['name']}' (parent {category['parent']})" for category in categories))
+        created_categories = []
+        failed_count = 0
+        for category_data, result in self.send_batch("products/categories/batch", "create", categories):
+            if result is None:
+                failed_count += 1
+                continue
+            created_categories.append((result["id"], category_data["parent"], category_data["name"]))
+        if created_categories:
+            self.category_index.add_many(created_categories) # Keep the index in sync
+            print(f"Successfully created {len(created_categories)} categories.")
+        if failed_count:
+            print(f"{failed_count} categories could not be created, reloading the category index.")
+            self.load_category_index(force_refresh=True)
+
+    def _build_product_data(self, name, short_description, description, category_ids, image_urls, attributes_data,
+                            image_media_ids=None):
+        # Images already in the media library are referenced by ID so WooCommerce doesn't sideload them again
+        image_media_ids = image_media_ids or {}
+        formatted_images = [{"id": image_media_ids[url]} if url in image_media_ids else {"src": url} for url in image_urls]
         
-        variable_product_data = {
+        return {
             "name": name,
             "type": "variable",
             "short_description": short_description,
@@ -96,6 +184,16 @@ class WooCommerceManager:
             "attributes": attributes_data,
             "status": "publish" # Or "draft" if preferred
         }
+
+    @metrics.timed("woocommerce.create_variable_product")
+    def create_variable_product(self, name, short_description, description, category_ids, image_urls, attributes_data,
+                                image_media_ids=None):
+        """
+        Creates a variable product in WooCommerce.
+        image_media_ids maps image URLs to media library IDs (see upload_images).
+        """
+        variable_product_data = self._build_product_data(
+            name, short_description, description, category_ids, image_urls, attributes_data, image_media_ids)
         
         print(f"Creating variable product: {name}")
         try:
@@ -113,57 +211,195 @@ class WooCommerceManager:
                     print(f"Error details: {e.response.text}")
             return None
 
-
-    def create_product_variations(self, product_id, base_sku, price, sizes, featured_image_url, color=None):
+    @metrics.timed("woocommerce.update_variable_product")
+    def update_variable_product(self, product_id, name, short_description, description, category_ids, image_urls,
+                                attributes_data, image_media_ids=None):
         """
-        Creates variations for a variable product.
-        Attribute IDs for color (8) and size (7) are currently hardcoded.
+        Updates an existing variable product in place (PUT products/{id}).
         """
-        variations_created_count = 0
-        for size_index, size_option in enumerate(sizes):
-            if not size_option or not size_option.strip():
-                print(f"Skipping variation creation for empty size option.")
-                continue
+        variable_product_data = self._build_product_data(
+            name, short_description, description, category_ids, image_urls, attributes_data, image_media_ids)
 
-            size_sku_part = size_option.replace(" ", "").upper()[:5] # Max 5 chars for size SKU part
-            
-            attributes_variation = []
-            if color and color.strip():
-                color_sku_part = color.replace(" ", "").upper()[:5] # Max 5 chars for color SKU part
-                sku_variation = f"{base_sku}-raic-{color_sku_part}{size_sku_part}"
-                attributes_variation.append({"id": self.attr_id_color, "option": color.strip()})
-            else:
-                sku_variation = f"{base_sku}-raic-UNICO{size_sku_part}" # "UNICO" for products without color choice
-                # If there's no color, we might not need to add it to attributes,
-                # or ensure the global product attribute for color is not set to "Any Color"
+        print(f"Updating variable product ID {product_id}: {name}")
+        try:
+            response = self.wcapi.put(f"products/{product_id}", variable_product_data)
+            response.raise_for_status()
+            product_info = response.json()
+            print(f"Successfully updated product ID: {product_info.get('id')}, Permalink: {product_info.get('permalink')}")
+            return product_info
+        except Exception as e:
+            print(f"Error updating variable product ID {product_id}: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                try:
+                    print(f"Error details: {e.response.json()}")
+                except ValueError: # If response is not JSON
+                    print(f"Error details: {e.response.text}")
+            return None
 
-            attributes_variation.append({"id": self.attr_id_size, "option": size_option.strip()})
-            
-            product_variation_data = {
-                "sku": sku_variation,
-                "regular_price": str(price), # Price should be a string
-                "attributes": attributes_variation,
-                "image": {"src": featured_image_url} if featured_image_url else {}
-            }
-            
-            print(f"Creating variation for product ID {product_id}: SKU {sku_variation}, Size {size_option}, Color {color if color else 'N/A'}")
+    @metrics.timed("woocommerce.send_batch")
+    def send_batch(self, endpoint, action, items):
+        """
+        Sends items to a */batch endpoint under `action` ("create" or "update"), in chunks of
+        self.batch_size (the server's max batch size).
+        Returns (item, result) pairs in request order; result is None for items that failed.
+        """
+        outcomes = []
+        for chunk_start in range(0, len(items), self.batch_size):
+            chunk = items[chunk_start:chunk_start + self.batch_size]
+            print(f"Sending {len(chunk)} '{action}' items to {endpoint}")
             try:
-                response = self.wcapi.post(f"products/{product_id}/variations", product_variation_data)
+                response = self.wcapi.post(endpoint, {action: chunk})
                 response.raise_for_status()
-                print(f"Successfully created variation: {response.json().get('id')}")
-                variations_created_count +=1
-                time.sleep(2)  # Sleep to avoid hitting API rate limits
+                batch_results = response.json().get(action, [])
             except Exception as e:
-                print(f"Error creating variation with SKU {sku_variation}: {e}")
+                print(f"Error sending batch to {endpoint}: {e}")
                 if hasattr(e, 'response') and e.response is not None:
                     try:
                         print(f"Error details: {e.response.json()}")
                     except ValueError:
                          print(f"Error details: {e.response.text}")
-        
-        return variations_created_count > 0 # Return True if at least one variation was made
+                outcomes.extend((item, None) for item in chunk)
+                continue
+
+            # The batch endpoint answers in request order, one entry per item,
+            # with an "error" object instead of the object when that item failed.
+            if len(batch_results) < len(chunk):
+                print(f"Error: {endpoint} returned {len(batch_results)} results for {len(chunk)} '{action}' items; "
+                      f"the last {len(chunk) - len(batch_results)} are treated as failed.")
+            for item, result in zip(chunk, batch_results):
+                if not isinstance(result, dict):
+                    result = {}
+                error = result.get("error")
+                if error or not result.get("id"):
+                    error = error or {}
+                    item_label = item.get("sku") or item.get("name") or item.get("id")
+                    print(f"Error in {action} of {item_label}: "
+                          f"{error.get('message', 'no ID returned')} ({error.get('code', 'unknown')})")
+                    outcomes.append((item, None))
+                else:
+                    outcomes.append((item, result))
+            outcomes.extend((item, None) for item in chunk[len(batch_results):]) # Items without a result
+        return outcomes
+
+    def _build_variation_data(self, base_sku, price, size_option, featured_image_url, color=None, featured_image_id=None):
+        """
+        Builds the payload for a single size/color variation, including its -raic- SKU.
+        """
+        sku_variation = variation_sku(base_sku, size_option, color)
+
+        attributes_variation = []
+        if color and color.strip():
+            attributes_variation.append({"id": self.attr_id_color, "option": color.strip()})
+        # If there's no color, we might not need to add it to attributes,
+        # or ensure the global product attribute for color is not set to "Any Color"
+
+        attributes_variation.append({"id": self.attr_id_size, "option": size_option.strip()})
+
+        return {
+            "sku": sku_variation,
+            "regular_price": str(price), # Price should be a string
+            "attributes": attributes_variation,
+            "image": {"id": featured_image_id} if featured_image_id else ({"src": featured_image_url} if featured_image_url else {})
+        }
+
+    @metrics.timed("woocommerce.sync_product_variations")
+    def sync_product_variations(self, product_id, base_sku, price, sizes, featured_image_url, color=None,
+                                existing_variations=None, featured_image_id=None):
+        """
+        Creates or updates the size/color variations of a product through the variations/batch
+        endpoint. existing_variations maps variation SKU -> variation ID; those are updated in place.
+        featured_image_id (a media library ID) takes precedence over featured_image_url.
+        Returns one dict (variation_id, sku, size, color, regular_price) per successful variation.
+        """
+        existing_variations = existing_variations or {}
+        variations_to_create = []
+        variations_to_update = []
+        for size_option in sizes:
+            if not size_option or not size_option.strip():
+                print(f"Skipping variation creation for empty size option.")
+                continue
+            variation_data = self._build_variation_data(
+                base_sku, price, size_option, featured_image_url, color, featured_image_id)
+            if variation_data["sku"] in existing_variations:
+                variation_data["id"] = existing_variations[variation_data["sku"]]
+                variations_to_update.append(variation_data)
+            else:
+                variations_to_create.append(variation_data)
+
+        print(f"Syncing variations for product ID {product_id}: {len(variations_to_create)} new, "
+              f"{len(variations_to_update)} to update (Color {color if color else 'N/A'})")
+        synced_variations = []
+        for action, variations in (("create", variations_to_create), ("update", variations_to_update)):
+            outcomes = self.send_batch(f"products/{product_id}/variations/batch", action, variations)
+            for variation_data, result in outcomes:
+                if result is None:
+                    continue
+                print(f"Successfully {action}d variation: {result['id']} (SKU {variation_data['sku']})")
+                synced_variations.append({
+                    "variation_id": result["id"],
+                    "sku": variation_data["sku"],
+                    "size": variation_data["attributes"][-1]["option"], # Size is always the last attribute
+                    "color": color.strip() if color and color.strip() else None,
+                    "regular_price": variation_data["regular_price"],
+                    "stock_status": result.get("stock_status"),
+                })
+        return synced_variations
+
+    def create_product_variations(self, product_id, base_sku, price, sizes, featured_image_url, color=None):
+        """
+        Creates variations for a variable product through the variations/batch endpoint.
+        Returns the list of created variation IDs (empty if none were created).
+        """
+        created_variations = self.sync_product_variations(product_id, base_sku, price, sizes, featured_image_url, color)
+        return [variation["variation_id"] for variation in created_variations]
+
+    def variation_index_record(self, variation):
+        """Maps a variation returned by the REST API to a product index variation record."""
+        attributes = variation.get("attributes", [])
+        return {
+            "variation_id": variation["id"],
+            "sku": variation.get("sku"),
+            "size": next((a.get("option") for a in attributes if a.get("id") == self.attr_id_size), None),
+            "color": next((a.get("option") for a in attributes if a.get("id") == self.attr_id_color), None),
+            "regular_price": variation.get("regular_price"),
+            "stock_status": variation.get("stock_status"),
+        }
+
+    @metrics.timed("woocommerce.seed_product_index")
+    def seed_product_index(self, force=False):
+        """
+        Seeds the local product index from the store: a paginated scan of variable products whose
+        variations carry the "{base_sku}-raic-..." SKUs built by _build_variation_data.
+        Runs once per index unless force is True.
+        """
+        if self.product_index.is_seeded() and not force:
+            return
+        print("Seeding product index from existing WooCommerce products...")
+        try:
+            products = self.get_all_pages("products", params={"type": "variable"})
+            seeded_count = 0
+            for product in products:
+                variations = self.get_all_pages(f"products/{product['id']}/variations")
+                raic_variations = [v for v in variations if "-raic-" in (v.get("sku") or "")]
+                if not raic_variations:
+                    continue
+                base_sku = raic_variations[0]["sku"].split("-raic-")[0]
+                self.product_index.record_product(
+                    base_sku, product["id"],
+                    regular_price=raic_variations[0].get("regular_price"),
+                    categories=[{"id": category["id"]} for category in product.get("categories", [])],
+                )
+                self.product_index.record_variations(
+                    product["id"], [self.variation_index_record(variation) for variation in raic_variations])
+                seeded_count += 1
+        except Exception as e:
+            print(f"Error seeding product index: {e}")
+            return
+        self.product_index.mark_seeded()
+        print(f"Product index seeded with {seeded_count} existing products.")
 
 
+    @metrics.timed("woocommerce.add_reviews")
     def add_reviews(self, product_id, reviews_text, gender_code):
         """
         Adds reviews to a product.
@@ -205,7 +441,6 @@ class WooCommerceManager:
                 response.raise_for_status()
                 print(f"Successfully added review: {response.json().get('id')}")
                 reviews_added_count += 1
-                time.sleep(3)  # Sleep to avoid hitting API rate limits, review posting can be sensitive
             except Exception as e:
                 print(f"Error adding review by {reviewer_name}: {e}")
                 if hasattr(e, 'response') and e.response is not None: